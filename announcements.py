@@ -0,0 +1,93 @@
+import streamlit as st
+from session_utils import restore_session_from_cookie
+from pesu_utils import run_with_pesu
+from announcements_utils import (
+    AnnouncementIndex,
+    item_date,
+    load_feed_state,
+    mark_all_seen,
+    merge_announcements,
+    new_items,
+    save_feed_state,
+)
+
+restore_session_from_cookie()
+
+# Check if user is logged in
+if not st.session_state.get('logged_in', False):
+    st.warning("⚠️ Yo, gotta log in first no cap 🔐")
+    st.page_link("login.py", label="Go to Login", icon="🔐")
+    st.stop()
+
+st.title("📢 Announcements")
+
+username = st.session_state.pesu_username
+
+async def fetch_new_announcements(pesu, seen_keys, refresh=False):
+    """Fetch only the announcements newer than the ones already stored"""
+    return await pesu.get_announcements(refresh=refresh, seen=seen_keys), None
+
+def sync_feed(refresh=False):
+    state = load_feed_state(username)
+    seen_keys = {item["key"] for item in state["items"]}
+    announcements, error = run_with_pesu(fetch_new_announcements, seen_keys, refresh)
+    if not error and announcements and merge_announcements(state, announcements):
+        save_feed_state(username, state)
+    st.session_state.announcement_feed = state
+    st.session_state.announcement_feed_user = username
+    st.session_state.announcement_index = None
+    return error
+
+# Sync once per login (or on refresh); reruns reuse the state in memory
+if st.session_state.get("announcement_feed_user") != username:
+    with st.spinner("Checking for new announcements..."):
+        error = sync_feed()
+    if error:
+        st.warning(f"⚠️ {error}")
+
+state = st.session_state.announcement_feed
+
+def render_item(item, expanded=False):
+    with st.expander(f"**{item['title']}** · {item_date(item).strftime('%d %b %Y')}", expanded=expanded):
+        st.markdown(item["content"] or "_No content_")
+        for n, url in enumerate(item["attachments"], 1):
+            st.markdown(f"📎 [Attachment {n}]({url})")
+
+col1, col2 = st.columns(2)
+with col1:
+    if st.button("🔄 Refresh", use_container_width=True):
+        with st.spinner("Checking for new announcements..."):
+            error = sync_feed(refresh=True)
+        if error:
+            st.warning(f"⚠️ {error}")
+        state = st.session_state.announcement_feed
+with col2:
+    if st.button("✅ Mark all as read", use_container_width=True, disabled=not new_items(state)):
+        mark_all_seen(state)
+        save_feed_state(username, state)
+        st.rerun()
+
+# Search
+query = st.text_input("🔍 Search announcements", placeholder="Search titles and content...")
+if query:
+    if st.session_state.get("announcement_index") is None:
+        st.session_state.announcement_index = AnnouncementIndex(state["items"])
+    results = st.session_state.announcement_index.search(query)
+    if results:
+        st.caption(f"{len(results)} match(es)")
+        for item in results:
+            render_item(item)
+    else:
+        st.info("No announcements match that fr 🤷")
+    st.stop()
+
+# Only the new announcements are rendered
+unread = new_items(state)
+if unread:
+    st.success(f"✨ {len(unread)} new announcement(s)")
+    for idx, item in enumerate(unread):
+        render_item(item, expanded=(idx == 0))
+else:
+    st.info("ℹ️ All caught up! No new announcements 🎉")
+    if state["items"]:
+        st.caption(f"{len(state['items'])} older announcement(s) are searchable above.")
@@ -0,0 +1,117 @@
+import datetime
+import hashlib
+import json
+import os
+import re
+from bisect import bisect_left
+
+ANNOUNCEMENTS_DIR = ".announcements"
+# Announcements kept per user for search, newest first
+MAX_STORED_ANNOUNCEMENTS = 500
+
+_WORD_PATTERN = re.compile(r"\w+")
+
+
+def _state_path(username: str) -> str:
+    user_ref = hashlib.sha256(username.strip().upper().encode()).hexdigest()[:32]
+    return os.path.join(ANNOUNCEMENTS_DIR, f"{user_ref}.json")
+
+
+def load_feed_state(username: str) -> dict:
+    """Load a user's announcement feed: every stored announcement (newest
+    first) and the key of the newest one they have already seen."""
+    try:
+        with open(_state_path(username), 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"items": [], "last_seen": None}
+
+
+def save_feed_state(username: str, state: dict):
+    os.makedirs(ANNOUNCEMENTS_DIR, exist_ok=True)
+    path = _state_path(username)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(state, f)
+    os.replace(tmp_path, path)
+
+
+def merge_announcements(state: dict, announcements) -> int:
+    """Put newly fetched announcements (newest first) in front of the stored
+    ones. Returns how many were actually new."""
+    known = {item["key"] for item in state["items"]}
+    new_items = [
+        {
+            "key": a.key,
+            "title": a.title,
+            "date": a.date.isoformat(),
+            "content": a.content,
+            "attachments": a.attachments or [],
+        }
+        for a in announcements
+        if a.key not in known
+    ]
+    state["items"] = (new_items + state["items"])[:MAX_STORED_ANNOUNCEMENTS]
+    return len(new_items)
+
+
+def new_items(state: dict) -> list:
+    """The stored announcements that are newer than the last seen one."""
+    items = state["items"]
+    last_seen = state.get("last_seen")
+    for i, item in enumerate(items):
+        if item["key"] == last_seen:
+            return items[:i]
+    return items
+
+
+def mark_all_seen(state: dict):
+    if state["items"]:
+        state["last_seen"] = state["items"][0]["key"]
+
+
+def item_date(item: dict) -> datetime.date:
+    return datetime.date.fromisoformat(item["date"])
+
+
+class AnnouncementIndex:
+    """In-memory inverted index over announcement titles and bodies.
+
+    Every word of the query must match; the last word may be a prefix, so
+    results show up while typing. Title matches rank above body matches.
+    """
+
+    def __init__(self, items: list):
+        self.items = items
+        self._postings: dict[str, set] = {}
+        self._title_words: list[set] = []
+        for i, item in enumerate(items):
+            title_words = set(_WORD_PATTERN.findall(item["title"].lower()))
+            self._title_words.append(title_words)
+            for word in title_words | set(_WORD_PATTERN.findall(item["content"].lower())):
+                self._postings.setdefault(word, set()).add(i)
+        self._vocabulary = sorted(self._postings)
+
+    def _matching(self, word: str, prefix: bool) -> set:
+        if not prefix:
+            return self._postings.get(word, set())
+        matches = set()
+        i = bisect_left(self._vocabulary, word)
+        while i < len(self._vocabulary) and self._vocabulary[i].startswith(word):
+            matches |= self._postings[self._vocabulary[i]]
+            i += 1
+        return matches
+
+    def search(self, query: str, limit: int = 20) -> list:
+        words = _WORD_PATTERN.findall(query.lower())
+        if not words:
+            return []
+        matches = None
+        for n, word in enumerate(words):
+            found = self._matching(word, prefix=n == len(words) - 1)
+            matches = found if matches is None else matches & found
+            if not matches:
+                return []
+        # Title hits first, then newest first (items are stored newest first)
+        ranked = sorted(matches, key=lambda i: (-sum(w in self._title_words[i] for w in words), i))
+        return [self.items[i] for i in ranked[:limit]]
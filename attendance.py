@@ -1,8 +1,7 @@
 import streamlit as st
-import asyncio
 import pandas as pd
-from pesuacademy import PESUAcademy
 from session_utils import restore_session_from_cookie
+from pesu_utils import run_with_pesu, run_async, get_attendance_history
 from attendance_calculator import calculate_bunkable_classes, get_bunk_calculator_data
 
 restore_session_from_cookie()
@@ -42,70 +41,63 @@ selected_sem = st.selectbox(
     key="attendance_semester_selector",
 )
 
-async def fetch_attendance(semester):
-    """Fetch attendance from PESU Academy API"""
-    try:
-        # Check if credentials are available
-        if not st.session_state.get('pesu_username') or not st.session_state.get('pesu_password'):
-            return None, "Credentials not found. Please login again."
-        
-        # Create a new authenticated session
-        pesu = await PESUAcademy.login(
-            st.session_state.pesu_username,
-            st.session_state.pesu_password
-        )
-        
-        if not pesu:
-            return None, "Login failed. Please try again."
-        
-        try:
-            attendance_data = await pesu.get_attendance(semester)
-        except Exception as e:
-            await pesu.close()
-            return None, f"Error fetching attendance: {str(e)}"
-        
-        await pesu.close()
-        
-        if not attendance_data or semester not in attendance_data:
-            return None, f"No attendance data found for semester {semester}."
-        
-        return attendance_data[semester], None
-    except Exception as e:
-        import traceback
-        error_msg = str(e)
-        traceback.print_exc()
-        return None, f"Error fetching attendance: {error_msg}"
+async def fetch_attendance(pesu, semester, refresh=False):
+    """Fetch attendance from PESU Academy API (every fetch is recorded in the attendance history)"""
+    history = get_attendance_history()
+    last_change = await history.last_recorded(pesu_username, semester)
+    attendance_data = await pesu.get_attendance(semester, refresh=refresh)
+
+    if not attendance_data or semester not in attendance_data:
+        return None, f"No attendance data found for semester {semester}."
+
+    # What changed with this fetch, i.e. since the last check
+    changes = await history.changes(pesu_username, semester, last_change) if last_change else []
+    return (attendance_data[semester], changes), None
+
+def load_live_attendance(semester, refresh=False, success_msg="Attendance loaded! Check it out fam 📊"):
+    with st.spinner(f"Loading semester {semester} attendance..."):
+        data, error = run_with_pesu(fetch_attendance, semester, refresh)
+    if error:
+        st.error(f"Yikes ngl 😬 {error}")
+    else:
+        st.session_state.attendance_data, st.session_state.attendance_changes = data
+        st.session_state.attendance_as_of = None
+        st.success(success_msg)
+
+def load_attendance(semester):
+    """Show the latest saved attendance instantly; only go to PESU Academy if there is none"""
+    history = get_attendance_history()
+    saved = run_async(history.latest(pesu_username, semester)) if pesu_username else []
+    if saved:
+        st.session_state.attendance_data = saved
+        st.session_state.attendance_changes = []
+        st.session_state.attendance_as_of = run_async(history.last_recorded(pesu_username, semester))
+    else:
+        load_live_attendance(semester)
+
+pesu_username = st.session_state.get('pesu_username')
 
 # Auto-load attendance on first visit or semester change
 if 'attendance_initialized' not in st.session_state:
     st.session_state.attendance_initialized = True
     st.session_state.last_attendance_sem = selected_sem
-    with st.spinner(f"Loading semester {selected_sem} attendance..."):
-        courses, error = asyncio.run(fetch_attendance(selected_sem))
-        if error:
-            st.error(f"Yikes ngl 😬 {error}")
-        else:
-            st.session_state.attendance_data = courses
-            st.success("Attendance loaded! Check it out fam 📊")
+    load_attendance(selected_sem)
 elif st.session_state.get('last_attendance_sem') != selected_sem:
     st.session_state.last_attendance_sem = selected_sem
-    with st.spinner(f"Loading semester {selected_sem} attendance..."):
-        courses, error = asyncio.run(fetch_attendance(selected_sem))
-        if error:
-            st.error(f"Yikes ngl 😬 {error}")
-        else:
-            st.session_state.attendance_data = courses
-            st.success("Attendance loaded! Check it out fam 📊")
+    load_attendance(selected_sem)
 
 # Manual refresh button
 if st.button("🔄 Refresh Attendance", use_container_width=True):
-    with st.spinner(f"Refreshing semester {selected_sem} attendance..."):
-        courses, error = asyncio.run(fetch_attendance(selected_sem))
-        if error:
-            st.error(f"Yikes ngl 😬 {error}")
-        else:
-            st.session_state.attendance_data = courses
-            st.success("Attendance refreshed! 📊")
+    load_live_attendance(selected_sem, True, "Attendance refreshed! 📊")
+
+as_of = st.session_state.get('attendance_as_of')
+if as_of:
+    st.caption(f"Showing ur last saved attendance (changed {as_of.astimezone():%d %b, %I:%M %p}). Hit refresh for live numbers 🔄")
+
+# Classes marked since the last check (courses seen for the first time have nothing to compare with)
+changes = [c for c in st.session_state.get('attendance_changes') or [] if c.before is not None]
+if changes:
+    st.info("🆕 **Since last check:** " + " • ".join(f"{c.code}: +{c.attended}/{c.total}" for c in changes))
 
 # Display attendance if available
 if 'attendance_data' in st.session_state and st.session_state.attendance_data:
@@ -242,6 +234,15 @@ if 'attendance_data' in st.session_state and st.session_state.attendance_data:
                 
                 # Additional details
                 st.metric(f"Classes Attended", f"{attended} out of {total}")
+
+                # Attendance over time, from the local history (no network)
+                curve = run_async(get_attendance_history().curve(pesu_username, selected_sem, course.code)) if pesu_username else []
+                if len(curve) > 1:
+                    st.line_chart(
+                        pd.DataFrame(
+                            [{"When": p.taken_at.astimezone(), "Attended": p.attended, "Total": p.total} for p in curve]
+                        ).set_index("When")
+                    )
                 
                 # Bunk calculator section
                 if not bunk_error and working_days > 0:
@@ -1,11 +1,12 @@
 import streamlit as st
-import asyncio
-from pesuacademy import PESUAcademy
 import json
 import os
+import tempfile
 from session_utils import restore_session_from_cookie
+from pesu_utils import run_with_pesu
 from role_utils import get_class_id, is_cr, get_section_from_class_id
 from materials_utils import get_materials_by_section
+from pesuacademy.constants import MATERIAL_TYPES
 
 restore_session_from_cookie()
 
@@ -79,57 +80,29 @@ try:
 except:
     current_sem = 1
 
-async def fetch_courses(semester):
+async def fetch_courses(pesu, semester):
     """Fetch courses from PESU Academy API"""
-    try:
-        pesu = await PESUAcademy.login(
-            st.session_state.pesu_username,
-            st.session_state.pesu_password
-        )
-        courses = await pesu.get_courses(semester)
-        await pesu.close()
-        return courses, None
-    except Exception as e:
-        return None, str(e)
-
-async def fetch_units(course_id):
-    """Fetch units for a course"""
-    try:
-        pesu = await PESUAcademy.login(
-            st.session_state.pesu_username,
-            st.session_state.pesu_password
-        )
-        units = await pesu.get_units_for_course(course_id)
-        await pesu.close()
-        return units, None
-    except Exception as e:
-        return None, str(e)
-
-async def fetch_topics(unit_id):
-    """Fetch topics for a unit"""
-    try:
-        pesu = await PESUAcademy.login(
-            st.session_state.pesu_username,
-            st.session_state.pesu_password
-        )
-        topics = await pesu.get_topics_for_unit(unit_id)
-        await pesu.close()
-        return topics, None
-    except Exception as e:
-        return None, str(e)
-
-async def fetch_materials(topic, material_type_id):
-    """Fetch material links for a topic"""
-    try:
-        pesu = await PESUAcademy.login(
-            st.session_state.pesu_username,
-            st.session_state.pesu_password
-        )
-        materials = await pesu.get_material_links(topic, material_type_id)
-        await pesu.close()
-        return materials, None
-    except Exception as e:
-        return None, str(e)
+    courses = await pesu.get_courses(semester)
+    return courses, None
+
+async def fetch_course_tree(pesu, course_id, refresh=False):
+    """Fetch every unit, topic and material link of a course in one crawl"""
+    tree = await pesu.get_course_tree(course_id, refresh=refresh)
+    return tree, None
+
+async def export_course_zip(pesu, course_id, zip_path):
+    """Download every material of a course into one ZIP file"""
+    report = await pesu.export_course(course_id, zip_path, as_zip=True)
+    return report, None
+
+def discard_course_pack():
+    """Delete the course pack ZIP of this session once it is saved or replaced"""
+    course_pack = st.session_state.pop('course_pack', None)
+    if course_pack:
+        try:
+            os.remove(course_pack[1])
+        except FileNotFoundError:
+            pass
 
 # Semester selector
 selected_sem = st.selectbox(
@@ -143,7 +116,7 @@ selected_sem = st.selectbox(
 if st.session_state.get('last_selected_sem') != selected_sem or 'courses' not in st.session_state:
     st.session_state.last_selected_sem = selected_sem
     with st.spinner(f"Fetching semester {selected_sem} courses..."):
-        courses_dict, error = asyncio.run(fetch_courses(selected_sem))
+        courses_dict, error = run_with_pesu(fetch_courses, selected_sem)
         
         if error:
             st.error(f"Couldn't get courses ngl 😪 {error}")
@@ -180,105 +153,95 @@ if 'courses' in st.session_state and st.session_state.courses:
         with col3:
             st.metric("Status", selected_course.status)
         
-        # Auto-fetch units for selected course
+        # Load the whole material tree of the course in one go
         if st.session_state.get('last_selected_course_id') != selected_course.id:
             st.session_state.last_selected_course_id = selected_course.id
-            with st.spinner("Loading units..."):
-                units, error = asyncio.run(fetch_units(selected_course.id))
-                
+            with st.spinner("Loading units, topics & materials..."):
+                tree, error = run_with_pesu(fetch_course_tree, selected_course.id)
+
                 if error:
                     st.error(f"Units are being sus rn 😒 {error}")
-                elif units:
-                    st.session_state.current_units = units
-                    st.session_state.current_course_id = selected_course.id
                 else:
-                    st.info("No units found bestie! This course is empty fr 💀")
-        
-        # Display units and materials
-        if 'current_units' in st.session_state and st.session_state.current_units and st.session_state.get('current_course_id') == selected_course.id:
-            st.markdown("---")
-            st.subheader("📑 Course Materials")
-            
-            # Initialize expanded_units in session state if not present
-            if 'expanded_units' not in st.session_state:
-                st.session_state.expanded_units = {}
-            
-            for unit in st.session_state.current_units:
-                # Auto-load topics if unit expander is marked as needing load
-                if unit.id not in st.session_state.expanded_units:
-                    st.session_state.expanded_units[unit.id] = False
-                
-                # Check if topics need to be loaded
-                if st.session_state.expanded_units[unit.id] and f"topics_{unit.id}" not in st.session_state:
-                    with st.spinner(f"Loading topics for {unit.title}..."):
-                        topics, error = asyncio.run(fetch_topics(unit.id))
+                    st.session_state.course_tree = tree
+                    st.session_state.course_tree_id = selected_course.id
+
+        if st.button("🔄 Refresh Materials", use_container_width=True):
+            with st.spinner("Refreshing materials..."):
+                tree, error = run_with_pesu(fetch_course_tree, selected_course.id, True)
+
+                if error:
+                    st.error(f"Nah that ain't it chief 💀 {error}")
+                else:
+                    st.session_state.course_tree = tree
+                    st.session_state.course_tree_id = selected_course.id
+
+        tree = st.session_state.get('course_tree')
+        if tree and st.session_state.get('course_tree_id') == selected_course.id:
+            if not tree.units:
+                st.info("No units found bestie! This course is empty fr 💀")
+            else:
+                st.markdown("---")
+                st.subheader("📑 Course Materials")
+                if tree.errors:
+                    st.caption(f"⚠️ {len(tree.errors)} bits didn't load, hit refresh to retry")
+
+                # Download everything at once instead of clicking every link
+                if st.button("📦 Build Course Pack (ZIP)", use_container_width=True):
+                    with st.spinner("Downloading everything... grab a snack 🍿"):
+                        discard_course_pack()
+                        # Unique per build, so that users building the same course don't overwrite each other
+                        with tempfile.NamedTemporaryFile(prefix="course-pack-", suffix=".zip", delete=False) as zip_file:
+                            zip_path = zip_file.name
+                        report, error = run_with_pesu(export_course_zip, selected_course.id, zip_path)
+
                         if error:
-                            st.error(f"Topics are mid rn fr 😤 {error}")
+                            os.remove(zip_path)
+                            st.error(f"Course pack flopped 💀 {error}")
                         else:
-                            st.session_state[f"topics_{unit.id}"] = topics
-                
-                # Display unit with expander, keep open if topics are loaded
-                is_open = f"topics_{unit.id}" in st.session_state
-                with st.expander(f"📘 {unit.title}", expanded=is_open):
-                    # Mark unit as expanded for auto-loading
-                    st.session_state.expanded_units[unit.id] = True
-                    
-                    # Auto-load topics if not already loaded
-                    if f"topics_{unit.id}" not in st.session_state:
-                        with st.spinner(f"Loading topics for {unit.title}..."):
-                            topics, error = asyncio.run(fetch_topics(unit.id))
-                            
-                            if error:
-                                st.error(f"Topics are mid rn fr 😤 {error}")
-                            else:
-                                st.session_state[f"topics_{unit.id}"] = topics
-                                st.rerun()
-                    
-                    # Display topics if loaded
-                    if f"topics_{unit.id}" in st.session_state:
-                        topics = st.session_state[f"topics_{unit.id}"]
-                        
-                        for topic in topics:
-                            st.markdown(f"**📝 {topic.title}**")
-                            
-                            # Material type selector
-                            material_types = {
-                                "Lecture Notes": "1",
-                                "Slides": "2",
-                                "Notes": "3",
-                                "Lab Materials": "4",
-                                "Additional Resources": "5"
-                            }
-                            
-                            cols = st.columns(len(material_types))
-                            for idx, (mat_name, mat_id) in enumerate(material_types.items()):
-                                with cols[idx]:
-                                    if st.button(mat_name, key=f"mat_{topic.id}_{mat_id}", use_container_width=True):
-                                        with st.spinner(f"Fetching {mat_name}..."):
-                                            materials, error = asyncio.run(fetch_materials(topic, mat_id))
-                                            
-                                            if error:
-                                                st.error(f"Nah that ain't it chief 💀 {error}")
-                                            elif not materials:
-                                                st.info(f"No {mat_name} available oof 😭")
-                                            else:
-                                                st.session_state[f"materials_{topic.id}_{mat_id}"] = materials
-                                                st.rerun()
-                            
-                            # Display materials if loaded
-                            for mat_name, mat_id in material_types.items():
-                                mat_key = f"materials_{topic.id}_{mat_id}"
-                                if mat_key in st.session_state:
-                                    materials = st.session_state[mat_key]
-                                    if materials:
-                                        st.markdown(f"**{mat_name}:**")
-                                        for material in materials:
-                                            if material.is_pdf:
-                                                st.markdown(f"📄 [{material.title}]({material.url})")
-                                            else:
-                                                st.markdown(f"🔗 [{material.title}]({material.url})")
-                            
-                            st.markdown("---")
+                            st.session_state.course_pack = (selected_course.id, zip_path, report)
+
+                course_pack = st.session_state.get('course_pack')
+                if course_pack and course_pack[0] == selected_course.id:
+                    _, zip_path, report = course_pack
+                    st.caption(
+                        f"{report.count('downloaded')} files • {report.bytes_transferred / 1e6:.1f} MB "
+                        f"in {report.elapsed:.1f}s ({report.throughput / 1e6:.1f} MB/s)"
+                        + (f" • {report.count('failed')} failed" if report.count('failed') else "")
+                    )
+                    if os.path.exists(zip_path):
+                        with open(zip_path, "rb") as zip_file:
+                            st.download_button(
+                                "⬇️ Save Course Pack",
+                                data=zip_file,
+                                file_name=f"{selected_course.code}.zip",
+                                mime="application/zip",
+                                use_container_width=True,
+                                # The ZIP was already handed to the browser, so it is deleted once saved
+                                on_click=discard_course_pack,
+                            )
+
+            for unit_tree in tree.units:
+                with st.expander(f"📘 {unit_tree.unit.title}"):
+                    if not unit_tree.topics:
+                        st.info("No topics here oof 😭")
+
+                    for topic_materials in unit_tree.topics:
+                        st.markdown(f"**📝 {topic_materials.topic.title}**")
+
+                        if not topic_materials.materials:
+                            st.caption("No materials uploaded yet")
+
+                        for mat_id, mat_name in MATERIAL_TYPES.items():
+                            materials = topic_materials.materials.get(mat_id)
+                            if materials:
+                                st.markdown(f"**{mat_name}:**")
+                                for material in materials:
+                                    if material.is_pdf:
+                                        st.markdown(f"📄 [{material.title}]({material.url})")
+                                    else:
+                                        st.markdown(f"🔗 [{material.title}]({material.url})")
+
+                        st.markdown("---")
 
 else:
     st.info("👆 Click 'Fetch Courses' to load ur courses no cap 💯")
@@ -4,6 +4,8 @@ from datetime import date
 from session_utils import restore_session_from_cookie
 from calendar_utils import get_calendar_events
 from role_utils import is_superadmin
+from pesu_utils import run_with_pesu
+from timetable_utils import render_now_next
 
 restore_session_from_cookie()
 
@@ -44,6 +46,44 @@ with info_col3:
     st.info(f"**Section:** {section} • Sem {semester}")
 col1, col2 = st.columns(2)
 
+async def fetch_snapshot(pesu):
+    """Fetch every page's data from PESU Academy in one go"""
+    return await pesu.get_snapshot(), None
+
+def prime_pages(snapshot):
+    """Hand the snapshot to the other pages so they don't have to fetch again"""
+    if snapshot.semester is not None and snapshot.courses is not None:
+        st.session_state.courses = snapshot.courses
+        st.session_state.last_selected_sem = snapshot.semester
+    if snapshot.semester is not None and snapshot.attendance is not None:
+        st.session_state.attendance_data = snapshot.attendance
+        st.session_state.last_attendance_sem = snapshot.semester
+        st.session_state.attendance_initialized = True
+    if snapshot.timetable is not None:
+        st.session_state.timetable = snapshot.timetable
+        st.session_state.timetable_initialized = True
+    if snapshot.results is not None:
+        st.session_state.results = snapshot.results
+        st.session_state.last_marks_sem = snapshot.results_semester
+        st.session_state.marks_initialized = True
+
+# Load everything once per session so the other pages open instantly
+if 'snapshot_loaded' not in st.session_state:
+    with st.spinner("Loading ur stuff... 👀"):
+        snapshot, error = run_with_pesu(fetch_snapshot)
+    st.session_state.snapshot_loaded = True
+    if error:
+        st.warning(f"Couldn't preload everything ngl 😅 {error}")
+    else:
+        prime_pages(snapshot)
+        failed = [name for name, section in snapshot.sections.items() if not section.ok]
+        if failed:
+            st.caption(f"Some stuff didn't load: {', '.join(failed)} (the pages will retry)")
+
+# What's on now / next, straight from the timetable index
+if st.session_state.get('timetable'):
+    render_now_next(st.session_state.timetable)
+
 # Initialize session state for tasks
 if 'tasks' not in st.session_state:
     st.session_state.tasks = []
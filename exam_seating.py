@@ -1,7 +1,6 @@
 import streamlit as st
-import asyncio
 from session_utils import restore_session_from_cookie
-from pesuacademy.pages.seating_information import _SeatingInformationHandler
+from pesu_utils import run_with_pesu
 
 restore_session_from_cookie()
 
@@ -13,31 +12,13 @@ if not st.session_state.get('logged_in', False):
 
 st.title("📍 Exam Seating Arrangement")
 
-@st.cache_data(ttl=3600)
-def get_seating_arrangement():
-    """Fetch seating arrangement from pesuacademy API."""
-    try:
-        # Get the PESU session from session state
-        pesu_session = st.session_state.get('pesu_session')
-        if not pesu_session:
-            return None, "Session not available"
-        
-        # Run the async function to fetch seating
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        seating_data = loop.run_until_complete(_SeatingInformationHandler._get(pesu_session))
-        
-        return seating_data, None
-    except Exception as e:
-        import traceback
-        error_details = traceback.format_exc()
-        st.error("**Error Details:**")
-        st.code(error_details)
-        return None, f"Error fetching seating: {str(e)}"
+async def fetch_seating_arrangement(pesu):
+    """Fetch exam seating from PESU Academy API (cached per user by the library)"""
+    return await pesu.get_seating_info(), None
 
 # Fetch and display seating arrangement
 with st.spinner("Loading exam seating arrangements..."):
-    seating_data, error = get_seating_arrangement()
+    seating_data, error = run_with_pesu(fetch_seating_arrangement)
 
 if error:
     st.warning(f"⚠️ {error}")
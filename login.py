@@ -1,15 +1,17 @@
 import streamlit as st
-import asyncio
 import json
-from pesuacademy import PESUAcademy
 from session_utils import save_session_cookie, restore_session_from_cookie, clear_session_cookie
+from pesu_utils import run_async, get_session_pool, drop_pesu_session
+from profile_image_utils import delete_profile_image, profile_image_ref
 
-async def login_user(username, password):
-    """Async function to login to PESU Academy"""
+async def fetch_profile(pesu):
+    # The photo is fetched separately, only when a page shows it
+    return await pesu.get_profile(include_image=False)
+
+def login_user(username, password):
+    """Login to PESU Academy, keeping the session pooled for the other pages"""
     try:
-        pesu = await PESUAcademy.login(username, password)
-        profile = await pesu.get_profile()
-        await pesu.close()
+        profile = run_async(get_session_pool().run(username, password, fetch_profile))
         return profile, None
     except Exception as e:
         return None, str(e)
@@ -49,8 +51,11 @@ def main():
         
         # Logout button
         if st.button("Logout", type="secondary"):
+            drop_pesu_session(st.session_state.pesu_username)
+            delete_profile_image(st.session_state.pesu_username)
             st.session_state.logged_in = False
             st.session_state.profile = None
+            st.session_state.profile_image_ref = None
             st.session_state.pesu_username = None
             st.session_state.pesu_password = None
             st.session_state.restore_attempted = False
@@ -75,14 +80,14 @@ def main():
                         st.error("Gotta enter username AND password bestie 🔑")
                     else:
                         with st.spinner("Logging in..."):
-                            # Run async login
-                            profile, error = asyncio.run(login_user(username, password))
+                            profile, error = login_user(username, password)
                             
                             if error:
                                 st.error(f"Login said nope 🚫 {error}")
                             else:
                                 st.session_state.logged_in = True
                                 st.session_state.profile = profile
+                                st.session_state.profile_image_ref = profile_image_ref(username)
                                 st.session_state.pesu_username = username
                                 st.session_state.pesu_password = password
                                 
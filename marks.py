@@ -1,8 +1,8 @@
 import streamlit as st
-import asyncio
 import pandas as pd
-from pesuacademy import PESUAcademy
 from session_utils import restore_session_from_cookie
+from pesu_utils import run_with_pesu, get_results_archive
+from pesuacademy.exceptions import ResultsNotPublishedError
 from gpa_calculator import (
     marks_to_grade_point,
     grade_point_to_letter,
@@ -13,21 +13,6 @@ from gpa_calculator import (
 
 restore_session_from_cookie()
 
-# Helper function to safely convert marks to float
-def safe_float_convert(value):
-    """Safely convert a value to float, returning 0 if conversion fails"""
-    if value is None:
-        return 0
-    if isinstance(value, (int, float)):
-        return float(value)
-    if isinstance(value, str):
-        try:
-            return float(value)
-        except ValueError:
-            # If it's a letter grade or non-numeric string, return 0
-            return 0
-    return 0
-
 # Check if user is logged in
 if not st.session_state.get('logged_in', False):
     st.warning("⚠️ Yo, gotta log in first no cap 🔐")
@@ -62,55 +47,28 @@ selected_sem = st.selectbox(
     key="semester_selector",
 )
 
-async def fetch_results(semester):
+async def fetch_results(pesu, semester, refresh=False):
     """Fetch results from PESU Academy API"""
     try:
-        # Check if credentials are available
-        if not st.session_state.get('pesu_username') or not st.session_state.get('pesu_password'):
-            return None, "Credentials not found. Please login again."
-        
-        # Create a new authenticated session
-        pesu = await PESUAcademy.login(
-            st.session_state.pesu_username,
-            st.session_state.pesu_password
-        )
-        
-        if not pesu:
-            return None, "Login failed. Please try again."
-        
-        try:
-            results = await pesu.get_results(semester)
-        except AttributeError as ae:
-            await pesu.close()
-            return None, f"Results page structure not found. This might mean:\n- No results available for semester {semester} yet\n- Results are still being processed\n- Please try again later or contact support"
-        except IndexError as ie:
-            await pesu.close()
-            return None, f"Results not available yet for semester {semester}. This usually means:\n- Results haven't been published as **Final** yet (check PESU Academy)\n- Results are still provisional/in-progress\n- The semester doesn't have published results yet"
-        except Exception as parse_error:
-            await pesu.close()
-            import traceback
-            st.error("**Debug Info:**")
-            st.code(traceback.format_exc())
-            return None, f"Error parsing results: {str(parse_error)}"
-        
-        await pesu.close()
-        
-        if not results:
-            return None, "No results found for this semester."
-        
-        return results, None
-    except Exception as e:
-        import traceback
-        error_msg = str(e)
-        traceback.print_exc()
-        return None, f"Error fetching results: {error_msg}"
+        results = await pesu.get_results(semester, refresh=refresh)
+    except ResultsNotPublishedError:
+        return None, f"Results not available yet for semester {semester}. This usually means:\n- Results haven't been published as **Final** yet (check PESU Academy)\n- Results are still provisional/in-progress\n- The semester doesn't have published results yet"
+    except AttributeError as ae:
+        return None, f"Results page structure not found. This might mean:\n- No results available for semester {semester} yet\n- Results are still being processed\n- Please try again later or contact support"
+    except IndexError as ie:
+        return None, f"Results not available yet for semester {semester}. This usually means:\n- Results haven't been published as **Final** yet (check PESU Academy)\n- Results are still provisional/in-progress\n- The semester doesn't have published results yet"
+
+    if not results:
+        return None, "No results found for this semester."
+
+    return results, None
 
 # Auto-load results on first visit or semester change
 if 'marks_initialized' not in st.session_state:
     st.session_state.marks_initialized = True
     st.session_state.last_marks_sem = selected_sem
     with st.spinner(f"Loading semester {selected_sem} results..."):
-        results, error = asyncio.run(fetch_results(selected_sem))
+        results, error = run_with_pesu(fetch_results, selected_sem)
         if error:
             st.error(f"Couldn't get ur grades ngl 😅 {error}")
             st.warning("Tips:\n- Make sure results are published as **Final** (not just provisional)\n- Try a different semester\n- Results might still be processing")
@@ -120,7 +78,7 @@ if 'marks_initialized' not in st.session_state:
 elif st.session_state.get('last_marks_sem') != selected_sem:
     st.session_state.last_marks_sem = selected_sem
     with st.spinner(f"Loading semester {selected_sem} results..."):
-        results, error = asyncio.run(fetch_results(selected_sem))
+        results, error = run_with_pesu(fetch_results, selected_sem)
         if error:
             st.error(f"Couldn't get ur grades ngl 😅 {error}")
             st.warning("Tips:\n- Make sure results are published as **Final** (not just provisional)\n- Try a different semester\n- Results might still be processing")
@@ -131,18 +89,19 @@ elif st.session_state.get('last_marks_sem') != selected_sem:
 # Manual refresh button
 if st.button("🔄 Refresh Results", use_container_width=True):
     with st.spinner(f"Refreshing semester {selected_sem} results..."):
-        results, error = asyncio.run(fetch_results(selected_sem))
+        results, error = run_with_pesu(fetch_results, selected_sem, True)
         if error:
             st.error(f"Couldn't get ur grades ngl 😅 {error}")
             st.warning("Tips:\n- Make sure results are published as **Final** (not just provisional)\n- Try a different semester\n- Results might still be processing")
         else:
             st.session_state.results = results
+            st.session_state.pop('transcript', None)
             st.success("Results refreshed! 👀")
 
 st.caption("Note: The library currently supports final published results. If you see provisional results on PESU Academy, they may not be available through this API yet.")
 
 # Tab interface for Results vs Predictor
-results_tab, predictor_tab = st.tabs(["📈 Results", "🎯 SGPA Predictor"])
+results_tab, transcript_tab, predictor_tab = st.tabs(["📈 Results", "🎓 Transcript", "🎯 SGPA Predictor"])
 
 with results_tab:
     # Display results if available
@@ -152,40 +111,13 @@ with results_tab:
         # Prepare course data for SGPA calculation
         courses_data = []
         for course in results.courses:
-            # Calculate total marks from assessments
-            total_marks = 0
-            total_possible = 0
-            assessment_details = {}
-            
-            for assessment in course.assessments:
-                marks = safe_float_convert(assessment.marks)
-                total = safe_float_convert(assessment.total)
-                total_marks += marks
-                total_possible += total
-                
-                # Extract assessment type
-                assessment_name = assessment.name.lower()
-                if 'assignment' in assessment_name or 'assgn' in assessment_name:
-                    assessment_details['assignments'] = marks
-                elif 'isa 1' in assessment_name or 'isa-1' in assessment_name:
-                    assessment_details['isa_1'] = marks
-                elif 'isa 2' in assessment_name or 'isa-2' in assessment_name:
-                    assessment_details['isa_2'] = marks
-                elif 'esa' in assessment_name:
-                    assessment_details['esa'] = marks
-                elif 'lab' in assessment_name:
-                    assessment_details['lab'] = marks
-            
-            # Get credits (handle both string and numeric formats)
-            try:
-                if isinstance(course.credits.earned, str):
-                    credits = float(course.credits.earned.split('/')[0])
-                else:
-                    credits = float(course.credits.earned)
-            except:
+            # Marks, totals and credits come pre-parsed from the results models
+            if course.credits and course.credits.earned_value is not None:
+                credits = course.credits.earned_value
+            else:
                 credits = 4  # Default to 4 credits
             
-            percentage = (total_marks / total_possible * 100) if total_possible > 0 else 0
+            percentage = course.percentage or 0
             grade_point = marks_to_grade_point(percentage)
             grade_letter = grade_point_to_letter(grade_point) if grade_point else "N/A"
             
@@ -196,10 +128,10 @@ with results_tab:
                 "marks": percentage,
                 "grade_point": grade_point,
                 "grade_letter": grade_letter,
-                "total_marks": total_marks,
-                "total_possible": total_possible,
+                "total_marks": course.marks_obtained,
+                "total_possible": course.marks_possible,
                 "assessments": course.assessments,
-                "assessment_details": assessment_details
+                "assessment_details": course.breakdown
             })
         
         # Calculate SGPA
@@ -251,8 +183,8 @@ with results_tab:
                     
                     assessment_data = []
                     for assessment in course['assessments']:
-                        marks = safe_float_convert(assessment.marks)
-                        total = safe_float_convert(assessment.total)
+                        marks = assessment.marks_value or 0
+                        total = assessment.total_value or 0
                         percentage = f"{(marks/total*100):.1f}%" if total > 0 else "N/A"
                         assessment_data.append({
                             "Assessment": assessment.name,
@@ -334,6 +266,63 @@ with results_tab:
     else:
         st.info("👆 Click 'Fetch Results' or select a different semester to view ur grades 📄")
 
+async def fetch_transcript(pesu, refresh=False):
+    """Fetch every semester's results in one go (past semesters come from the archive)"""
+    return await pesu.get_all_results(refresh=refresh, archive=get_results_archive()), None
+
+with transcript_tab:
+    if st.button("📜 Load Transcript", use_container_width=True) or 'transcript' in st.session_state:
+        if 'transcript' not in st.session_state:
+            with st.spinner("Pulling up all ur semesters... 📚"):
+                transcript, error = run_with_pesu(fetch_transcript)
+            if error:
+                st.error(f"Couldn't get ur transcript ngl 😅 {error}")
+            else:
+                st.session_state.transcript = transcript
+
+        transcript = st.session_state.get('transcript')
+        if transcript and transcript.trend:
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("🎓 CGPA", f"{transcript.cgpa:.2f}" if transcript.cgpa is not None else "N/A")
+            with col2:
+                st.metric("📚 Credits Earned", f"{transcript.credits_earned:g}")
+            with col3:
+                st.metric("🗓️ Semesters", len(transcript.trend))
+
+            trend_df = pd.DataFrame([
+                {"Semester": s.semester, "SGPA": s.sgpa, "CGPA": s.cgpa} for s in transcript.trend
+            ]).set_index("Semester")
+            st.line_chart(trend_df)
+
+            st.dataframe(pd.DataFrame([
+                {
+                    "Semester": s.semester,
+                    "SGPA": s.sgpa,
+                    "CGPA": s.cgpa,
+                    "Credits": f"{s.credits_earned:g}/{s.credits_total:g}" if s.credits_total else "N/A",
+                }
+                for s in transcript.trend
+            ]), use_container_width=True, hide_index=True)
+
+            for semester, result in transcript.results.items():
+                with st.expander(f"Semester {semester} • SGPA {result.sgpa}"):
+                    st.dataframe(pd.DataFrame([
+                        {
+                            "Course Code": course.code,
+                            "Course Title": course.title,
+                            "Credits": course.credits.total if course.credits else "N/A",
+                            "Grade": course.grade or "N/A",
+                        }
+                        for course in result.courses
+                    ]), use_container_width=True, hide_index=True)
+            if transcript.unavailable:
+                st.caption(f"No published results yet for semester(s) {', '.join(map(str, transcript.unavailable))}")
+        elif transcript:
+            st.info("No published results yet fr 🤷")
+    else:
+        st.info("👆 Load ur full transcript with CGPA across every semester")
+
 with predictor_tab:
     st.subheader("🎯 SGPA Predictor")
     st.caption("Predict what your SGPA could be with different scores")
@@ -0,0 +1,135 @@
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+import streamlit as st
+from pesuacademy import (
+    AttendanceHistory,
+    BackgroundRunner,
+    MemoryCache,
+    Metrics,
+    RequestScheduler,
+    ResponseCache,
+    ResultsArchive,
+    SessionPool,
+    SharedCache,
+    SingleFlight,
+    SQLiteCache,
+    TransportConfig,
+    set_parse_executor,
+)
+
+# Pooled PESU Academy sessions are dropped after this much idle time, well
+# before the portal itself expires them
+SESSION_IDLE_TTL = 10 * 60
+# Upper bound on how long a single pooled login is reused
+SESSION_MAX_AGE = 60 * 60
+# Maximum number of users with a live PESU Academy session at once
+MAX_LIVE_SESSIONS = 200
+# Maximum number of PESU Academy pages kept in the response cache (all users)
+MAX_CACHED_PAGES = 5000
+# How long an expired page may still be shown while PESU Academy is down
+STALE_PAGE_TTL = 24 * 60 * 60
+# Requests sent to PESU Academy per second, shared by every user of the app
+OUTBOUND_RATE = 15
+# Requests that may go out at once after a quiet period
+OUTBOUND_BURST = 30
+# Requests a single user may have in flight at once (e.g. all semesters)
+PER_USER_CONCURRENCY = 4
+# Threads that parse PESU Academy pages off the event loop, so one user's big
+# page doesn't stall everyone else's requests
+PARSE_WORKERS = 4
+# On-disk archive of final (past semester) results, which never change
+RESULTS_ARCHIVE_FILE = ".results_archive.db"
+# Every attendance value ever fetched, for trends and "since last check"
+ATTENDANCE_HISTORY_FILE = ".attendance_history.db"
+# Course units, topics and materials, fetched once for a whole section
+# instead of once per student, kept across restarts
+SHARED_CACHE_FILE = ".shared_cache.db"
+
+
+@st.cache_resource
+def _get_runner():
+    """Get the background event loop that owns every pooled PESU Academy session.
+
+    httpx clients are bound to the loop they were created on, so all library
+    calls run on this one long-lived loop instead of a fresh asyncio.run()
+    loop per click. Connection pools, cached pages and in-flight requests
+    therefore survive reruns and are shared between users.
+    """
+    return BackgroundRunner(name="pesu-event-loop")
+
+
+@st.cache_resource
+def _get_parse_executor():
+    """Get the worker threads that every PESU Academy page is parsed in."""
+    executor = ThreadPoolExecutor(max_workers=PARSE_WORKERS, thread_name_prefix="pesu-parse")
+    set_parse_executor(executor)
+    return executor
+
+
+@st.cache_resource
+def get_session_pool():
+    """Get the process-wide pool of authenticated PESU Academy sessions."""
+    _get_parse_executor()
+    return SessionPool(
+        idle_ttl=SESSION_IDLE_TTL,
+        max_age=SESSION_MAX_AGE,
+        max_sessions=MAX_LIVE_SESSIONS,
+        cache=ResponseCache(MemoryCache(max_entries=MAX_CACHED_PAGES), stale_ttl=STALE_PAGE_TTL),
+        transport=TransportConfig(
+            scheduler=RequestScheduler(
+                rate=OUTBOUND_RATE, burst=OUTBOUND_BURST, per_user_concurrency=PER_USER_CONCURRENCY
+            )
+        ),
+        attendance_history=get_attendance_history(),
+        # Course units, topics and materials are the same for every student
+        shared_flights=SingleFlight(),
+        metrics=get_metrics(),
+        shared_cache=SharedCache(SQLiteCache(SHARED_CACHE_FILE), stale_ttl=STALE_PAGE_TTL),
+    )
+
+
+@st.cache_resource
+def get_attendance_history():
+    """Get the attendance history that every pooled session records into."""
+    return AttendanceHistory(ATTENDANCE_HISTORY_FILE)
+
+
+@st.cache_resource
+def get_metrics():
+    """Get the latency, size, cache and error metrics of every pooled session."""
+    return Metrics()
+
+
+@st.cache_resource
+def get_results_archive():
+    """Get the permanent archive of final semester results, shared by all users."""
+    return ResultsArchive(SQLiteCache(RESULTS_ARCHIVE_FILE))
+
+
+def run_async(coro):
+    """Run a coroutine on the shared PESU event loop and wait for its result."""
+    return _get_runner().run(coro)
+
+
+def run_with_pesu(fn, *args):
+    """Run `fn(pesu, *args)` with the logged-in user's pooled PESU session.
+
+    Returns whatever `fn` returns, or (None, error message) if the user has no
+    stored credentials or the call fails.
+    """
+    username = st.session_state.get('pesu_username')
+    password = st.session_state.get('pesu_password')
+    if not username or not password:
+        return None, "Credentials not found. Please login again."
+
+    try:
+        return run_async(get_session_pool().run(username, password, fn, *args))
+    except Exception as e:
+        traceback.print_exc()
+        return None, str(e)
+
+
+def drop_pesu_session(username):
+    """Close the pooled PESU session of a user, e.g. on logout."""
+    if username:
+        run_async(get_session_pool().invalidate(username))
@@ -0,0 +1 @@
+"""Benchmarks of the PESU Academy client, run offline against synthetic or recorded pages."""
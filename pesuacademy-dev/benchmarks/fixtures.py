@@ -0,0 +1,275 @@
+"""Synthetic PESU Academy pages with the same structure as the real ones, in several sizes.
+
+Every generator takes a count (of rows, courses, slots, ...) and returns the raw page bytes that the matching page
+handler receives. The counts of each size are listed in `SIZES`:
+
+- small: a student early in their program, or a quiet day.
+- medium: a typical page.
+- pathological: far more content than the portal is known to return, plus the noise (scripts, inline styles,
+  comments) that real pages carry, to expose anything that scales badly.
+"""
+
+import base64
+import json
+import random
+
+# Count passed to each generator, per page and size
+SIZES: dict[str, dict[str, int]] = {
+    "small": {
+        "semesters": 1,
+        "courses": 4,
+        "attendance": 4,
+        "results": 3,
+        "timetable": 6,
+        "announcements": 3,
+        "profile": 2_000,
+        "seating": 1,
+        "course_detail": 2,
+        "unit": 3,
+        "material_links": 2,
+    },
+    "medium": {
+        "semesters": 6,
+        "courses": 8,
+        "attendance": 8,
+        "results": 8,
+        "timetable": 10,
+        "announcements": 25,
+        "profile": 60_000,
+        "seating": 6,
+        "course_detail": 5,
+        "unit": 12,
+        "material_links": 10,
+    },
+    "pathological": {
+        "semesters": 40,
+        "courses": 200,
+        "attendance": 200,
+        "results": 200,
+        "timetable": 40,
+        "announcements": 1_000,
+        "profile": 2_000_000,
+        "seating": 300,
+        "course_detail": 100,
+        "unit": 500,
+        "material_links": 500,
+    },
+}
+
+# Markup that real pages wrap around the useful content
+_NOISE = (
+    '<script type="text/javascript">$(document).ready(function(){{ $(".x{i}").hide(); }});</script>'
+    "<style>.x{i} {{ display: none; }}</style><!-- panel {i} -->"
+)
+
+
+def _page(body: str, noise: int = 0) -> bytes:
+    """Wraps page content in the portal's document skeleton, with `noise` blocks of unrelated markup."""
+    filler = "".join(_NOISE.format(i=i) for i in range(noise))
+    return (
+        '<!DOCTYPE html><html><head><meta name="csrf-token" content="fixture-token"/>'
+        f"<title>PESU Academy</title></head><body>{filler}{body}</body></html>"
+    ).encode()
+
+
+def semesters(n: int) -> bytes:
+    """The semester dropdown returned by getStudentSemestersPESU."""
+    return "".join(f"<option value='\\\"{2760 + i}\\\"' >Sem-{i}</option>" for i in range(1, n + 1)).encode()
+
+
+def courses(n: int) -> bytes:
+    """The course list of a semester."""
+    rows = "".join(
+        f'<tr id="rowWiseCourseContent_{20000 + i}"><td>UE23CS{200 + i}A</td><td>Course &amp; Title {i}</td>'
+        f"<td>CC</td><td>Enrolled</td></tr>"
+        for i in range(n)
+    )
+    return _page(
+        '<div><table class="table table-hover box-shadow"><thead><tr><th>Code</th><th>Title</th><th>Type</th>'
+        f"<th>Status</th></tr></thead><tbody>{rows}</tbody></table></div>",
+        noise=n // 4,
+    )
+
+
+def attendance(n: int) -> bytes:
+    """The attendance table of a semester."""
+    rows = "".join(
+        f"<tr><td>UE23CS{200 + i}A</td><td>Course {i}</td><td>{20 + i % 10}/{30 + i % 10}</td>"
+        f"<td>{'NA' if i == 0 else round((20 + i % 10) / (30 + i % 10) * 100, 2)}</td></tr>"
+        for i in range(n)
+    )
+    return _page(
+        '<table class="table box-shadow"><thead><tr><th>Code</th><th>Title</th><th>Attended</th>'
+        f"<th>Percentage</th></tr></thead><tbody>{rows}</tbody></table>",
+        noise=n // 4,
+    )
+
+
+def results(n: int) -> bytes:
+    """The ESA/ISA results page of a semester."""
+    courses = "".join(
+        f'<div class="clearfix"><div class="header-info"><h6>UE23CS{200 + i}A - Subject {i}</h6>'
+        f'<h6 class="text-right">Credits : 4/4</h6></div><div class="dashboard-info-bar">'
+        f'<div><h6>ISA 1</h6><span class="dark-text">3{i % 10}.5</span> / 40 </div>'
+        f'<div><h6>ISA 2</h6><span class="dark-text">3{i % 10}</span>/40</div>'
+        f'<div><h6>ESA</h6><span class="dark-text">8{i % 10}</span> / 100</div>'
+        f'<div><h6>Grade</h6><span class="f-size-2x-big">A</span></div></div></div>'
+        for i in range(n)
+    )
+    return _page(
+        f'<div class="dashboard-info-bar"><div><h6>Credits Earned</h6> {4 * n}/{4 * n} </div>'
+        f'<div><h6>SGPA</h6> 8.65 </div></div><div class="multiple-info-wrapper">{courses}</div>',
+        noise=n // 4,
+    )
+
+
+def timetable(n: int) -> bytes:
+    """The timetable page, whose data is embedded as JSON in a script, with `n` slots per day."""
+    template = []
+    for i in range(1, n + 1):
+        start = 8 * 60 + (i - 1) * 55
+        hour, minute = divmod(start, 60)
+        end_hour, end_minute = divmod(start + 50, 60)
+        template.append(
+            {
+                "orderedBy": i,
+                "startTime": f"{(hour - 1) % 12 + 1:02d}:{minute:02d}:00 {'AM' if hour < 12 else 'PM'}",
+                "endTime": f"{(end_hour - 1) % 12 + 1:02d}:{end_minute:02d}:00 {'AM' if end_hour < 12 else 'PM'}",
+                "timeTableTemplateDetailsStatus": 1 if i % 4 == 3 else 0,
+            }
+        )
+    classes = {
+        f"ttDivText_{day}_{slot}_1": [
+            f"ttSubject_&&UE23CS{200 + slot}A{' (LAB)' if slot % 5 == 0 else ''}-Subject {slot}",
+            f"ttFaculty_&&Prof {slot}",
+            f"ttFaculty_&&Dr {day}",
+        ]
+        for day in range(1, 7)
+        for slot in range(1, n + 1)
+        if slot % 4 != 3 and (day + slot) % 4
+    }
+    script = (
+        f"<script>var x=1; var timeTableTemplateDetailsJson={json.dumps(template)}; "
+        f"var timeTableJson={json.dumps(classes)};</script>"
+    )
+    return _page(script, noise=n)
+
+
+def announcements(n: int) -> bytes:
+    """The announcements page, newest first, every other announcement with an attachment."""
+    items = []
+    for i in range(n):
+        attachment = (
+            f"<div><a href=\"javascript:handleDownloadAnoncemntdoc('{900 + i}')\">file{i}.pdf</a></div>"
+            if i % 2
+            else ""
+        )
+        items.append(
+            f'<div class="elem-info-wrapper"><h4 class="text-info"> Announcement {i} </h4>'
+            f'<span class="text-muted">{28 - i % 28}-March-2025</span><div class="col-md-12">'
+            f"<p>Body text {i} &amp; more <b>bold</b> {'lorem ipsum ' * (1 + i % 20)}</p><!-- c -->"
+            f'<script>var z={i};</script>{attachment}<a class="readmorelink" href="#">Read more</a></div></div>'
+        )
+    return _page(f'<div class="announcements">{"".join(items)}</div>', noise=n // 10)
+
+
+def profile(image_bytes: int) -> bytes:
+    """The profile page, with a base64 JPEG photo of `image_bytes` bytes inlined as on the portal."""
+    image = base64.b64encode(random.Random(image_bytes).randbytes(image_bytes)).decode()
+    labels = {
+        "Name": "JOHN DOE",
+        "PESU Id": "PES1202300001",
+        "SRN": "PES1UG23CS001",
+        "Program": "Bachelor of Technology",
+        "Branch": "Computer Science",
+        "Semester": "Sem-3",
+        "Section": "Section A",
+    }
+    inputs = {"Email ID": "john@example.com", "Contact No": "9999999999"}
+    fields = "".join(
+        f'<div class="form-group"><label class="lbl-title-light">{k}</label><label> {v} </label></div>'
+        for k, v in labels.items()
+    ) + "".join(
+        f'<div class="form-group"><label class="lbl-title-light">{k}</label><input type="text" value="{v}"/></div>'
+        for k, v in inputs.items()
+    )
+    parent = "".join(
+        f"<label>{k}</label><label>{v}</label>"
+        for k, v in (("Mobile", "1"), ("Email", "p@example.com"), ("Occupation", "E"), ("Qualification", "Q"))
+    )
+    body = (
+        f'<div class="media"><img class="media-object" src="data:image/jpeg;base64,{image}"/>'
+        f'<div class="media-body">{fields}'
+        '<div class="form-group"><label class="lbl-title-light">Aadhar No</label><input type="text" disabled/></div>'
+        '<div class="form-group"><label class="lbl-title-light">Name as in aadhar</label><label>JOHN D</label></div>'
+        '</div></div><h4>Other Information</h4><div class="info-contents"><label>SSLC Marks</label><label>95</label>'
+        "<label>PUC Marks</label><label>90</label><label>Date of birth</label><label>01-01-2005</label>"
+        '<label>Blood Group</label><label>O+</label></div><h4>Qualifying examination</h4><div class="info-contents">'
+        "<label>Exam</label><label>CET</label><label>Rank</label><label>100</label>"
+        '<label>Score</label><label>NA</label></div><h4>Parent Details</h4><div><div class="row">'
+        f'<div class="col-md-6"><label>Father Name</label><label>F</label>{parent}</div>'
+        f'<div class="col-md-6"><label>Mother Name</label><label>M</label>{parent}</div></div></div>'
+        "<h4>Address</h4><div><label>Present Address</label><label>Addr 1</label>"
+        "<label>Permanent Address</label><label>Addr 2</label></div>"
+    )
+    return _page(body, noise=10)
+
+
+def seating(n: int) -> bytes:
+    """The exam seating table."""
+    rows = "".join(
+        f"<tr><td>ISA {i}</td><td>UE23CS{200 + i}A</td><td>{1 + i % 28}-Mar-2025</td><td>09:00 AM</td>"
+        f"<td>T{i}</td><td>B{i}</td></tr>"
+        for i in range(n)
+    )
+    return _page(f'<table id="seatinginfo"><thead><tr><th>Name</th></tr></thead><tbody>{rows}</tbody></table>')
+
+
+def course_detail(n: int) -> bytes:
+    """The unit list of a course."""
+    units = "".join(
+        f'<li><a href="#" title="Unit {i}: Topic" onclick="handleclassUnit(\'{5000 + i}\')">Unit {i}</a></li>'
+        for i in range(1, n + 1)
+    )
+    return _page(f'<ul id="courselistunit">{units}</ul>', noise=n // 4)
+
+
+def unit(n: int) -> bytes:
+    """The topic table of a unit."""
+    rows = "".join(
+        f"<tr onclick=\"handleclasscoursecontentunit('{7000 + i}','20000','5001','1','')\"><td>"
+        f'<span class="short-title" title="Topic {i}">Topic {i}</span></td></tr>'
+        for i in range(n)
+    )
+    return _page(f'<table class="table table-bordered"><tbody>{rows}</tbody></table>', noise=n // 4)
+
+
+def material_links(n: int) -> bytes:
+    """The material links of a topic, half of them documents and half PDF slides."""
+    links = "".join(
+        f'<div class="link-preview" onclick="downloadcoursedoc(\'doc-{i}\')"> Doc {i} </div>'
+        f'<div class="link-preview"><a onclick="loadIframe(\'/Academy/s/referenceMeterials/'
+        f"downloadslidecoursedoc/{i}#view=fit', 1)\">Slide {i}</a></div>"
+        for i in range(n)
+    )
+    return _page(f"<div>{links}</div>", noise=n // 4)
+
+
+GENERATORS = {
+    "semesters": semesters,
+    "courses": courses,
+    "attendance": attendance,
+    "results": results,
+    "timetable": timetable,
+    "announcements": announcements,
+    "profile": profile,
+    "seating": seating,
+    "course_detail": course_detail,
+    "unit": unit,
+    "material_links": material_links,
+}
+
+
+def build(size: str) -> dict[str, bytes]:
+    """Returns every page in the given size, keyed by page name."""
+    return {page: GENERATORS[page](count) for page, count in SIZES[size].items()}
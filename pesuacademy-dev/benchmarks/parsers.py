@@ -0,0 +1,291 @@
+"""Micro-benchmarks of the page handlers' parse paths.
+
+Every page handler is measured end to end (from the raw response body to the returned models, without any network),
+along with the individual steps that dominate it: building the document with each parser engine, and the extraction
+helpers of the results, profile, timetable and announcements handlers.
+
+For each case, engine and fixture size the suite reports wall time (median, minimum and spread over many runs),
+peak traced memory during one run, and the memory and number of allocated blocks still held by its result. Results
+are printed as a table and can be written as JSON to compare engines, model construction strategies or commits.
+Memory is what tracemalloc sees, i.e. Python objects; memory held inside C libraries (such as Lexbor's own document
+tree) is not included.
+
+Usage (from the project root):
+    python -m benchmarks.parsers
+    python -m benchmarks.parsers --engine lexbor --size medium --output results.json
+    python -m benchmarks.parsers --recording session.json  # also benchmark pages captured from a real session
+"""
+
+import argparse
+import gc
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable, Coroutine
+from dataclasses import asdict, dataclass
+from typing import Any
+
+import httpx
+
+from benchmarks import fixtures
+from pesuacademy import constants
+from pesuacademy.models import Topic
+from pesuacademy.pages import (
+    _AnnouncementPageHandler,
+    _AttendancePageHandler,
+    _CourseDetailPageHandler,
+    _CoursesPageHandler,
+    _MaterialLinksHandler,
+    _ProfilePageHandler,
+    _ResultsPageHandler,
+    _SeatingInformationHandler,
+    _SemesterHandler,
+    _TimetablePageHandler,
+    _UnitPageHandler,
+)
+from pesuacademy.parsers import (
+    _ENGINES,
+    _parse_html,
+    get_parse_memo,
+    get_parser_engine,
+    set_parse_memo,
+    set_parser_engine,
+)
+from pesuacademy.replay import Recording
+
+# Page names of the endpoints in a recording
+_RECORDED_PAGES = {
+    "Semesters": "semesters",
+    "Courses": "courses",
+    "Attendance": "attendance",
+    "Results": "results",
+    "Timetable": "timetable",
+    "Announcements": "announcements",
+    "Profile": "profile",
+    "SeatingInformation": "seating",
+    "CourseDetail": "course_detail",
+    "UnitDetail": "unit",
+    "MaterialLinks": "material_links",
+}
+_TOPIC = Topic(title="Topic", id="7000", course_id="20000", unit_id="5001")
+
+
+class _FixtureSession:
+    """Stands in for an httpx client and answers every GET with the same body, without suspending."""
+
+    def __init__(self, body: bytes) -> None:
+        self._body = body
+
+    async def get(self, url: str, params: dict[str, str] | None = None) -> httpx.Response:
+        request = httpx.Request("GET", f"{constants.BASE_URL}/Academy{url}", params=params)
+        return httpx.Response(200, content=self._body, request=request)
+
+
+def _run_now(coro: Coroutine[Any, Any, Any]) -> Any:  # noqa: ANN401
+    """Runs a coroutine that never suspends to completion, without the overhead of an event loop."""
+    try:
+        coro.send(None)
+    except StopIteration as e:
+        return e.value
+    coro.close()
+    raise RuntimeError("The handler tried to wait for I/O during a benchmark.")
+
+
+# Handlers measured end to end, keyed by page name
+_HANDLERS: dict[str, Callable[[_FixtureSession], Coroutine[Any, Any, Any]]] = {
+    "semesters": _SemesterHandler._get_semester_ids,
+    "courses": lambda session: _CoursesPageHandler._get(session, "1"),
+    "attendance": lambda session: _AttendancePageHandler._get(session, "1"),
+    "results": lambda session: _ResultsPageHandler._get(session, "1"),
+    "timetable": _TimetablePageHandler._get,
+    "announcements": _AnnouncementPageHandler._get,
+    "profile": _ProfilePageHandler._get,
+    "seating": _SeatingInformationHandler._get,
+    "course_detail": lambda session: _CourseDetailPageHandler._get(session, "20000"),
+    "unit": lambda session: _UnitPageHandler._get(session, "5001"),
+    "material_links": lambda session: _MaterialLinksHandler._get(session, _TOPIC, "2"),
+}
+
+
+def _cases(page: str, body: bytes) -> dict[str, Callable[[], Any]]:
+    """Returns the benchmark cases of a page, keyed by case name."""
+    handler = _HANDLERS[page]
+    session = _FixtureSession(body)
+    cases: dict[str, Callable[[], Any]] = {f"{page}.handler": lambda: _run_now(handler(session))}
+    if page != "timetable":
+        cases[f"{page}.parse_html"] = lambda: _parse_html(body)
+
+    if page == "results":
+        document = _parse_html(body)
+        cases["results._parse_course_results"] = lambda: _ResultsPageHandler._parse_course_results(document)
+    elif page == "profile":
+        document = _parse_html(body)
+        cases["profile._parse_profile_soup"] = lambda: _ProfilePageHandler._parse_profile_soup(document)
+        cases["profile._parse_profile_soup(no image)"] = lambda: _ProfilePageHandler._parse_profile_soup(
+            document, include_image=False
+        )
+        cases["profile._extract_image"] = lambda: _ProfilePageHandler._extract_image(body)
+    elif page == "announcements":
+        document = _parse_html(body)
+        cases["announcements._parse_announcement"] = lambda: [
+            _AnnouncementPageHandler._parse_announcement(wrapper) for wrapper in document.css("div.elem-info-wrapper")
+        ]
+    elif page == "timetable":
+        text = body.decode()
+        template_data, class_data = _TimetablePageHandler._extract_json_data(text)
+        slots, ordered = _TimetablePageHandler._process_template(template_data)
+        cases["timetable._extract_json_data"] = lambda: _TimetablePageHandler._extract_json_data(text)
+        cases["timetable._process_template"] = lambda: _TimetablePageHandler._process_template(template_data)
+        cases["timetable._build_schedule_by_day"] = lambda: _TimetablePageHandler._build_schedule_by_day(
+            slots, ordered, class_data
+        )
+    return cases
+
+
+@dataclass
+class Result:
+    """The measurements of one case with one engine and fixture size."""
+
+    case: str
+    engine: str
+    size: str
+    page_bytes: int
+    runs: int
+    median_us: float
+    min_us: float
+    stdev_us: float
+    peak_kib: float
+    retained_kib: float
+    retained_blocks: int
+
+
+def _measure(fn: Callable[[], Any], min_time: float, min_runs: int, max_runs: int) -> dict[str, float | int]:
+    """Times a callable over many runs, then traces the memory of one more run."""
+    fn()  # Warm-up: imports, regex compilation and caches are not part of the measurement
+    timings = []
+    start = time.perf_counter()
+    while len(timings) < min_runs or (time.perf_counter() - start < min_time and len(timings) < max_runs):
+        t0 = time.perf_counter_ns()
+        fn()
+        timings.append(time.perf_counter_ns() - t0)
+
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    result = fn()
+    current, peak = tracemalloc.get_traced_memory()
+    blocks = sum(stat.count for stat in tracemalloc.take_snapshot().statistics("filename"))
+    tracemalloc.stop()
+    del result
+
+    return {
+        "runs": len(timings),
+        "median_us": statistics.median(timings) / 1000,
+        "min_us": min(timings) / 1000,
+        "stdev_us": statistics.pstdev(timings) / 1000,
+        "peak_kib": (peak - baseline) / 1024,
+        "retained_kib": (current - baseline) / 1024,
+        "retained_blocks": blocks,
+    }
+
+
+def run(
+    engines: list[str],
+    sizes: list[str],
+    recording: Recording | None = None,
+    pages: list[str] | None = None,
+    min_time: float = 0.2,
+    min_runs: int = 5,
+    max_runs: int = 10_000,
+) -> list[Result]:
+    """Runs the benchmark suite.
+
+    Args:
+        engines (List[str]): Parser engines to measure.
+        sizes (List[str]): Fixture sizes to measure (see `fixtures.SIZES`).
+        recording (Optional[Recording]): A recorded session whose pages are measured as the size "recorded".
+        pages (Optional[List[str]]): Pages to measure. Defaults to all of them.
+        min_time (float): Seconds each case is repeated for, at least.
+        min_runs (int): Minimum number of timed runs per case.
+        max_runs (int): Maximum number of timed runs per case.
+
+    Returns:
+        List[Result]: One result per case, engine and size.
+    """
+    corpora = {size: fixtures.build(size) for size in sizes}
+    if recording is not None:
+        corpora["recorded"] = {
+            _RECORDED_PAGES[response.endpoint]: response.body
+            for response in recording.responses.values()
+            if response.endpoint in _RECORDED_PAGES and response.status_code == 200
+        }
+
+    previous_engine = get_parser_engine()
+    previous_memo = get_parse_memo()
+    # Every run parses the same page, which the parse memo would answer without parsing it at all
+    set_parse_memo(None)
+    results = []
+    try:
+        for engine in engines:
+            set_parser_engine(engine)
+            for size, corpus in corpora.items():
+                for page, body in corpus.items():
+                    if pages and page not in pages:
+                        continue
+                    for case, fn in _cases(page, body).items():
+                        measurement = _measure(fn, min_time, min_runs, max_runs)
+                        results.append(Result(case=case, engine=engine, size=size, page_bytes=len(body), **measurement))
+    finally:
+        set_parser_engine(previous_engine)
+        set_parse_memo(previous_memo)
+    return results
+
+
+def _print_table(results: list[Result]) -> None:
+    """Prints the results as a fixed-width table."""
+    header = f"{'case':<38} {'engine':<7} {'size':<13} {'page KiB':>9} {'median µs':>11} {'min µs':>10}"
+    header += f" {'peak KiB':>9} {'held KiB':>9} {'blocks':>7}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(
+            f"{r.case:<38} {r.engine:<7} {r.size:<13} {r.page_bytes / 1024:>9.1f} {r.median_us:>11.1f} "
+            f"{r.min_us:>10.1f} {r.peak_kib:>9.1f} {r.retained_kib:>9.1f} {r.retained_blocks:>7}"
+        )
+
+
+def main() -> None:
+    """Parses the command line, runs the suite and reports the results."""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.parsers", description="Benchmark the page parsers.")
+    parser.add_argument("--engine", action="append", choices=list(_ENGINES), help="Parser engine (repeatable).")
+    parser.add_argument("--size", action="append", choices=list(fixtures.SIZES), help="Fixture size (repeatable).")
+    parser.add_argument("--page", action="append", choices=list(fixtures.GENERATORS), help="Page (repeatable).")
+    parser.add_argument("--recording", help="A recorded session (JSON) whose pages are benchmarked too.")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Seconds each case is repeated for, at least.")
+    parser.add_argument("--output", help="Write the results to this JSON file.")
+    args = parser.parse_args()
+
+    results = run(
+        engines=args.engine or list(_ENGINES),
+        sizes=args.size or list(fixtures.SIZES),
+        recording=Recording.load(args.recording) if args.recording else None,
+        pages=args.page,
+        min_time=args.min_time,
+    )
+    _print_table(results)
+    if args.output:
+        report = {
+            "python": sys.version.split()[0],
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "results": [asdict(result) for result in results],
+        }
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,56 @@
 
 __version__ = "1.0.0"
 
+from .cache import CacheBackend, MemoryCache, RedisCache, ResponseCache, ResultsArchive, SharedCache, SQLiteCache
+from .history import AttendanceHistory
+from .metrics import MetricEvent, Metrics
+from .parsers import (
+    ParseMemo,
+    get_parse_executor,
+    get_parse_memo,
+    get_parser_engine,
+    parse_executor_status,
+    set_parse_executor,
+    set_parse_memo,
+    set_parser_engine,
+)
 from .pesuacademy import PESUAcademy
+from .replay import Recording, StandInServer
+from .runner import BackgroundRunner, SyncPESUAcademy, get_runner
+from .scheduler import RequestScheduler, request_priority
+from .session_pool import SessionPool
+from .single_flight import SingleFlight
+from .transport import CircuitBreaker, TransportConfig
 
-__all__ = ["PESUAcademy"]
+__all__ = [
+    "AttendanceHistory",
+    "BackgroundRunner",
+    "CacheBackend",
+    "CircuitBreaker",
+    "MemoryCache",
+    "MetricEvent",
+    "Metrics",
+    "PESUAcademy",
+    "ParseMemo",
+    "Recording",
+    "RedisCache",
+    "RequestScheduler",
+    "ResponseCache",
+    "ResultsArchive",
+    "SQLiteCache",
+    "SessionPool",
+    "SharedCache",
+    "SingleFlight",
+    "StandInServer",
+    "SyncPESUAcademy",
+    "TransportConfig",
+    "get_parse_executor",
+    "get_parse_memo",
+    "get_parser_engine",
+    "get_runner",
+    "parse_executor_status",
+    "request_priority",
+    "set_parse_executor",
+    "set_parse_memo",
+    "set_parser_engine",
+]
@@ -0,0 +1,19 @@
+"""Response caching for PESU Academy sessions."""
+
+from .backends import CacheBackend, MemoryCache, RedisCache, SQLiteCache
+from .response_cache import ResponseCache, _bypass, _bypass_cache, _CachingTransport
+from .results_archive import ResultsArchive
+from .shared_cache import SharedCache
+
+__all__ = [
+    "CacheBackend",
+    "MemoryCache",
+    "RedisCache",
+    "ResponseCache",
+    "ResultsArchive",
+    "SQLiteCache",
+    "SharedCache",
+    "_CachingTransport",
+    "_bypass",
+    "_bypass_cache",
+]
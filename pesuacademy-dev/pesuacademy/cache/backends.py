@@ -0,0 +1,186 @@
+"""Storage backends for the PESU Academy response cache."""
+
+import asyncio
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any
+
+
+class CacheBackend(ABC):
+    """Interface for key/value stores that can hold cached responses.
+
+    Keys are strings built by the cache and values are opaque bytes. Entries expire `ttl` seconds after they were
+    stored; a `ttl` of None keeps the entry until it is deleted or evicted.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> bytes | None:
+        """Returns the value stored under a key, or None if it is missing or expired."""
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: float | None) -> None:
+        """Stores a value under a key for `ttl` seconds."""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Deletes the entry stored under a key, if any."""
+
+    @abstractmethod
+    async def delete_prefix(self, prefix: str) -> None:
+        """Deletes every entry whose key starts with the given prefix."""
+
+    async def close(self) -> None:
+        """Releases any resources held by the backend."""
+
+
+class MemoryCache(CacheBackend):
+    """An in-process LRU cache.
+
+    Suitable when all sessions live in the same process, e.g. behind a `SessionPool`.
+    """
+
+    def __init__(self, max_entries: int = 2048) -> None:
+        """Initializes an empty in-memory cache.
+
+        Args:
+            max_entries (int): Maximum number of entries kept. The least recently used entry is evicted first.
+        """
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[bytes, float | None]] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Returns the number of entries currently stored, including expired ones not yet evicted."""
+        return len(self._entries)
+
+    async def get(self, key: str) -> bytes | None:
+        """Returns the value stored under a key, or None if it is missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: float | None) -> None:
+        """Stores a value under a key for `ttl` seconds."""
+        self._entries[key] = (value, time.time() + ttl if ttl is not None else None)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    async def delete(self, key: str) -> None:
+        """Deletes the entry stored under a key, if any."""
+        self._entries.pop(key, None)
+
+    async def delete_prefix(self, prefix: str) -> None:
+        """Deletes every entry whose key starts with the given prefix."""
+        for key in [key for key in self._entries if key.startswith(prefix)]:
+            del self._entries[key]
+
+
+class SQLiteCache(CacheBackend):
+    """A persistent cache stored in a local SQLite database.
+
+    Entries survive process restarts and can be shared between processes on the same machine.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Opens (and creates if needed) the SQLite cache database.
+
+        Args:
+            path (str): Path of the database file.
+        """
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL)"
+        )
+
+    def _execute(self, query: str, params: tuple[Any, ...]) -> list[tuple[Any, ...]]:
+        """Runs a single statement while holding the connection lock."""
+        with self._lock:
+            return self._connection.execute(query, params).fetchall()
+
+    async def get(self, key: str) -> bytes | None:
+        """Returns the value stored under a key, or None if it is missing or expired."""
+        rows = await asyncio.to_thread(
+            self._execute,
+            "SELECT value FROM responses WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+            (key, time.time()),
+        )
+        return rows[0][0] if rows else None
+
+    async def set(self, key: str, value: bytes, ttl: float | None) -> None:
+        """Stores a value under a key for `ttl` seconds."""
+        expires_at = time.time() + ttl if ttl is not None else None
+        await asyncio.to_thread(
+            self._execute,
+            "INSERT OR REPLACE INTO responses (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, value, expires_at),
+        )
+
+    async def delete(self, key: str) -> None:
+        """Deletes the entry stored under a key, if any."""
+        await asyncio.to_thread(self._execute, "DELETE FROM responses WHERE key = ?", (key,))
+
+    async def delete_prefix(self, prefix: str) -> None:
+        """Deletes every entry whose key starts with the given prefix."""
+        await asyncio.to_thread(
+            self._execute, "DELETE FROM responses WHERE substr(key, 1, ?) = ?", (len(prefix), prefix)
+        )
+
+    async def purge_expired(self) -> None:
+        """Deletes all expired entries from the database file."""
+        await asyncio.to_thread(
+            self._execute, "DELETE FROM responses WHERE expires_at IS NOT NULL AND expires_at <= ?", (time.time(),)
+        )
+
+    async def close(self) -> None:
+        """Closes the database connection."""
+        with self._lock:
+            self._connection.close()
+
+
+class RedisCache(CacheBackend):
+    """A cache stored in Redis or any server speaking its protocol (Valkey, KeyDB, Dragonfly, ...).
+
+    The client is not created here so that this package does not depend on a Redis library. Pass an asyncio client
+    such as `redis.asyncio.Redis.from_url("redis://localhost")`.
+    """
+
+    def __init__(self, client: Any) -> None:  # noqa: ANN401
+        """Initializes the cache with an asyncio Redis client.
+
+        Args:
+            client: An asyncio Redis client providing `get`, `set`, `delete` and `scan_iter`.
+        """
+        self._client = client
+
+    async def get(self, key: str) -> bytes | None:
+        """Returns the value stored under a key, or None if it is missing or expired."""
+        return await self._client.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: float | None) -> None:
+        """Stores a value under a key for `ttl` seconds."""
+        await self._client.set(key, value, px=int(ttl * 1000) if ttl is not None else None)
+
+    async def delete(self, key: str) -> None:
+        """Deletes the entry stored under a key, if any."""
+        await self._client.delete(key)
+
+    async def delete_prefix(self, prefix: str) -> None:
+        """Deletes every entry whose key starts with the given prefix."""
+        keys = [key async for key in self._client.scan_iter(match=f"{prefix}*")]
+        if keys:
+            await self._client.delete(*keys)
+
+    async def close(self) -> None:
+        """Closes the Redis client."""
+        await self._client.aclose()
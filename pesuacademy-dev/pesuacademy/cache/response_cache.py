@@ -0,0 +1,244 @@
+"""Per-user cache of PESU Academy page responses."""
+
+import hashlib
+import json
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+import httpx
+
+from pesuacademy import constants
+from pesuacademy.cache.backends import CacheBackend, MemoryCache
+from pesuacademy.exceptions import PortalUnavailableError
+from pesuacademy.metrics import CACHE_EXTENSION
+from pesuacademy.util import _endpoint_name
+
+# Query parameters that do not change what the portal returns (the "_" cache-buster)
+_IGNORED_PARAMS = frozenset({"_"})
+# Headers that describe the original transfer and no longer apply once the body has been decoded
+_TRANSFER_HEADERS = frozenset({"content-encoding", "content-length", "transfer-encoding"})
+# Cookies belong to the session that received them and must never be replayed into another one
+_UNCACHED_HEADERS = _TRANSFER_HEADERS | {"set-cookie"}
+# Header added to responses served past their TTL because the portal could not be reached
+STALE_HEADER = "x-pesuacademy-stale"
+
+_bypass: ContextVar[bool] = ContextVar("pesuacademy_cache_bypass", default=False)
+
+
+@contextmanager
+def _bypass_cache(enabled: bool = True) -> Iterator[None]:
+    """Makes requests sent inside the block skip cached responses. Fresh responses are still stored.
+
+    The setting is inherited by tasks created inside the block.
+
+    Args:
+        enabled (bool): Whether to bypass the cache. False leaves an enclosing bypass in effect.
+    """
+    token = _bypass.set(_bypass.get() or enabled)
+    try:
+        yield
+    finally:
+        _bypass.reset(token)
+
+
+class ResponseCache:
+    """Caches page responses per user and endpoint, with a lifetime for each endpoint.
+
+    Responses are keyed by the user, the endpoint and its meaningful query parameters, so the `_` cache-buster added
+    to every request does not defeat the cache. Only successful GET requests to the known page endpoints are cached.
+
+    A single instance can be shared by any number of sessions, e.g. by passing it to a `SessionPool`.
+    """
+
+    def __init__(
+        self,
+        backend: CacheBackend | None = None,
+        ttls: dict[str, float] | None = None,
+        namespace: str = "pesuacademy",
+        stale_ttl: float = 0.0,
+    ) -> None:
+        """Initializes the response cache.
+
+        Args:
+            backend (Optional[CacheBackend]): Where responses are stored. Defaults to an in-memory LRU cache.
+            ttls (Optional[dict[str, float]]): Lifetimes in seconds that override `constants.CACHE_TTLS`, keyed by
+                endpoint name (e.g. {"Attendance": 60}). A lifetime of 0 disables caching for that endpoint.
+            namespace (str): Prefix of every cache key, to keep several applications apart in a shared store.
+            stale_ttl (float): Seconds that responses are kept after their TTL has run out. Such stale responses are
+                only served when the portal cannot be reached (connection errors, timeouts, 5xx responses or an open
+                circuit breaker), and carry an `x-pesuacademy-stale` header.
+        """
+        self.backend = backend or MemoryCache()
+        self.ttls = {**constants.CACHE_TTLS, **(ttls or {})}
+        self._namespace = namespace
+        self.stale_ttl = stale_ttl
+
+    @staticmethod
+    def _user_key(username: str) -> str:
+        """Returns a stable identifier for a user that does not reveal the username."""
+        return hashlib.sha256(username.encode()).hexdigest()[:16]
+
+    def _prefix(self, username: str | None = None, endpoint: str | None = None) -> str:
+        """Builds the key prefix shared by all entries of a user and, optionally, one of their endpoints."""
+        prefix = f"{self._namespace}:"
+        if username is not None:
+            prefix += f"{self._user_key(username)}:"
+            if endpoint is not None:
+                prefix += f"{endpoint}:"
+        return prefix
+
+    def _key(self, username: str, request: httpx.Request) -> tuple[str, float] | None:
+        """Returns the cache key and lifetime of a request, or None if its response must not be cached."""
+        if request.method != "GET":
+            return None
+        endpoint = _endpoint_name(request)
+        ttl = self.ttls.get(endpoint) if endpoint else None
+        if not ttl:
+            return None
+        params = sorted((k, v) for k, v in request.url.params.multi_items() if k not in _IGNORED_PARAMS)
+        return self._prefix(username, endpoint) + str(httpx.QueryParams(params)), ttl
+
+    @staticmethod
+    def _encode(response: httpx.Response) -> bytes:
+        """Serializes a fully read response into bytes."""
+        headers = [(k, v) for k, v in response.headers.multi_items() if k.lower() not in _UNCACHED_HEADERS]
+        meta = {"status_code": response.status_code, "headers": headers, "stored_at": time.time()}
+        return json.dumps(meta).encode() + b"\n" + response.content
+
+    @staticmethod
+    def _decode(value: bytes, request: httpx.Request) -> httpx.Response:
+        """Rebuilds a response from bytes produced by `_encode`."""
+        meta, content = value.split(b"\n", 1)
+        meta = json.loads(meta)
+        return httpx.Response(
+            meta["status_code"],
+            headers=meta["headers"],
+            content=content,
+            request=request,
+            extensions={"stored_at": meta["stored_at"]},
+        )
+
+    async def _load(self, username: str, request: httpx.Request, stale: bool = False) -> httpx.Response | None:
+        """Returns the cached response to a request, or None if there is none or the cache is bypassed.
+
+        Args:
+            username (str): The user the request is sent for.
+            request (httpx.Request): The request to answer.
+            stale (bool): Whether to also return responses whose TTL has run out, even when bypassing the cache.
+        """
+        key = self._key(username, request)
+        if key is None or (_bypass.get() and not stale):
+            return None
+        value = await self.backend.get(key[0])
+        if value is None:
+            return None
+        response = self._decode(value, request)
+        age = time.time() - response.extensions["stored_at"]
+        if age <= key[1]:
+            return response
+        if not stale:
+            return None
+        response.headers[STALE_HEADER] = str(int(age))
+        return response
+
+    async def _store(self, username: str, request: httpx.Request, response: httpx.Response) -> None:
+        """Stores a fully read response if its request is cacheable and it succeeded."""
+        key = self._key(username, request)
+        if key is None or response.status_code != httpx.codes.OK:
+            return
+        await self.backend.set(key[0], self._encode(response), key[1] + self.stale_ttl)
+
+    async def invalidate(self, username: str | None = None, *endpoints: str) -> None:
+        """Removes cached responses.
+
+        Args:
+            username (Optional[str]): The user whose responses should be removed. If None, the whole cache is cleared.
+            *endpoints (str): Endpoint names (e.g. "Attendance") to remove. If none are given, every endpoint of
+                the user is removed.
+        """
+        if username is None:
+            await self.backend.delete_prefix(self._prefix())
+            return
+        for endpoint in endpoints or (None,):
+            await self.backend.delete_prefix(self._prefix(username, endpoint))
+
+    async def close(self) -> None:
+        """Closes the storage backend."""
+        await self.backend.close()
+
+
+class _CachingTransport(httpx.AsyncBaseTransport):
+    """An httpx transport that answers cacheable requests from a `ResponseCache` before going to the network."""
+
+    def __init__(
+        self, transport: httpx.AsyncBaseTransport, cache: ResponseCache | None, shared: ResponseCache | None = None
+    ) -> None:
+        """Wraps a transport with a response cache.
+
+        Args:
+            transport (httpx.AsyncBaseTransport): The transport used for requests the cache cannot answer.
+            cache (Optional[ResponseCache]): The per-user cache to read from and store into.
+            shared (Optional[ResponseCache]): A cache for responses that are the same for every user, e.g. a
+                `SharedCache`. Requests it accepts are answered from and stored into it instead of the per-user cache.
+        """
+        self._transport = transport
+        self._cache = cache
+        self._shared = shared
+        # Set once the user has logged in; nothing is cached before that
+        self.username: str | None = None
+
+    def _tier(self, username: str, request: httpx.Request) -> ResponseCache | None:
+        """Returns the cache a request belongs in: the shared one if it accepts the request, else the per-user one."""
+        if self._shared is not None and self._shared._key(username, request) is not None:
+            return self._shared
+        return self._cache
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        """Returns the cached response to a request, or sends it and caches the response."""
+        username = self.username
+        cache = self._tier(username, request) if username is not None else None
+        if username is None or cache is None:
+            return await self._transport.handle_async_request(request)
+
+        cached = await cache._load(username, request)
+        if cached is not None:
+            cached.extensions[CACHE_EXTENSION] = "hit"
+            return cached
+
+        try:
+            response = await self._transport.handle_async_request(request)
+        except (httpx.TransportError, PortalUnavailableError):
+            # Serve an outdated copy rather than nothing while the portal is down
+            stale = await cache._load(username, request, stale=True)
+            if stale is None:
+                raise
+            stale.extensions[CACHE_EXTENSION] = "stale"
+            return stale
+        if response.status_code >= httpx.codes.INTERNAL_SERVER_ERROR:
+            stale = await cache._load(username, request, stale=True)
+            if stale is not None:
+                await response.aclose()
+                stale.extensions[CACHE_EXTENSION] = "stale"
+                return stale
+        if cache._key(username, request) is None or response.status_code != httpx.codes.OK:
+            return response
+        try:
+            await response.aread()
+        finally:
+            await response.aclose()
+        await cache._store(username, request, response)
+        # The body has already been decoded, so hand it on without the original transfer headers
+        headers = [(k, v) for k, v in response.headers.multi_items() if k.lower() not in _TRANSFER_HEADERS]
+        return httpx.Response(
+            response.status_code,
+            headers=headers,
+            content=response.content,
+            request=request,
+            extensions={CACHE_EXTENSION: "miss"},
+        )
+
+    async def aclose(self) -> None:
+        """Closes the wrapped transport. The caches are left open since they may be shared."""
+        await self._transport.aclose()
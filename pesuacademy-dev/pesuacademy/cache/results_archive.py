@@ -0,0 +1,50 @@
+"""Permanent per-user archive of final semester results."""
+
+from pesuacademy.cache.backends import CacheBackend
+from pesuacademy.cache.response_cache import ResponseCache
+from pesuacademy.models import SemesterResult
+
+
+class ResultsArchive:
+    """Keeps the parsed results of semesters whose results are final, without an expiry.
+
+    Published ESA results of a past semester never change, so once they have been fetched there is no reason to ask
+    the portal again: `get_all_results()` reads archived semesters from here and only requests the others. Only
+    results that are `SemesterResult.published` are archived. Results are keyed by user and semester ID. Use a
+    persistent backend (e.g. `SQLiteCache`) to keep them across restarts.
+    """
+
+    def __init__(self, backend: CacheBackend, namespace: str = "pesuacademy-results") -> None:
+        """Initializes the archive.
+
+        Args:
+            backend (CacheBackend): Where results are stored.
+            namespace (str): Prefix of every key, to keep the archive apart from other entries of a shared store.
+        """
+        self.backend = backend
+        self._namespace = namespace
+
+    def _prefix(self, username: str) -> str:
+        """Builds the key prefix shared by all archived results of a user."""
+        return f"{self._namespace}:{ResponseCache._user_key(username)}:"
+
+    async def get(self, username: str, semester_id: str) -> SemesterResult | None:
+        """Returns the archived results of a semester, or None if they have not been archived."""
+        value = await self.backend.get(self._prefix(username) + semester_id)
+        return SemesterResult.model_validate_json(value) if value is not None else None
+
+    async def put(self, username: str, semester_id: str, result: SemesterResult) -> None:
+        """Archives the final results of a semester."""
+        await self.backend.set(self._prefix(username) + semester_id, result.model_dump_json().encode(), None)
+
+    async def delete(self, username: str, semester_id: str) -> None:
+        """Removes the archived results of a semester, e.g. if they were archived before they were final."""
+        await self.backend.delete(self._prefix(username) + semester_id)
+
+    async def forget(self, username: str) -> None:
+        """Removes every archived result of a user."""
+        await self.backend.delete_prefix(self._prefix(username))
+
+    async def close(self) -> None:
+        """Closes the storage backend."""
+        await self.backend.close()
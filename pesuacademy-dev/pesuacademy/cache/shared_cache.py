@@ -0,0 +1,75 @@
+"""Cache of PESU Academy page responses that are the same for every user."""
+
+import httpx
+
+from pesuacademy import constants
+from pesuacademy.cache.backends import CacheBackend
+from pesuacademy.cache.response_cache import ResponseCache
+from pesuacademy.util import _endpoint_name
+
+
+class SharedCache(ResponseCache):
+    """Caches the responses of class-level pages once for all users, instead of once per user.
+
+    The units of a course, the topics of a unit and the material links of a topic only depend on the course, unit,
+    topic and material type requested, so a whole section of students can be served the same cached response. Entries
+    are keyed by the endpoint and its meaningful query parameters (which hold those IDs) and by no user at all.
+
+    Only the endpoints in `constants.SHARED_CACHE_TTLS` are ever stored, whatever lifetimes are configured, so pages
+    with personal data (attendance, results, profile, ...) can never be served to another user.
+
+    Pass it to `PESUAcademy.login()` (or a `SessionPool`) next to or instead of a per-user `ResponseCache`. With a
+    persistent backend such as `SQLiteCache` or `RedisCache`, the entries survive restarts and are shared between
+    processes.
+    """
+
+    def __init__(
+        self,
+        backend: CacheBackend | None = None,
+        ttls: dict[str, float] | None = None,
+        namespace: str = "pesuacademy-shared",
+        stale_ttl: float = 0.0,
+    ) -> None:
+        """Initializes the shared cache.
+
+        Args:
+            backend (Optional[CacheBackend]): Where responses are stored. Defaults to an in-memory LRU cache.
+            ttls (Optional[dict[str, float]]): Lifetimes in seconds that override `constants.SHARED_CACHE_TTLS`,
+                keyed by endpoint name (e.g. {"MaterialLinks": 3600}). A lifetime of 0 disables sharing that endpoint.
+            namespace (str): Prefix of every cache key, to keep several applications apart in a shared store.
+            stale_ttl (float): Seconds that responses are kept after their TTL has run out, to be served while the
+                portal cannot be reached.
+
+        Raises:
+            ValueError: If a lifetime is given for an endpoint that is not the same for every user.
+        """
+        unshareable = sorted(set(ttls or {}) - constants.SHARED_CACHE_TTLS.keys())
+        if unshareable:
+            raise ValueError(f"Endpoints with per-user content cannot be shared: {', '.join(unshareable)}.")
+        super().__init__(backend, None, namespace, stale_ttl)
+        self.ttls = {**constants.SHARED_CACHE_TTLS, **(ttls or {})}
+
+    def _prefix(self, username: str | None = None, endpoint: str | None = None) -> str:
+        """Builds the key prefix shared by all entries or, optionally, those of one endpoint. Users play no part."""
+        prefix = f"{self._namespace}:"
+        if endpoint is not None:
+            prefix += f"{endpoint}:"
+        return prefix
+
+    def _key(self, username: str, request: httpx.Request) -> tuple[str, float] | None:
+        """Returns the cache key and lifetime of a request, or None if its response must not be shared."""
+        if _endpoint_name(request) not in constants.SHARED_CACHE_TTLS:
+            return None
+        return super()._key(username, request)
+
+    async def invalidate(self, username: str | None = None, *endpoints: str) -> None:
+        """Removes shared responses.
+
+        Args:
+            username (Optional[str]): Ignored, since shared responses belong to no user. Kept for compatibility with
+                `ResponseCache.invalidate()`.
+            *endpoints (str): Endpoint names (e.g. "MaterialLinks") to remove. If none are given, the whole cache is
+                cleared.
+        """
+        for endpoint in endpoints or (None,):
+            await self.backend.delete_prefix(self._prefix(None, endpoint))
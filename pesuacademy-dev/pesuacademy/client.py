@@ -1,20 +1,39 @@
 """PESU Academy Scraper Client."""
 
 import asyncio
+import datetime
+import functools
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable, Collection
+from pathlib import Path
+from typing import IO, TypeVar
 
 import httpx
-from bs4 import BeautifulSoup
 
+from pesuacademy import constants
+from pesuacademy.cache import ResponseCache, ResultsArchive, SharedCache, _bypass, _bypass_cache, _CachingTransport
+from pesuacademy.exceptions import AuthenticationError, PortalUnavailableError, ResultsNotPublishedError
+from pesuacademy.exporter import _CoursePackExporter
+from pesuacademy.history import AttendanceHistory
+from pesuacademy.metrics import Metrics, _MetricsTransport
 from pesuacademy.models import (
     Announcement,
     Course,
+    CourseTree,
+    ExportedFile,
+    ExportReport,
     MaterialLink,
     Profile,
     SeatingInformation,
+    SectionStatus,
     SemesterResult,
+    Snapshot,
     Timetable,
     Topic,
+    TopicMaterials,
+    Transcript,
     Unit,
+    UnitTree,
 )
 from pesuacademy.pages import (
     _AnnouncementPageHandler,
@@ -29,34 +48,115 @@ from pesuacademy.pages import (
     _TimetablePageHandler,
     _UnitPageHandler,
 )
+from pesuacademy.replay import Recording
+from pesuacademy.scheduler import request_priority
+from pesuacademy.single_flight import SingleFlight
+from pesuacademy.transport import TransportConfig
+from pesuacademy.util import _extract_csrf_token, _gather_or_cancel, _stream_from_producer
+
+T = TypeVar("T")
 
 
 class _PesuScraper:
-    def __init__(self) -> None:
-        """Initializes the PESU Academy scraper with a base URL and an HTTP session."""
-        self._base_url = "https://www.pesuacademy.com/Academy"
-        self._session = httpx.AsyncClient(base_url=self._base_url, follow_redirects=True, timeout=30.0)
+    def __init__(
+        self,
+        cache: ResponseCache | None = None,
+        transport: TransportConfig | None = None,
+        base_url: str | None = None,
+        recording: Recording | None = None,
+        attendance_history: AttendanceHistory | None = None,
+        shared_flights: SingleFlight | None = None,
+        metrics: Metrics | None = None,
+        shared_cache: SharedCache | None = None,
+    ) -> None:
+        """Initializes the PESU Academy scraper with a base URL and an HTTP session.
+
+        Args:
+            cache (Optional[ResponseCache]): A cache to answer repeated page requests from. No caching if None.
+            transport (Optional[TransportConfig]): Timeouts, retries, connection limits and circuit breaker of the
+                session. Defaults to `TransportConfig()`.
+            base_url (Optional[str]): The URL of the Academy application, e.g. of a `StandInServer`. Defaults to
+                PESU Academy itself.
+            recording (Optional[Recording]): If given, every response received is recorded into it.
+            attendance_history (Optional[AttendanceHistory]): If given, every attendance fetched is recorded into it.
+            shared_flights (Optional[SingleFlight]): If given, requests for content that is the same for every user
+                (course units, topics and material links) are deduplicated with those of other sessions sharing it.
+            metrics (Optional[Metrics]): If given, every request and page fetch of the session is measured into it.
+            shared_cache (Optional[SharedCache]): A cache for pages that are the same for every user (course units,
+                topics and material links), answering them for every session that shares it.
+        """
+        self._base_url = base_url or f"{constants.BASE_URL}/Academy"
+        self._cache = cache
+        self._attendance_history = attendance_history
+        # Concurrent identical requests of this session share one request and parse
+        self._flights = SingleFlight()
+        self._shared_flights = shared_flights
+        self._metrics = metrics
+        self._transport_config = transport or TransportConfig()
+        self._network = self._transport_config._build(recording)
+        self._transport = (
+            _CachingTransport(self._network, cache, shared_cache)
+            if cache is not None or shared_cache is not None
+            else None
+        )
+        transport = self._transport or self._network
+        self._session = httpx.AsyncClient(
+            base_url=self._base_url,
+            transport=_MetricsTransport(transport, metrics) if metrics is not None else transport,
+            follow_redirects=True,
+            timeout=self._transport_config.timeout(),
+            event_hooks={"response": [self._check_session_expired]},
+        )
         self._csrf_token: str | None = None
-        self._semester_ids: dict[int, str] = {}
+        self._semester_ids: dict[int, str] | None = None
+        self._semester_task: asyncio.Task[dict[int, str]] | None = None
+        self._username: str | None = None
+        self.login_elapsed: float | None = None
+
+    async def _check_session_expired(self, response: httpx.Response) -> None:
+        """Raises if an authenticated page request is being redirected to the login page.
+
+        Page and semester endpoints never redirect for a live session, so a redirect that leads outside of them means
+        the portal has expired the session.
+
+        Args:
+            response (httpx.Response): A response received through the session.
+
+        Raises:
+            AuthenticationError: If the session has expired.
+        """
+        if not self._csrf_token or response.request.method != "GET" or not response.has_redirect_location:
+            return
+        location = response.request.url.join(response.headers["location"])
+        if not location.path.startswith(("/Academy/s/", "/Academy/a/")):
+            raise AuthenticationError("The PESU Academy session has expired. Please log in again.")
 
-    async def login(self, username: str, password: str) -> None:
+    async def login(self, username: str, password: str, prefetch_semesters: bool = True) -> None:
         """Logs in to the PESU Academy portal and initializes the session.
 
+        Semester IDs are not awaited here. They are resolved on first use, and with `prefetch_semesters` their
+        discovery starts in the background right after authentication so that it overlaps with the caller's first
+        requests. The time taken to authenticate is stored in `login_elapsed`.
+
         Args:
             username (str): The user's SRN, PRN, or other login identifier.
             password (str): The user's password.
+            prefetch_semesters (bool): Whether to start fetching the semester IDs in the background.
 
         Raises:
-            Exception: If the login fails or the credentials are invalid.
+            AuthenticationError: If the credentials are invalid.
+            CSRFTokenError: If a CSRF token cannot be found on the login or home page.
 
         Returns:
             None
         """
+        start = time.perf_counter()
+        # Requests of this session count towards the user's share of the scheduler from the first one on
+        self._network.user = username
         response = await self._session.get("/")
         response.raise_for_status()
-        soup = BeautifulSoup(response.text, "lxml")
         # Extract the CSRF token from the initial page
-        initial_csrf = soup.find("meta", attrs={"name": "csrf-token"})["content"]
+        initial_csrf = _extract_csrf_token(response.content)
 
         login_data = {
             "_csrf": initial_csrf,
@@ -66,62 +166,452 @@ class _PesuScraper:
         response = await self._session.post("/j_spring_security_check", data=login_data)
         response.raise_for_status()
 
-        if "Invalid credentials" in response.text:  # Check if login failed
-            raise Exception("Authentication failed. Please check your credentials.")
+        if b"Invalid credentials" in response.content:  # Check if login failed
+            raise AuthenticationError("Authentication failed. Please check your credentials.")
 
         # After login, fetch the CSRF token again
-        soup = BeautifulSoup(response.text, "lxml")
-        final_csrf = soup.find("meta", attrs={"name": "csrf-token"})["content"]
-        self._csrf_token = final_csrf
-        # Always Fetch semester IDs after successful login
-        # Improve this by making it a separate method later
-        self._semester_ids = await _SemesterHandler._get_semester_ids(self._session)
+        self._csrf_token = _extract_csrf_token(response.content)
+        self._username = username
+        if self._transport is not None:
+            # Only responses received after a successful login are cached, and only for this user
+            self._transport.username = username
+        self.login_elapsed = time.perf_counter() - start
+        if prefetch_semesters:
+            self._start_semester_discovery()
+
+    def _start_semester_discovery(self) -> asyncio.Task[dict[int, str]]:
+        """Starts fetching the semester IDs in the background, unless it is already in progress."""
+        if self._semester_task is None:
+            # Nearly every interactive call waits for the IDs, so the lookup must not queue behind other requests
+            with request_priority("interactive"):
+                self._semester_task = asyncio.ensure_future(_SemesterHandler._get_semester_ids(self._session))
+            # A failure is reported to whoever awaits the IDs next, not logged as an unretrieved exception
+            self._semester_task.add_done_callback(lambda task: task.cancelled() or task.exception())
+        return self._semester_task
+
+    async def _get_semester_ids(self) -> dict[int, str]:
+        """Returns a mapping of semester numbers to semester IDs, fetching it on first use.
+
+        Returns:
+            dict[int, str]: A dictionary mapping semester numbers to their corresponding IDs.
+        """
+        if self._semester_ids is None:
+            task = self._start_semester_discovery()
+            try:
+                # Shielded so that a cancelled caller does not cancel the lookup shared with other callers
+                self._semester_ids = await asyncio.shield(task)
+            except Exception:
+                if self._semester_task is task:
+                    self._semester_task = None  # Let the next caller try again
+                raise
+        return self._semester_ids
+
+    async def _single_flight(
+        self, key: tuple[object, ...], fetch: Callable[[], Awaitable[T]], shared: bool = False
+    ) -> T:
+        """Runs a page fetch, or joins the identical one already in flight.
+
+        Args:
+            key (tuple): The page and the arguments it is fetched with.
+            fetch (Callable[[], Awaitable[T]]): Fetches and parses the page.
+            shared (bool): Whether the page is the same for every user, so that it can be shared with other sessions.
+                A shared fetch runs on the session of whichever user started it, and its models are handed to every
+                user that joined it, so they must not be modified.
+        """
+        metrics = self._metrics
+        if metrics is not None:
+            fetch = functools.partial(metrics._time_page, fetch)
+        # A refresh must not be answered by a fetch that may have been served from the cache
+        key = (*key, _bypass.get())
+        if not shared or self._shared_flights is None:
+            return await self._flights.do(key, fetch)
+
+        joined = key in self._shared_flights
+        try:
+            return await self._shared_flights.do(key, fetch)
+        except asyncio.CancelledError:
+            # Only a failure of another user's fetch, e.g. of a session closed mid-flight, is retried
+            current = asyncio.current_task()
+            if not joined or current is None or current.cancelling():
+                raise
+        except Exception:
+            # Another user's session may have expired or lost its connection while this one is fine
+            if not joined:
+                raise
+        return await self._flights.do(key, fetch)
 
     async def get_seating_info(self) -> list[SeatingInformation]:
-        return await _SeatingInformationHandler._get(self._session)
+        return await self._single_flight(("seating_info",), lambda: _SeatingInformationHandler._get(self._session))
 
-    async def get_profile(self) -> Profile:
-        return await _ProfilePageHandler._get(self._session)
+    async def get_profile(self, include_image: bool = True) -> Profile:
+        return await self._single_flight(
+            ("profile", include_image), lambda: _ProfilePageHandler._get(self._session, include_image)
+        )
+
+    async def get_profile_image(self) -> bytes | None:
+        return await self._single_flight(("profile_image",), lambda: _ProfilePageHandler._get_image(self._session))
+
+    async def _get_semester_courses(self, semester_id: str) -> list[Course]:
+        return await self._single_flight(
+            ("courses", semester_id), lambda: _CoursesPageHandler._get(self._session, semester_id)
+        )
+
+    async def _get_semester_attendance(self, semester_id: str) -> list[Course]:
+        return await self._single_flight(
+            ("attendance", semester_id), lambda: _AttendancePageHandler._get(self._session, semester_id)
+        )
 
     async def get_courses(self, semester: int | None = None) -> dict[int, list[Course]]:
         # Fetch courses for a specific semester or all semesters if none specified
+        semester_ids = await self._get_semester_ids()
         semesters_to_fetch = (
-            {semester: self._semester_ids[semester]}
-            if semester and semester in self._semester_ids
-            else self._semester_ids
+            {semester: semester_ids[semester]} if semester and semester in semester_ids else semester_ids
         )
-        tasks = [_CoursesPageHandler._get(self._session, sem_id) for sem_id in semesters_to_fetch.values()]
+        tasks = [self._get_semester_courses(sem_id) for sem_id in semesters_to_fetch.values()]
         results = await asyncio.gather(*tasks)
         return dict(zip(semesters_to_fetch.keys(), results))
 
     async def get_attendance(self, semester: int | None = None) -> dict[int, list[Course]]:
         # Fetch attendance for a specific semester or all semesters if none specified
+        semester_ids = await self._get_semester_ids()
         semesters_to_fetch = (
-            {semester: self._semester_ids[semester]}
-            if semester and semester in self._semester_ids
-            else self._semester_ids
+            {semester: semester_ids[semester]} if semester and semester in semester_ids else semester_ids
         )
-        tasks = [_AttendancePageHandler._get(self._session, sem_id) for sem_id in semesters_to_fetch.values()]
+        tasks = [self._get_semester_attendance(sem_id) for sem_id in semesters_to_fetch.values()]
         results = await asyncio.gather(*tasks)
-        return dict(zip(semesters_to_fetch.keys(), results))
+        attendance = dict(zip(semesters_to_fetch.keys(), results))
+        if self._attendance_history is not None and self._username is not None:
+            for sem, courses in attendance.items():
+                await self._attendance_history.record(self._username, sem, courses)
+        return attendance
 
-    async def get_announcements(self) -> list[Announcement]:
-        return await _AnnouncementPageHandler._get(self._session)
+    async def get_announcements(
+        self, since: datetime.date | None = None, seen: Collection[str] | None = None
+    ) -> list[Announcement]:
+        return await self._single_flight(
+            ("announcements", since, frozenset(seen or ())),
+            lambda: _AnnouncementPageHandler._get(self._session, since, seen),
+        )
 
+    # The units, topics and material links of a course are shared with other users' sessions: never modify them
     async def get_units_for_course(self, course_id: str) -> list[Unit]:
-        return await _CourseDetailPageHandler._get(self._session, course_id)
+        return await self._single_flight(
+            ("course_detail", course_id), lambda: _CourseDetailPageHandler._get(self._session, course_id), shared=True
+        )
 
     async def get_topics_for_unit(self, unit_id: str) -> list[Topic]:
-        return await _UnitPageHandler._get(self._session, unit_id)
+        return await self._single_flight(
+            ("unit", unit_id), lambda: _UnitPageHandler._get(self._session, unit_id), shared=True
+        )
 
     async def get_material_links(self, topic: Topic, material_type_id: str) -> list[MaterialLink]:
-        return await _MaterialLinksHandler._get(self._session, topic, material_type_id)
+        return await self._single_flight(
+            ("material_links", topic.course_id, topic.id, material_type_id),
+            lambda: _MaterialLinksHandler._get(self._session, topic, material_type_id),
+            shared=True,
+        )
+
+    async def _crawl_course(
+        self,
+        course_id: str,
+        material_types: list[str],
+        semaphore: asyncio.Semaphore,
+        course: Course | None = None,
+    ) -> CourseTree:
+        """Walks units, topics and material links of a course, sending at most as many requests as `semaphore` allows.
+
+        Each unit's topics are fetched as soon as the unit list arrives, and each topic's material links as soon as
+        its unit's topics arrive, so the crawl never waits for a whole level to finish.
+        """
+        errors: list[str] = []
+
+        async def limited(fetch: Callable[[], Awaitable[T]], description: str) -> T | None:
+            async with semaphore:
+                try:
+                    return await fetch()
+                except (AuthenticationError, PortalUnavailableError):
+                    raise  # Every other request would fail the same way, so the whole crawl fails
+                except Exception as e:
+                    errors.append(f"{description}: {e}")
+                    return None
+
+        # Unlike asyncio.gather, a request that stops the crawl cancels every other one
+        async def crawl_topic(topic: Topic) -> TopicMaterials:
+            links = await _gather_or_cancel(
+                *(
+                    limited(
+                        lambda type_id=type_id: self.get_material_links(topic, type_id),
+                        f"Materials of type {type_id} for topic {topic.id}",
+                    )
+                    for type_id in material_types
+                )
+            )
+            return TopicMaterials(
+                topic=topic,
+                materials={type_id: found for type_id, found in zip(material_types, links) if found},
+            )
+
+        async def crawl_unit(unit: Unit) -> UnitTree:
+            topics = await limited(lambda: self.get_topics_for_unit(unit.id), f"Topics for unit {unit.id}") or []
+            return UnitTree(unit=unit, topics=await _gather_or_cancel(*(crawl_topic(topic) for topic in topics)))
+
+        start = time.perf_counter()
+        units = await limited(lambda: self.get_units_for_course(course_id), f"Units for course {course_id}") or []
+        unit_trees = await _gather_or_cancel(*(crawl_unit(unit) for unit in units))
+        return CourseTree(
+            course_id=course_id,
+            course=course,
+            units=unit_trees,
+            errors=errors,
+            elapsed=time.perf_counter() - start,
+        )
+
+    async def get_course_tree(
+        self, course_id: str, material_types: list[str] | None = None, max_concurrency: int = 8
+    ) -> CourseTree:
+        """Fetches every unit, topic and material link of a course in one concurrent crawl.
+
+        Args:
+            course_id (str): The unique internal ID for the course.
+            material_types (Optional[List[str]]): Material type IDs to fetch. Defaults to all of them.
+            max_concurrency (int): Maximum number of requests in flight at the same time.
+
+        Returns:
+            CourseTree: The nested tree of the course.
+        """
+        types = list(material_types or constants.MATERIAL_TYPES)
+        return await self._crawl_course(course_id, types, asyncio.Semaphore(max_concurrency))
+
+    async def get_semester_course_trees(
+        self, semester: int | None = None, material_types: list[str] | None = None, max_concurrency: int = 8
+    ) -> list[CourseTree]:
+        """Fetches the material trees of every course in a semester, sharing one concurrency limit.
+
+        Args:
+            semester (Optional[int]): The semester number. Defaults to the latest semester.
+            material_types (Optional[List[str]]): Material type IDs to fetch. Defaults to all of them.
+            max_concurrency (int): Maximum number of requests in flight at the same time, across all courses.
+
+        Returns:
+            List[CourseTree]: One tree per course that has an internal ID, in the order of the course listing.
+
+        Raises:
+            ValueError: If the semester is not available.
+        """
+        semester_ids = await self._get_semester_ids()
+        semester = semester if semester is not None else max(semester_ids, default=None)
+        if semester not in semester_ids:
+            raise ValueError(f"Invalid or unavailable semester: {semester}. Available: {list(semester_ids.keys())}")
+        courses = (await self.get_courses(semester)).get(semester, [])
+        types = list(material_types or constants.MATERIAL_TYPES)
+        semaphore = asyncio.Semaphore(max_concurrency)
+        return await _gather_or_cancel(
+            *(self._crawl_course(course.id, types, semaphore, course) for course in courses if course.id)
+        )
+
+    def aiter_course_materials(
+        self,
+        course_id: str,
+        material_types: list[str] | None = None,
+        max_concurrency: int = 8,
+        buffer_size: int = 16,
+        refresh: bool = False,
+    ) -> AsyncIterator[TopicMaterials]:
+        """Crawls a course like `get_course_tree` but yields material links as soon as each request completes.
+
+        Every yielded item holds the links of a single topic and material type; types without any material are not
+        yielded. The crawl runs ahead of the consumer by at most `buffer_size` items and is cancelled when the
+        consumer stops iterating. The first failing request ends the stream with its exception.
+        """
+        types = list(material_types or constants.MATERIAL_TYPES)
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def produce(emit: Callable[[TopicMaterials], Awaitable[None]]) -> None:
+            async def fetch_links(topic: Topic, type_id: str) -> None:
+                # The slot is held until the result has been handed over, so a slow consumer stalls new requests
+                async with semaphore:
+                    links = await self.get_material_links(topic, type_id)
+                    if links:
+                        await emit(TopicMaterials(topic=topic, materials={type_id: links}))
+
+            async def crawl_unit(unit: Unit, tasks: asyncio.TaskGroup) -> None:
+                async with semaphore:
+                    topics = await self.get_topics_for_unit(unit.id)
+                for topic in topics:
+                    for type_id in types:
+                        tasks.create_task(fetch_links(topic, type_id))
+
+            with _bypass_cache(refresh):
+                async with semaphore:
+                    units = await self.get_units_for_course(course_id)
+                try:
+                    async with asyncio.TaskGroup() as tasks:
+                        for unit in units:
+                            tasks.create_task(crawl_unit(unit, tasks))
+                except ExceptionGroup as group:
+                    # Report the failure that stopped the crawl rather than the group wrapping it
+                    raise group.exceptions[0] from None
+
+        return _stream_from_producer(produce, buffer_size)
+
+    async def export_course_pack(
+        self,
+        destination: Path | str | IO[bytes],
+        course_id: str | None = None,
+        semester: int | None = None,
+        material_types: list[str] | None = None,
+        max_concurrency: int = 4,
+        as_zip: bool = False,
+        on_file: Callable[[ExportedFile], None] | None = None,
+    ) -> ExportReport:
+        """Crawls a course, or every course of a semester if no course is given, and downloads all materials."""
+        if course_id is not None:
+            trees = [await self.get_course_tree(course_id, material_types)]
+        else:
+            trees = await self.get_semester_course_trees(semester, material_types)
+        exporter = _CoursePackExporter(self._session, max_concurrency, on_file)
+        return await exporter.export(trees, destination, as_zip, course_folders=course_id is None)
+
+    def aiter_announcements(
+        self,
+        buffer_size: int = 16,
+        refresh: bool = False,
+        since: datetime.date | None = None,
+        seen: Collection[str] | None = None,
+    ) -> AsyncIterator[Announcement]:
+        """Yields announcements one by one as the announcements page is parsed."""
+
+        async def produce(emit: Callable[[Announcement], Awaitable[None]]) -> None:
+            with _bypass_cache(refresh):
+                async for announcement in _AnnouncementPageHandler._iter(self._session, since, seen):
+                    await emit(announcement)
+
+        return _stream_from_producer(produce, buffer_size)
 
     async def get_results(self, semester_id: str) -> SemesterResult:
-        return await _ResultsPageHandler._get(self._session, semester_id)
+        return await self._single_flight(
+            ("results", semester_id), lambda: _ResultsPageHandler._get(self._session, semester_id)
+        )
+
+    async def get_all_results(self, archive: ResultsArchive | None = None) -> Transcript:
+        """Fetches the results of every semester concurrently, reading final ones from the archive if possible.
+
+        The results of every semester but the latest can be final. They are read from the archive when it has them.
+        Otherwise they are fetched from the portal, bypassing the response cache, and archived if they are published,
+        so with a warm archive only the latest semester is requested.
+        """
+        semester_ids = await self._get_semester_ids()
+        latest = max(semester_ids, default=None)
+        archive = archive if self._username is not None else None
+        archived: list[int] = []
+
+        async def fetch(semester: int, semester_id: str) -> SemesterResult:
+            if archive is None or semester == latest:
+                return await self.get_results(semester_id)
+            if (result := await archive.get(self._username, semester_id)) is not None:
+                archived.append(semester)
+                return result
+            # What is archived is never fetched again, so it must not come from an outdated cached page
+            with _bypass_cache():
+                result = await self.get_results(semester_id)
+            if result.published:
+                await archive.put(self._username, semester_id, result)
+            return result
+
+        semesters = sorted(semester_ids)
+        outcomes = await asyncio.gather(
+            *(fetch(semester, semester_ids[semester]) for semester in semesters), return_exceptions=True
+        )
+        results: dict[int, SemesterResult] = {}
+        unavailable: dict[int, str] = {}
+        for semester, outcome in zip(semesters, outcomes):
+            if isinstance(outcome, ResultsNotPublishedError):
+                unavailable[semester] = str(outcome)
+            elif isinstance(outcome, BaseException):
+                raise outcome
+            else:
+                results[semester] = outcome
+        return Transcript.from_results(results, unavailable, archived)
 
     async def get_timetable(self) -> Timetable:
-        return await _TimetablePageHandler._get(self._session)
+        return await self._single_flight(("timetable",), lambda: _TimetablePageHandler._get(self._session))
+
+    async def _get_latest_results(self, max_attempts: int = 2) -> tuple[int, SemesterResult]:
+        """Fetches the results of the most recent semester that has published results.
+
+        Args:
+            max_attempts (int): How many semesters to try, starting from the current one.
+
+        Returns:
+            tuple[int, SemesterResult]: The semester number and its results.
+
+        Raises:
+            ValueError: If no semester IDs are known.
+            ResultsNotPublishedError: If none of the semesters tried has published results.
+        """
+        semester_ids = await self._get_semester_ids()
+        semesters = sorted(semester_ids, reverse=True)[:max_attempts]
+        if not semesters:
+            raise ValueError("No semesters available.")
+        for semester in semesters[:-1]:
+            try:
+                return semester, await self.get_results(semester_ids[semester])
+            except ResultsNotPublishedError:
+                continue
+        return semesters[-1], await self.get_results(semester_ids[semesters[-1]])
+
+    async def get_snapshot(self, max_concurrency: int = 4) -> Snapshot:
+        """Fetches every dashboard section concurrently over this session.
+
+        Args:
+            max_concurrency (int): Maximum number of sections fetched at the same time.
+
+        Returns:
+            Snapshot: The combined data, with per-section errors and timings.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        sections: dict[str, SectionStatus] = {}
+        data: dict[str, object] = {}
+
+        async def fetch(name: str, coro_fn: Callable[[], Awaitable[object]]) -> None:
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    data[name] = await coro_fn()
+                except Exception as e:
+                    sections[name] = SectionStatus(ok=False, elapsed=time.perf_counter() - start, error=str(e))
+                else:
+                    sections[name] = SectionStatus(ok=True, elapsed=time.perf_counter() - start)
+
+        async def current_semester(getter: Callable[[int], Awaitable[dict[int, list[Course]]]]) -> list[Course]:
+            # Resolved here rather than up front so that the other sections do not wait for the semester lookup
+            semester = data["semester"] = max(await self._get_semester_ids(), default=None)
+            if semester is None:
+                raise ValueError("No semesters available.")
+            return (await getter(semester)).get(semester, [])
+
+        async def latest_results() -> SemesterResult:
+            data["results_semester"], results = await self._get_latest_results()
+            return results
+
+        start = time.perf_counter()
+        await asyncio.gather(
+            fetch("profile", lambda: self.get_profile(include_image=False)),
+            fetch("courses", lambda: current_semester(self.get_courses)),
+            fetch("attendance", lambda: current_semester(self.get_attendance)),
+            fetch("timetable", self.get_timetable),
+            fetch("announcements", self.get_announcements),
+            fetch("seating_info", self.get_seating_info),
+            fetch("results", latest_results),
+        )
+        return Snapshot(**data, sections=sections, elapsed=time.perf_counter() - start)
+
+    async def invalidate_cache(self, *endpoints: str) -> None:
+        """Removes this user's cached responses for the given endpoints, or all of them if none are given."""
+        if self._cache is not None and self._username is not None:
+            await self._cache.invalidate(self._username, *endpoints)
 
     async def close(self) -> None:
+        if self._semester_task is not None and not self._semester_task.done():
+            self._semester_task.cancel()
         await self._session.aclose()
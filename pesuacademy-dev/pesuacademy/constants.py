@@ -13,6 +13,46 @@ ATTENDANCE_EXPECTED_COLUMNS = 4
 # Expected number of columns in the Courses table
 COURSES_EXPECTED_COLUMNS = 4
 
+# Material types available for every topic, keyed by the ID used by the Materials page
+MATERIAL_TYPES: dict[str, str] = {
+    "1": "Lecture Notes",
+    "2": "Slides",
+    "3": "Notes",
+    "4": "Lab Materials",
+    "5": "Additional Resources",
+}
+
+# Default lifetimes (in seconds) of cached responses, keyed by endpoint name. Endpoints that are not listed here are
+# never cached. The names match the classes in _PageURLParams, plus "Semesters" for the semester list.
+CACHE_TTLS: dict[str, float] = {
+    "Semesters": 12 * 60 * 60,
+    "Timetable": 6 * 60 * 60,
+    "Courses": 6 * 60 * 60,
+    "CourseDetail": 6 * 60 * 60,
+    "UnitDetail": 6 * 60 * 60,
+    "MaterialLinks": 6 * 60 * 60,
+    "Profile": 60 * 60,
+    "Results": 30 * 60,
+    "SeatingInformation": 15 * 60,
+    "Announcements": 10 * 60,
+    "Attendance": 5 * 60,
+}
+
+# Default lifetimes (in seconds) of pages that are the same for every user and may be cached once for all of them,
+# keyed by endpoint name. No other endpoint is ever stored in a `SharedCache`.
+SHARED_CACHE_TTLS: dict[str, float] = {
+    "CourseDetail": 6 * 60 * 60,
+    "UnitDetail": 6 * 60 * 60,
+    "MaterialLinks": 6 * 60 * 60,
+}
+
+# Default read timeouts (in seconds) of endpoints that are slower than the rest, keyed by endpoint name
+READ_TIMEOUTS: dict[str, float] = {
+    "Results": 30.0,
+    "Profile": 20.0,
+    "Timetable": 20.0,
+}
+
 
 @dataclass(frozen=True)
 class _PageURLParams:
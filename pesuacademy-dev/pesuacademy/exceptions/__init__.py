@@ -2,8 +2,12 @@
 
 from .authentication import AuthenticationError
 from .csrf import CSRFTokenError
+from .portal import PortalUnavailableError
+from .results import ResultsNotPublishedError
 
 __all__ = [
     "AuthenticationError",
     "CSRFTokenError",
+    "PortalUnavailableError",
+    "ResultsNotPublishedError",
 ]
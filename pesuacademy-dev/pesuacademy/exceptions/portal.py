@@ -0,0 +1,15 @@
+"""This module defines a custom exception raised while the PESU Academy portal is unavailable."""
+
+
+class PortalUnavailableError(Exception):
+    """Custom exception raised when requests are refused because PESU Academy is failing or not responding."""
+
+    def __init__(self, message: str, retry_after: float | None = None) -> None:
+        """Initializes the PortalUnavailableError with a custom message and the time until the next attempt."""
+        self.message = message
+        self.retry_after = retry_after
+        super().__init__(self.message)
+
+    def __str__(self) -> str:
+        """Returns the string representation of the error message."""
+        return f"{self.message}"
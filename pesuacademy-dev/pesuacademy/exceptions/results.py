@@ -0,0 +1,14 @@
+"""This module defines a custom exception raised for semesters whose results have not been published."""
+
+
+class ResultsNotPublishedError(Exception):
+    """Custom exception raised when the results page of a semester does not show any results yet."""
+
+    def __init__(self, message: str) -> None:
+        """Initializes the ResultsNotPublishedError with a custom message."""
+        self.message = message
+        super().__init__(self.message)
+
+    def __str__(self) -> str:
+        """Returns the string representation of the error message."""
+        return f"{self.message}"
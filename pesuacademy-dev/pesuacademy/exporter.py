@@ -0,0 +1,346 @@
+"""Downloads the materials of whole courses into a local directory or a ZIP archive."""
+
+import asyncio
+import hashlib
+import json
+import mimetypes
+import re
+import tempfile
+import time
+import zipfile
+from collections.abc import Callable
+from dataclasses import dataclass
+from email.message import Message
+from pathlib import Path, PurePosixPath
+from typing import IO, Any
+
+import httpx
+
+from pesuacademy import constants
+from pesuacademy.models import CourseTree, ExportedFile, ExportReport, MaterialLink
+
+# Name of the file that records what was exported into a directory, used to skip unchanged files on the next run
+MANIFEST_FILENAME = ".pesuacademy-export.json"
+# Suffix of files that are still being downloaded. They are resumed on the next run.
+PARTIAL_SUFFIX = ".part"
+# Suffix of the file next to a partial download that holds the ETag or Last-Modified date it was downloaded with
+_VALIDATOR_SUFFIX = ".validator"
+_CHUNK_SIZE = 64 * 1024
+# Downloads bound for a ZIP archive are kept in memory up to this size, then spill over to a temporary file
+_SPOOL_SIZE = 1024 * 1024
+_MAX_NAME_LENGTH = 100
+_UNSAFE_NAME_CHARACTERS = re.compile(r'[\x00-\x1f<>:"/\\|?*]+')
+
+
+@dataclass(frozen=True)
+class _ExportItem:
+    """A single material to export, with its destination path minus the file extension."""
+
+    path: PurePosixPath
+    link: MaterialLink
+
+
+def _safe_name(name: str) -> str:
+    """Turns a title into a file or folder name that is valid on every platform."""
+    name = _UNSAFE_NAME_CHARACTERS.sub("_", name).strip().rstrip(".")
+    return name[:_MAX_NAME_LENGTH].strip() or "Untitled"
+
+
+def _plan(trees: list[CourseTree], course_folders: bool) -> list[_ExportItem]:
+    """Lays out the materials of course trees as course/unit/topic folders with one file per material.
+
+    Units and topics are numbered so that the folders sort in the order shown on PESU Academy. Paths only depend on
+    the trees, so repeated exports of an unchanged course map every material to the same file.
+    """
+    items = []
+    for tree in trees:
+        root = PurePosixPath()
+        if course_folders:
+            course = tree.course
+            root /= _safe_name(f"{course.code} - {course.title}" if course else tree.course_id)
+        for unit_number, unit_tree in enumerate(tree.units, start=1):
+            unit_folder = root / _safe_name(f"{unit_number:02d} - {unit_tree.unit.title}")
+            for topic_number, topic_materials in enumerate(unit_tree.topics, start=1):
+                topic_folder = unit_folder / _safe_name(f"{topic_number:02d} - {topic_materials.topic.title}")
+                used_names: set[str] = set()
+                for type_id, links in topic_materials.materials.items():
+                    type_name = constants.MATERIAL_TYPES.get(type_id, type_id)
+                    for link in links:
+                        name = base = _safe_name(f"{type_name} - {link.title}")
+                        duplicate = 1
+                        while name.lower() in used_names:
+                            duplicate += 1
+                            name = f"{base} ({duplicate})"
+                        used_names.add(name.lower())
+                        items.append(_ExportItem(path=topic_folder / name, link=link))
+    return items
+
+
+def _extension(link: MaterialLink, response: httpx.Response) -> str:
+    """Picks the file extension of a material from its link type, the server's file name or its content type."""
+    if link.is_pdf:
+        return ".pdf"
+    disposition = response.headers.get("content-disposition")
+    if disposition:
+        message = Message()
+        message["content-disposition"] = disposition
+        filename = message.get_filename()
+        if filename and PurePosixPath(filename).suffix:
+            return PurePosixPath(filename).suffix.lower()
+    content_type = response.headers.get("content-type", "").split(";")[0].strip()
+    if not content_type:
+        return ""
+    return mimetypes.guess_extension(content_type) or ""
+
+
+def _remote_size(response: httpx.Response) -> int | None:
+    """Returns the full size of the remote file, also for partial (206) responses."""
+    content_range = response.headers.get("content-range")
+    if response.status_code == httpx.codes.PARTIAL_CONTENT and content_range and "/" in content_range:
+        total = content_range.rsplit("/", 1)[1]
+        return int(total) if total.isdigit() else None
+    content_length = response.headers.get("content-length")
+    return int(content_length) if content_length and content_length.isdigit() else None
+
+
+def _validator(response: httpx.Response) -> str | None:
+    """Returns the strong ETag of a response, or else its Last-Modified date, to resume its download with If-Range."""
+    etag = response.headers.get("etag")
+    if etag and not etag.startswith("W/"):
+        return etag
+    return response.headers.get("last-modified")
+
+
+def _hash_file(digest: "hashlib._Hash", path: Path) -> None:
+    """Feeds the contents of a file into a digest without reading it into memory at once."""
+    with path.open("rb") as file:
+        while chunk := file.read(_CHUNK_SIZE):
+            digest.update(chunk)
+
+
+def _file_digest(path: Path) -> str:
+    """Computes the SHA-256 digest of a file."""
+    digest = hashlib.sha256()
+    _hash_file(digest, path)
+    return digest.hexdigest()
+
+
+class _CoursePackExporter:
+    """Streams course materials to disk or into a ZIP archive over an authenticated session.
+
+    Downloads run concurrently and are written chunk by chunk, so memory use does not depend on file sizes.
+    """
+
+    def __init__(
+        self,
+        session: httpx.AsyncClient,
+        max_concurrency: int = 4,
+        on_file: Callable[[ExportedFile], None] | None = None,
+    ) -> None:
+        """Initializes the exporter.
+
+        Args:
+            session (httpx.AsyncClient): The authenticated HTTP client session to download with.
+            max_concurrency (int): Maximum number of downloads in flight at the same time.
+            on_file (Optional[Callable[[ExportedFile], None]]): Called as soon as each file has been exported.
+        """
+        self._session = session
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._on_file = on_file
+
+    def _finished(self, exported: ExportedFile) -> ExportedFile:
+        """Reports a finished file to the `on_file` callback and returns it."""
+        if self._on_file is not None:
+            self._on_file(exported)
+        return exported
+
+    async def export(
+        self,
+        trees: list[CourseTree],
+        destination: Path | str | IO[bytes],
+        as_zip: bool = False,
+        course_folders: bool = False,
+    ) -> ExportReport:
+        """Exports every material of the given course trees.
+
+        Args:
+            trees (List[CourseTree]): The courses to export.
+            destination: A directory, or for `as_zip` the path of the archive or a writable binary file object.
+            as_zip (bool): Whether to write a ZIP archive instead of a directory.
+            course_folders (bool): Whether to put each course into its own folder.
+
+        Returns:
+            ExportReport: What was downloaded, resumed, skipped or failed, with timings.
+        """
+        start = time.perf_counter()
+        items = _plan(trees, course_folders)
+        if as_zip:
+            files = await self._export_zip(items, destination)
+        else:
+            files = await self._export_directory(items, Path(destination))
+        return ExportReport(
+            destination=str(destination) if isinstance(destination, str | Path) else getattr(destination, "name", ""),
+            files=files,
+            errors=[error for tree in trees for error in tree.errors],
+            elapsed=time.perf_counter() - start,
+        )
+
+    # < Directory exports >
+
+    async def _export_directory(self, items: list[_ExportItem], directory: Path) -> list[ExportedFile]:
+        """Downloads materials into a directory, resuming partial files and skipping unchanged ones."""
+        manifest_path = directory / MANIFEST_FILENAME
+        manifest: dict[str, dict[str, Any]] = {}
+        if manifest_path.exists():
+            try:
+                manifest = json.loads(manifest_path.read_text())
+            except ValueError:
+                manifest = {}  # A corrupt manifest only means that nothing can be skipped
+
+        async def export_item(item: _ExportItem) -> ExportedFile:
+            try:
+                exported = await self._download_to_directory(item, directory, manifest.get(str(item.path)))
+            except Exception as e:
+                exported = ExportedFile(path=str(item.path), url=item.link.url, status="failed", error=str(e))
+            else:
+                # Keyed by path since the same document can be linked from several topics
+                manifest[str(item.path)] = {
+                    "path": exported.path,
+                    "url": exported.url,
+                    "size": exported.size,
+                    "sha256": exported.sha256,
+                }
+            return self._finished(exported)
+
+        try:
+            return list(await asyncio.gather(*(export_item(item) for item in items)))
+        finally:
+            directory.mkdir(parents=True, exist_ok=True)
+            manifest_path.write_text(json.dumps(manifest, indent=2))
+
+    async def _download_to_directory(
+        self, item: _ExportItem, directory: Path, previous: dict[str, Any] | None
+    ) -> ExportedFile:
+        """Downloads a single material, or confirms that the copy from a previous export is still current."""
+        part = directory / item.path.with_name(item.path.name + PARTIAL_SUFFIX)
+        validator_path = part.with_name(part.name + _VALIDATOR_SUFFIX)
+        while True:
+            offset = part.stat().st_size if part.exists() else 0
+            validator = validator_path.read_text() if offset and validator_path.exists() else None
+            # If-Range makes the server send the whole file instead of the rest if it changed since the partial
+            # download. Without a validator the partial file may be part of an older version, so it starts over.
+            headers = {"Range": f"bytes={offset}-", "If-Range": validator} if validator else {}
+
+            async with self._semaphore, self._session.stream("GET", item.link.url, headers=headers) as response:
+                if response.status_code == httpx.codes.REQUESTED_RANGE_NOT_SATISFIABLE and headers:
+                    # The partial file is no shorter than the file on the server. It is downloaded again rather
+                    # than trusting a file whose download never finished.
+                    part.unlink(missing_ok=True)
+                    validator_path.unlink(missing_ok=True)
+                    continue
+                response.raise_for_status()
+                relative_path = str(item.path) + _extension(item.link, response)
+                target = directory / relative_path
+                size = _remote_size(response)
+
+                if (
+                    previous is not None
+                    and previous.get("path") == relative_path
+                    and previous.get("url") == item.link.url
+                    and target.exists()
+                    and size
+                ):
+                    unchanged = size == previous.get("size") == target.stat().st_size
+                    if unchanged and await asyncio.to_thread(_file_digest, target) == previous.get("sha256"):
+                        # Same size on the server and same contents on disk as last time: leave the body unread
+                        return ExportedFile(
+                            path=relative_path,
+                            url=item.link.url,
+                            status="skipped",
+                            size=size,
+                            sha256=previous["sha256"],
+                        )
+
+                resumed = response.status_code == httpx.codes.PARTIAL_CONTENT
+                digest = hashlib.sha256()
+                part.parent.mkdir(parents=True, exist_ok=True)
+                if resumed:
+                    # The digest covers the whole file, so it starts from what was downloaded before
+                    await asyncio.to_thread(_hash_file, digest, part)
+                else:
+                    # There was nothing to resume, the file changed or the server ignored the range: start over
+                    offset = 0
+                    if validator := _validator(response):
+                        validator_path.write_text(validator)
+                    else:
+                        validator_path.unlink(missing_ok=True)
+
+                transferred = 0
+                with part.open("ab" if resumed else "wb") as file:
+                    async for chunk in response.aiter_bytes(_CHUNK_SIZE):
+                        await asyncio.to_thread(file.write, chunk)
+                        digest.update(chunk)
+                        transferred += len(chunk)
+            break
+
+        part.replace(target)
+        validator_path.unlink(missing_ok=True)
+        return ExportedFile(
+            path=relative_path,
+            url=item.link.url,
+            status="resumed" if resumed else "downloaded",
+            size=offset + transferred,
+            sha256=digest.hexdigest(),
+            bytes_transferred=transferred,
+        )
+
+    # < ZIP exports >
+
+    async def _export_zip(self, items: list[_ExportItem], destination: Path | str | IO[bytes]) -> list[ExportedFile]:
+        """Downloads materials concurrently and writes each one into a ZIP archive as soon as it is complete.
+
+        Each download is spooled (in memory while small, on disk beyond that) and then copied into the archive one
+        entry at a time, since a ZIP file can only be written sequentially.
+        """
+        lock = asyncio.Lock()
+        with zipfile.ZipFile(destination, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+
+            async def export_item(item: _ExportItem) -> ExportedFile:
+                try:
+                    exported = await self._download_to_zip(item, archive, lock)
+                except Exception as e:
+                    exported = ExportedFile(path=str(item.path), url=item.link.url, status="failed", error=str(e))
+                return self._finished(exported)
+
+            return list(await asyncio.gather(*(export_item(item) for item in items)))
+
+    async def _download_to_zip(self, item: _ExportItem, archive: zipfile.ZipFile, lock: asyncio.Lock) -> ExportedFile:
+        """Downloads a single material and adds it to the archive."""
+        digest = hashlib.sha256()
+        size = 0
+        with tempfile.SpooledTemporaryFile(max_size=_SPOOL_SIZE) as spool:
+            async with self._semaphore, self._session.stream("GET", item.link.url) as response:
+                response.raise_for_status()
+                name = str(item.path) + _extension(item.link, response)
+                async for chunk in response.aiter_bytes(_CHUNK_SIZE):
+                    spool.write(chunk)
+                    digest.update(chunk)
+                    size += len(chunk)
+
+            def add_to_archive() -> None:
+                spool.seek(0)
+                with archive.open(name, "w", force_zip64=True) as entry:
+                    while chunk := spool.read(_CHUNK_SIZE):
+                        entry.write(chunk)
+
+            async with lock:
+                await asyncio.to_thread(add_to_archive)
+
+        return ExportedFile(
+            path=name,
+            url=item.link.url,
+            status="downloaded",
+            size=size,
+            sha256=digest.hexdigest(),
+            bytes_transferred=size,
+        )
@@ -0,0 +1,225 @@
+"""A local time series of attendance, recorded from every attendance fetch."""
+
+import asyncio
+import datetime
+import sqlite3
+import threading
+import time
+from typing import Any
+
+from pesuacademy.cache.response_cache import ResponseCache
+from pesuacademy.models import Attendance, AttendanceChange, AttendancePoint, Course
+
+_SCHEMA = (
+    # One row per course and change: a fetch that finds a course unchanged adds nothing
+    """CREATE TABLE IF NOT EXISTS attendance (
+        user TEXT NOT NULL,
+        semester INTEGER NOT NULL,
+        code TEXT NOT NULL,
+        taken_at REAL NOT NULL,
+        attended INTEGER,
+        total INTEGER,
+        percentage REAL,
+        PRIMARY KEY (user, semester, code, taken_at)
+    ) WITHOUT ROWID""",
+    """CREATE TABLE IF NOT EXISTS courses (
+        user TEXT NOT NULL,
+        semester INTEGER NOT NULL,
+        code TEXT NOT NULL,
+        title TEXT NOT NULL,
+        position INTEGER NOT NULL,
+        PRIMARY KEY (user, semester, code)
+    ) WITHOUT ROWID""",
+)
+# The latest row of every course of a user and semester
+_LATEST_QUERY = """
+    SELECT a.code, c.title, a.taken_at, a.attended, a.total, a.percentage
+    FROM attendance a JOIN courses c ON c.user = a.user AND c.semester = a.semester AND c.code = a.code
+    WHERE a.user = ? AND a.semester = ? AND a.taken_at = (
+        SELECT MAX(taken_at) FROM attendance b
+        WHERE b.user = a.user AND b.semester = a.semester AND b.code = a.code AND b.taken_at <= ?
+    )
+    ORDER BY c.position
+"""
+
+
+def _point(taken_at: float, attended: int | None, total: int | None, percentage: float | None) -> AttendancePoint:
+    """Builds a point from the columns of an attendance row."""
+    return AttendancePoint(
+        taken_at=datetime.datetime.fromtimestamp(taken_at, datetime.UTC),
+        attended=attended,
+        total=total,
+        percentage=percentage,
+    )
+
+
+def _change(code: str, title: str, before: AttendancePoint | None, after: AttendancePoint) -> AttendanceChange:
+    """Builds the change of a course between two points."""
+    return AttendanceChange(
+        code=code,
+        title=title,
+        before=before,
+        after=after,
+        attended=(after.attended or 0) - (before.attended or 0 if before else 0),
+        total=(after.total or 0) - (before.total or 0 if before else 0),
+    )
+
+
+class AttendanceHistory:
+    """Keeps every attendance value ever fetched, per user, semester and course, in a local SQLite database.
+
+    Pass it to `PESUAcademy.login()` (or a `SessionPool`) and every `get_attendance()` call records what it fetched.
+    Only courses whose attendance changed since their last record are written, so polling adds nothing until a new
+    class is marked. The history answers the latest attendance without a network call, the changes since a point in
+    time, and the attended/total curve of a course.
+
+    Users are identified by a hash of their username, like in the response cache.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Opens (and creates if needed) the history database.
+
+        Args:
+            path (str): Path of the database file. ":memory:" keeps the history in memory only.
+        """
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        if path != ":memory:":
+            self._connection.execute("PRAGMA journal_mode=WAL")
+        for statement in _SCHEMA:
+            self._connection.execute(statement)
+
+    def _execute(self, query: str, params: tuple[Any, ...]) -> list[tuple[Any, ...]]:
+        """Runs a single statement while holding the connection lock."""
+        with self._lock:
+            return self._connection.execute(query, params).fetchall()
+
+    def _latest(self, user: str, semester: int, until: float) -> list[tuple[Any, ...]]:
+        """Returns the latest row of every course as of a timestamp."""
+        return self._execute(_LATEST_QUERY, (user, semester, until))
+
+    def _record(self, user: str, semester: int, courses: list[Course], taken_at: float) -> list[AttendanceChange]:
+        """Writes the courses that changed since their latest row, in one transaction."""
+        previous = {row[0]: _point(*row[2:]) for row in self._latest(user, semester, taken_at)}
+        changes = []
+        with self._lock:
+            self._connection.execute("BEGIN")
+            try:
+                for position, course in enumerate(courses):
+                    attendance = course.attendance or Attendance()
+                    self._connection.execute(
+                        "INSERT OR REPLACE INTO courses VALUES (?, ?, ?, ?, ?)",
+                        (user, semester, course.code, course.title, position),
+                    )
+                    before = previous.get(course.code)
+                    values = (attendance.attended, attendance.total, attendance.percentage)
+                    if before is not None and (before.attended, before.total, before.percentage) == values:
+                        continue
+                    self._connection.execute(
+                        "INSERT OR REPLACE INTO attendance VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (user, semester, course.code, taken_at, *values),
+                    )
+                    changes.append(_change(course.code, course.title, before, _point(taken_at, *values)))
+                self._connection.execute("COMMIT")
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+        return changes
+
+    async def record(
+        self, username: str, semester: int, courses: list[Course], taken_at: float | None = None
+    ) -> list[AttendanceChange]:
+        """Records the attendance of a semester as fetched.
+
+        Args:
+            username (str): The user the attendance belongs to.
+            semester (int): The semester number.
+            courses (List[Course]): The courses of the semester, with their attendance.
+            taken_at (Optional[float]): When the attendance was fetched, as a Unix timestamp. Defaults to now.
+
+        Returns:
+            List[AttendanceChange]: The courses whose attendance changed since it was last recorded, i.e. what is new
+            since the last check. Empty if nothing changed.
+        """
+        user = ResponseCache._user_key(username)
+        return await asyncio.to_thread(self._record, user, semester, courses, taken_at or time.time())
+
+    async def latest(self, username: str, semester: int) -> list[Course]:
+        """Returns the most recently recorded attendance of every course of a semester, without any network call.
+
+        Args:
+            username (str): The user.
+            semester (int): The semester number.
+
+        Returns:
+            List[Course]: The courses in the order of their last fetch, or an empty list if nothing was recorded.
+        """
+        rows = await asyncio.to_thread(self._latest, ResponseCache._user_key(username), semester, float("inf"))
+        return [
+            Course(code=code, title=title, attendance=Attendance(attended=attended, total=total, percentage=percentage))
+            for code, title, _, attended, total, percentage in rows
+        ]
+
+    async def last_recorded(self, username: str, semester: int) -> datetime.datetime | None:
+        """Returns when the attendance of a semester last changed, or None if nothing was recorded."""
+        rows = await asyncio.to_thread(
+            self._execute,
+            "SELECT MAX(taken_at) FROM attendance WHERE user = ? AND semester = ?",
+            (ResponseCache._user_key(username), semester),
+        )
+        return datetime.datetime.fromtimestamp(rows[0][0], datetime.UTC) if rows[0][0] else None
+
+    async def changes(self, username: str, semester: int, since: datetime.datetime) -> list[AttendanceChange]:
+        """Returns how the attendance of every course changed since a point in time.
+
+        Args:
+            username (str): The user.
+            semester (int): The semester number.
+            since (datetime.datetime): The point in time to compare the latest attendance with.
+
+        Returns:
+            List[AttendanceChange]: The courses whose attendance differs from what it was at `since`.
+        """
+        user = ResponseCache._user_key(username)
+
+        def query() -> list[AttendanceChange]:
+            before = {row[0]: _point(*row[2:]) for row in self._latest(user, semester, since.timestamp())}
+            changes = []
+            for code, title, *values in self._latest(user, semester, float("inf")):
+                after = _point(*values)
+                previous = before.get(code)
+                if previous is None or previous.taken_at != after.taken_at:
+                    changes.append(_change(code, title, previous, after))
+            return changes
+
+        return await asyncio.to_thread(query)
+
+    async def curve(self, username: str, semester: int, code: str) -> list[AttendancePoint]:
+        """Returns every recorded attendance value of a course, oldest first.
+
+        Args:
+            username (str): The user.
+            semester (int): The semester number.
+            code (str): The course code.
+
+        Returns:
+            List[AttendancePoint]: The attended/total curve of the course.
+        """
+        rows = await asyncio.to_thread(
+            self._execute,
+            "SELECT taken_at, attended, total, percentage FROM attendance"
+            " WHERE user = ? AND semester = ? AND code = ? ORDER BY taken_at",
+            (ResponseCache._user_key(username), semester, code),
+        )
+        return [_point(*row) for row in rows]
+
+    async def forget(self, username: str) -> None:
+        """Deletes the whole history of a user."""
+        user = ResponseCache._user_key(username)
+        await asyncio.to_thread(self._execute, "DELETE FROM attendance WHERE user = ?", (user,))
+        await asyncio.to_thread(self._execute, "DELETE FROM courses WHERE user = ?", (user,))
+
+    async def close(self) -> None:
+        """Closes the database connection."""
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,372 @@
+"""Request and parse instrumentation of PESU Academy sessions, with Prometheus and JSON export."""
+
+import bisect
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+
+from pesuacademy.util import _endpoint_name
+
+# Upper bounds of the latency histogram buckets, in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# Set on responses by the response cache: "hit", "stale" or "miss"
+CACHE_EXTENSION = "pesuacademy_cache"
+
+# Histogram metrics and what they measure
+_HISTOGRAMS = {
+    "request_seconds": "Time from sending a request until its response body was read",
+    "connect_seconds": "Time to resolve and connect to the portal, for requests that opened a connection",
+    "tls_seconds": "Time of the TLS handshake, for requests that opened a connection",
+    "server_wait_seconds": "Time from the request being sent until the response headers arrived",
+    "download_seconds": "Time to receive the response body",
+    "page_seconds": "Time to fetch a page and build its models",
+    "parse_wait_seconds": "Time a page waited for a parse worker",
+    "parse_seconds": "Time to parse the HTML of a page",
+    "extract_seconds": "Time to find the data in a parsed page and build its models",
+}
+# Counter metrics and what they count
+_COUNTERS = {
+    "requests_total": "Requests sent, by response status",
+    "response_bytes_total": "Response body bytes received from the network",
+    "cache_total": "Cacheable requests, by outcome (hit, stale or miss)",
+    "errors_total": "Failed requests and page fetches, by error type",
+    "parse_memo_total": "Parsed pages, by whether the models of an identical page were reused (hit or miss)",
+}
+# httpcore trace steps whose duration is recorded, by metric
+_TRACED_STEPS = {
+    "connect_tcp": "connect_seconds",
+    "start_tls": "tls_seconds",
+    "receive_response_body": "download_seconds",
+}
+
+
+@dataclass(frozen=True)
+class MetricEvent:
+    """A single measurement, as handed to the sinks of a `Metrics` instance.
+
+    Attributes:
+        name (str): The metric, e.g. "request_seconds" or "errors_total".
+        endpoint (str): The page the measurement is for (e.g. "Attendance"), or "other" for requests outside the
+            known pages, such as the login.
+        value (float): The measured duration in seconds, number of bytes or count.
+        label (Optional[str]): What the measurement is broken down by, for counters: the response status, the cache
+            outcome or the error type.
+    """
+
+    name: str
+    endpoint: str
+    value: float
+    label: str | None = None
+
+
+class _Histogram:
+    """A cumulative histogram with fixed bucket bounds."""
+
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float | None:
+        """Estimates a quantile by interpolating within its bucket, like Prometheus' `histogram_quantile`."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            if seen + count >= rank and count:
+                if i == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[i - 1] if i else 0.0
+                return lower + (self.buckets[i] - lower) * (rank - seen) / count
+            seen += count
+        return self.buckets[-1]
+
+
+class _PageTimings:
+    """The time a page fetch spent on the network, waiting for a parse worker and parsing, collected while it runs.
+
+    `memo` is "hit" or "miss" if the page was looked up in the parse memo.
+    """
+
+    def __init__(self) -> None:
+        self.endpoint: str | None = None
+        self.network = 0.0
+        self.queued = 0.0
+        self.parse = 0.0
+        self.memo: str | None = None
+
+
+_page_timings: ContextVar[_PageTimings | None] = ContextVar("pesuacademy_page_timings", default=None)
+
+
+def _time_parse[T](parse: Callable[[bytes], T], content: bytes) -> T:
+    """Parses a document, adding the time taken to the page fetch in progress if it is being measured."""
+    timings = _page_timings.get()
+    if timings is None:
+        return parse(content)
+    start = time.perf_counter()
+    try:
+        return parse(content)
+    finally:
+        timings.parse += time.perf_counter() - start
+
+
+class Metrics:
+    """Collects latency histograms, byte counts, cache outcomes and errors of PESU Academy sessions, per endpoint.
+
+    Pass it to `PESUAcademy.login()` (or a `SessionPool`) and every request and page fetch of the session is measured:
+
+    - Requests: total latency, and where the network timings are available, the time spent connecting (including
+      DNS), in the TLS handshake, waiting for the server and downloading the body. Also the response status, the
+      bytes received and, with a response cache, whether the cache answered.
+    - Pages: total time to fetch a page, split into HTML parsing and extracting the data into models, and with a
+      parse executor, the time waited for a worker. Whatever is left is network and waiting time. Also whether the
+      models of an identical page were reused from the parse memo.
+
+    The measurements can be exported with `to_prometheus()` or `snapshot()`, and every single measurement is also
+    handed to the sinks added with `add_sink()`, e.g. to forward it to StatsD or OpenTelemetry.
+
+    One instance can be shared by any number of sessions, but all of them must run on the same event loop.
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS, namespace: str = "pesuacademy") -> None:
+        """Initializes an empty metrics registry.
+
+        Args:
+            buckets (Tuple[float, ...]): Upper bounds of the histogram buckets, in seconds, in increasing order.
+            namespace (str): Prefix of the metric names in the Prometheus export.
+        """
+        self.buckets = tuple(buckets)
+        self.namespace = namespace
+        self._histograms: dict[tuple[str, str], _Histogram] = {}
+        self._counters: dict[tuple[str, str, str], float] = {}
+        self._sinks: list[Callable[[MetricEvent], None]] = []
+
+    def add_sink(self, sink: Callable[[MetricEvent], None]) -> None:
+        """Hands every future measurement to a callback. Exceptions raised by the callback are ignored."""
+        self._sinks.append(sink)
+
+    def remove_sink(self, sink: Callable[[MetricEvent], None]) -> None:
+        """Stops handing measurements to a callback added with `add_sink()`."""
+        self._sinks.remove(sink)
+
+    def reset(self) -> None:
+        """Clears every measurement. Sinks are kept."""
+        self._histograms.clear()
+        self._counters.clear()
+
+    def _emit(self, event: MetricEvent) -> None:
+        """Hands a measurement to the sinks."""
+        for sink in self._sinks:
+            try:
+                sink(event)
+            except Exception:
+                pass  # A broken sink must not fail the request being measured
+
+    def _observe(self, name: str, endpoint: str, value: float) -> None:
+        """Adds a value to a histogram."""
+        histogram = self._histograms.get((name, endpoint))
+        if histogram is None:
+            histogram = self._histograms[name, endpoint] = _Histogram(self.buckets)
+        histogram.observe(value)
+        if self._sinks:
+            self._emit(MetricEvent(name, endpoint, value))
+
+    def _count(self, name: str, endpoint: str, label: str = "", amount: float = 1) -> None:
+        """Increments a counter."""
+        key = (name, endpoint, label)
+        self._counters[key] = self._counters.get(key, 0) + amount
+        if self._sinks:
+            self._emit(MetricEvent(name, endpoint, amount, label or None))
+
+    async def _time_page[T](self, fetch: Callable[[], Awaitable[T]]) -> T:
+        """Runs a page fetch, measuring its total, parse and extraction time.
+
+        Must run in a task of its own, since the network and parse times of the page are collected in its context.
+        """
+        timings = _PageTimings()
+        _page_timings.set(timings)
+        start = time.perf_counter()
+        try:
+            result = await fetch()
+        except Exception as e:
+            self._count("errors_total", timings.endpoint or "other", type(e).__name__)
+            raise
+        endpoint = timings.endpoint or "other"
+        elapsed = time.perf_counter() - start
+        if timings.memo is not None:
+            self._count("parse_memo_total", endpoint, timings.memo)
+        self._observe("page_seconds", endpoint, elapsed)
+        self._observe("parse_seconds", endpoint, timings.parse)
+        if timings.queued:
+            self._observe("parse_wait_seconds", endpoint, timings.queued)
+        extract = elapsed - timings.network - timings.queued - timings.parse
+        self._observe("extract_seconds", endpoint, max(extract, 0.0))
+        return result
+
+    def snapshot(self) -> dict[str, Any]:
+        """Returns every measurement as JSON-serializable data.
+
+        Returns:
+            dict: "histograms" maps each histogram metric to its endpoints, each with the count, sum, mean and
+            estimated p50, p95 and p99. "counters" maps each counter metric to its endpoints, each mapping labels
+            (an empty string for unlabelled counters) to their values.
+        """
+        histograms: dict[str, dict[str, dict[str, float | None]]] = {}
+        for (name, endpoint), histogram in sorted(self._histograms.items()):
+            histograms.setdefault(name, {})[endpoint] = {
+                "count": histogram.count,
+                "sum": histogram.sum,
+                "mean": histogram.sum / histogram.count if histogram.count else None,
+                "p50": histogram.quantile(0.5),
+                "p95": histogram.quantile(0.95),
+                "p99": histogram.quantile(0.99),
+            }
+        counters: dict[str, dict[str, dict[str, float]]] = {}
+        for (name, endpoint, label), value in sorted(self._counters.items()):
+            counters.setdefault(name, {}).setdefault(endpoint, {})[label] = value
+        return {"histograms": histograms, "counters": counters}
+
+    def to_prometheus(self) -> str:
+        """Returns every measurement in the Prometheus text exposition format, e.g. to serve on a /metrics route."""
+        lines: list[str] = []
+        for name, description in _HISTOGRAMS.items():
+            series = sorted((endpoint, h) for (metric, endpoint), h in self._histograms.items() if metric == name)
+            if not series:
+                continue
+            metric = f"{self.namespace}_{name}"
+            lines += [f"# HELP {metric} {description}.", f"# TYPE {metric} histogram"]
+            for endpoint, histogram in series:
+                cumulative = 0
+                for bound, count in zip((*histogram.buckets, float("inf")), histogram.counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f'{metric}_bucket{{endpoint="{endpoint}",le="{le}"}} {cumulative}')
+                lines.append(f'{metric}_sum{{endpoint="{endpoint}"}} {histogram.sum!r}')
+                lines.append(f'{metric}_count{{endpoint="{endpoint}"}} {histogram.count}')
+        for name, description in _COUNTERS.items():
+            series = sorted((key[1:], value) for key, value in self._counters.items() if key[0] == name)
+            if not series:
+                continue
+            metric = f"{self.namespace}_{name}"
+            lines += [f"# HELP {metric} {description}.", f"# TYPE {metric} counter"]
+            for (endpoint, label), value in series:
+                labels = f'endpoint="{endpoint}"' + (f',label="{label}"' if label else "")
+                lines.append(f"{metric}{{{labels}}} {value:g}")
+        return "\n".join(lines) + "\n"
+
+
+class _MeteredStream(httpx.AsyncByteStream):
+    """A response body stream that counts the bytes read and reports when it is closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, on_close: Callable[[int], None]) -> None:
+        self._stream = stream
+        self._on_close: Callable[[int], None] | None = on_close
+        self._bytes = 0
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            self._bytes += len(chunk)
+            yield chunk
+
+    async def aclose(self) -> None:
+        await self._stream.aclose()
+        if self._on_close is not None:
+            on_close, self._on_close = self._on_close, None
+            on_close(self._bytes)
+
+
+class _MetricsTransport(httpx.AsyncBaseTransport):
+    """An httpx transport that measures every request sent through it, including those answered by the cache."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, metrics: Metrics) -> None:
+        """Wraps a transport.
+
+        Args:
+            transport (httpx.AsyncBaseTransport): The transport that sends the requests.
+            metrics (Metrics): Where the measurements are recorded.
+        """
+        self._transport = transport
+        self._metrics = metrics
+
+    @staticmethod
+    def _trace(steps: dict[str, float]) -> Callable[[str, dict[str, Any]], Awaitable[None]]:
+        """Returns an httpcore trace callback that records when each step of the request started and completed."""
+
+        async def trace(event: str, info: dict[str, Any]) -> None:
+            _, step, state = event.rsplit(".", 2)
+            steps[f"{step}.{state}"] = time.perf_counter()
+
+        return trace
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        """Sends a request and records its measurements once its body has been read."""
+        metrics = self._metrics
+        endpoint = _endpoint_name(request) or "other"
+        page = _page_timings.get()
+        if page is not None and page.endpoint is None:
+            page.endpoint = endpoint
+        steps: dict[str, float] = {}
+        if "trace" not in request.extensions:
+            request.extensions["trace"] = self._trace(steps)
+        start = time.perf_counter()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except Exception as e:
+            metrics._count("errors_total", endpoint, type(e).__name__)
+            if page is not None:
+                page.network += time.perf_counter() - start
+            raise
+
+        def on_close(num_bytes: int) -> None:
+            elapsed = time.perf_counter() - start
+            if page is not None:
+                page.network += elapsed
+            metrics._observe("request_seconds", endpoint, elapsed)
+            self._record_response(response, endpoint, num_bytes)
+            self._record_steps(endpoint, steps)
+
+        if response.is_closed:
+            # Read in full already, e.g. by the response cache
+            on_close(len(response.content))
+        else:
+            response.stream = _MeteredStream(response.stream, on_close)
+        return response
+
+    def _record_response(self, response: httpx.Response, endpoint: str, num_bytes: int) -> None:
+        """Counts the status, errors, cache outcome and bytes received of a response."""
+        metrics = self._metrics
+        metrics._count("requests_total", endpoint, str(response.status_code))
+        if response.status_code >= httpx.codes.BAD_REQUEST:
+            metrics._count("errors_total", endpoint, f"HTTP {response.status_code}")
+        cache = response.extensions.get(CACHE_EXTENSION)
+        if cache is not None:
+            metrics._count("cache_total", endpoint, cache)
+        if cache not in ("hit", "stale"):
+            metrics._count("response_bytes_total", endpoint, "", num_bytes)
+
+    def _record_steps(self, endpoint: str, steps: dict[str, float]) -> None:
+        """Records the network timings of a request from the steps traced while it was sent."""
+        metrics = self._metrics
+        for step, name in _TRACED_STEPS.items():
+            if f"{step}.complete" in steps and f"{step}.started" in steps:
+                metrics._observe(name, endpoint, steps[f"{step}.complete"] - steps[f"{step}.started"])
+        sent = steps.get("send_request_body.complete")
+        received = steps.get("receive_response_headers.complete")
+        if sent is not None and received is not None:
+            metrics._observe("server_wait_seconds", endpoint, received - sent)
+
+    async def aclose(self) -> None:
+        """Closes the wrapped transport."""
+        await self._transport.aclose()
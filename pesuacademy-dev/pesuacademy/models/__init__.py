@@ -1,8 +1,10 @@
 """This module initializes the models for the PESU Academy package."""
 
 from .announcement import Announcement
+from .attendance_history import AttendanceChange, AttendancePoint
 from .course import Attendance, Course
-from .materials import MaterialLink, Topic, Unit
+from .export import ExportedFile, ExportReport
+from .materials import CourseTree, MaterialLink, Topic, TopicMaterials, Unit, UnitTree
 from .profile import (
     AddressDetails,
     OtherInformation,
@@ -12,13 +14,16 @@ from .profile import (
     Profile,
     QualifyingExamination,
 )
-from .results import Assessment, CourseResult, Credits, SemesterResult
+from .results import Assessment, CourseResult, Credits, SemesterResult, SemesterSummary, Transcript
 from .seating_information import SeatingInformation
-from .timetable import ClassSession, Slot, Time, Timetable
+from .snapshot import SectionStatus, Snapshot
+from .timetable import ClassSession, Slot, Time, Timetable, Weekday
 
 __all__ = [
     "Announcement",
     "Attendance",
+    "AttendanceChange",
+    "AttendancePoint",
     "Course",
     "MaterialLink",
     "Profile",
@@ -26,6 +31,9 @@ __all__ = [
     "SemesterResult",
     "Topic",
     "Unit",
+    "CourseTree",
+    "TopicMaterials",
+    "UnitTree",
     "AddressDetails",
     "OtherInformation",
     "ParentDetails",
@@ -35,8 +43,15 @@ __all__ = [
     "Assessment",
     "CourseResult",
     "Credits",
+    "SemesterSummary",
+    "Transcript",
     "Timetable",
     "Slot",
     "Time",
     "ClassSession",
+    "Weekday",
+    "SectionStatus",
+    "Snapshot",
+    "ExportedFile",
+    "ExportReport",
 ]
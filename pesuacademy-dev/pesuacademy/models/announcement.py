@@ -1,10 +1,16 @@
 """Model for announcements in the PESU Academy system."""
 
 import datetime
+import hashlib
 
 from pydantic import BaseModel
 
 
+def _announcement_key(title: str, date: datetime.date) -> str:
+    """Builds the key of an announcement from its title and date."""
+    return hashlib.sha256(f"{date.isoformat()}\n{title}".encode()).hexdigest()[:16]
+
+
 class Announcement(BaseModel):
     """Represents an announcement in the PESU Academy system.
 
@@ -19,3 +25,12 @@ class Announcement(BaseModel):
     date: datetime.date
     content: str
     attachments: list[str] | None = None
+
+    @property
+    def key(self) -> str:
+        """A short hash of the title and date that identifies the announcement across fetches.
+
+        Pass the keys of announcements that have already been seen as `seen` to `get_announcements()` to fetch only
+        newer ones.
+        """
+        return _announcement_key(self.title, self.date)
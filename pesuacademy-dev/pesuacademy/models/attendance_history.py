@@ -0,0 +1,41 @@
+"""Models for the attendance history kept by `AttendanceHistory`."""
+
+import datetime
+
+from pydantic import BaseModel
+
+
+class AttendancePoint(BaseModel):
+    """Represents the attendance of a course as it was at one point in time.
+
+    Attributes:
+        taken_at (datetime.datetime): When the attendance was fetched and first seen with these values.
+        attended (Optional[int]): Number of classes attended by the student.
+        total (Optional[int]): Total number of classes for the course.
+        percentage (Optional[float]): Attendance percentage.
+    """
+
+    taken_at: datetime.datetime
+    attended: int | None = None
+    total: int | None = None
+    percentage: float | None = None
+
+
+class AttendanceChange(BaseModel):
+    """Represents how the attendance of a course changed between two points in time.
+
+    Attributes:
+        code (str): Code of the course.
+        title (str): Title of the course.
+        before (Optional[AttendancePoint]): The attendance before, or None if the course had no history yet.
+        after (AttendancePoint): The attendance after.
+        attended (int): Classes attended in between.
+        total (int): Classes held in between.
+    """
+
+    code: str
+    title: str
+    before: AttendancePoint | None = None
+    after: AttendancePoint
+    attended: int = 0
+    total: int = 0
@@ -0,0 +1,58 @@
+"""Models for course-pack exports in the PESU Academy system."""
+
+from typing import Literal
+
+from pydantic import BaseModel
+
+
+class ExportedFile(BaseModel):
+    """Represents the outcome of exporting a single material.
+
+    Attributes:
+        path (str): Path of the file relative to the export destination (or its name inside the ZIP archive).
+        url (str): The URL the material was downloaded from.
+        status (str): "downloaded", "resumed" (a partial download was completed), "skipped" (the local copy was
+            already up to date) or "failed".
+        size (Optional[int]): Size of the file in bytes.
+        sha256 (Optional[str]): SHA-256 digest of the file contents.
+        bytes_transferred (int): Bytes received over the network for this file during the export.
+        error (Optional[str]): The error message if the download failed.
+    """
+
+    path: str
+    url: str
+    status: Literal["downloaded", "resumed", "skipped", "failed"]
+    size: int | None = None
+    sha256: str | None = None
+    bytes_transferred: int = 0
+    error: str | None = None
+
+
+class ExportReport(BaseModel):
+    """Represents the result of a course-pack export.
+
+    Attributes:
+        destination (str): The directory or ZIP archive the materials were exported to.
+        files (List[ExportedFile]): One entry per material, in the order of the course tree.
+        errors (List[str]): Errors raised while listing the materials, i.e. parts of the tree that were not exported.
+        elapsed (float): Total time taken by the export, in seconds.
+    """
+
+    destination: str
+    files: list[ExportedFile] = []
+    errors: list[str] = []
+    elapsed: float = 0.0
+
+    @property
+    def bytes_transferred(self) -> int:
+        """Total number of bytes received over the network."""
+        return sum(file.bytes_transferred for file in self.files)
+
+    @property
+    def throughput(self) -> float:
+        """Average download throughput over the whole export, in bytes per second."""
+        return self.bytes_transferred / self.elapsed if self.elapsed > 0 else 0.0
+
+    def count(self, status: str) -> int:
+        """Returns the number of files that ended with the given status (e.g. "skipped")."""
+        return sum(file.status == status for file in self.files)
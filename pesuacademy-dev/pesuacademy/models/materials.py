@@ -2,6 +2,8 @@
 
 from pydantic import BaseModel
 
+from .course import Course
+
 
 class Unit(BaseModel):
     """Represents a unit of a course in the PESU Academy system.
@@ -43,3 +45,48 @@ class MaterialLink(BaseModel):
     title: str
     url: str
     is_pdf: bool
+
+
+class TopicMaterials(BaseModel):
+    """Represents a topic along with its material links, as returned by a course tree crawl.
+
+    Attributes:
+        topic (Topic): The topic.
+        materials (Dict[str, List[MaterialLink]]): Material links keyed by material type ID (e.g. "2" for Slides).
+            Types without any material are left out.
+    """
+
+    topic: Topic
+    materials: dict[str, list[MaterialLink]] = {}
+
+
+class UnitTree(BaseModel):
+    """Represents a unit along with all of its topics and their materials.
+
+    Attributes:
+        unit (Unit): The unit.
+        topics (List[TopicMaterials]): The topics of the unit, in the order shown on PESU Academy.
+    """
+
+    unit: Unit
+    topics: list[TopicMaterials] = []
+
+
+class CourseTree(BaseModel):
+    """Represents the full material tree of a course: units, their topics and the topics' material links.
+
+    Parts of the tree that could not be fetched are left out and reported in `errors`.
+
+    Attributes:
+        course_id (str): Unique identifier for the course instance.
+        course (Optional[Course]): The course itself, when the tree was crawled from a course listing.
+        units (List[UnitTree]): The units of the course, in the order shown on PESU Academy.
+        errors (List[str]): Errors raised while fetching parts of the tree.
+        elapsed (float): Time taken by the crawl, in seconds.
+    """
+
+    course_id: str
+    course: Course | None = None
+    units: list[UnitTree] = []
+    errors: list[str] = []
+    elapsed: float = 0.0
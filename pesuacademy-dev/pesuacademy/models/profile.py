@@ -17,7 +17,7 @@ class PersonalDetails(BaseModel):
         email_id (str): Email address of the user.
         contact_no (str): Contact number of the user.
         name_as_in_aadhar (str): Name as per Aadhar card.
-        image (Optional[str]): Base64 encoded profile image, if available.
+        image (Optional[str]): Base64 encoded profile image, if available and requested.
     """
 
     name: str
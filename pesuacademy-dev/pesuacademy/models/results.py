@@ -1,20 +1,56 @@
 """Model for results in the PESU Academy system."""
 
-from pydantic import BaseModel
+import re
+from typing import Self
+
+from pydantic import BaseModel, model_validator
+
+# Keys of `CourseResult.breakdown`, by the words an assessment name contains. Matched at word boundaries, so that e.g.
+# "Research" does not count as an ESA. The first match wins.
+_ASSESSMENT_KINDS = (
+    (re.compile(r"\b(?:assign|assgn)"), "assignments"),
+    (re.compile(r"\bisa[ -]?1\b"), "isa_1"),
+    (re.compile(r"\bisa[ -]?2\b"), "isa_2"),
+    (re.compile(r"\besa\b"), "esa"),
+    (re.compile(r"\blab"), "lab"),
+)
+
+
+def _to_float(value: str | None) -> float | None:
+    """Converts a number shown on the results page (e.g. "8.65") to a float, or None if it is not a number."""
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
 
 
 class Assessment(BaseModel):
     """Represents an assessment(e.g., ISA1, MATLAB) in the PESU Academy system.
 
+    The numeric fields are parsed from the text once, when the assessment is created.
+
     Attributes:
         name (str): Name of the assessment.
         marks (Optional[str]): Marks obtained in the assessment, if applicable. (e.g., 72)
         total (Optional[str]): Total marks for the assessment, if applicable. (e.g., 100)
+        marks_value (Optional[float]): `marks` as a number, or None if it is not one (e.g. a letter grade).
+        total_value (Optional[float]): `total` as a number, or None if it is not one.
+        grade (Optional[str]): The letter grade (e.g., A), if the assessment shows one instead of marks.
     """
 
     name: str
     marks: str | None = None
     total: str | None = None
+    marks_value: float | None = None
+    total_value: float | None = None
+    grade: str | None = None
+
+    @model_validator(mode="after")
+    def _parse_numbers(self) -> Self:
+        """Parses the marks and total."""
+        self.marks_value = _to_float(self.marks)
+        self.total_value = _to_float(self.total)
+        return self
 
 
 class Credits(BaseModel):
@@ -23,26 +59,67 @@ class Credits(BaseModel):
     Attributes:
         earned (str): Credits earned for the course.
         total (str): Total credits available for the course.
+        earned_value (Optional[float]): `earned` as a number, or None if it is not one.
+        total_value (Optional[float]): `total` as a number, or None if it is not one.
     """
 
     earned: str
     total: str
+    earned_value: float | None = None
+    total_value: float | None = None
+
+    @model_validator(mode="after")
+    def _parse_numbers(self) -> Self:
+        """Parses the credits."""
+        self.earned_value = _to_float(self.earned)
+        self.total_value = _to_float(self.total)
+        return self
 
 
 class CourseResult(BaseModel):
     """Represents the result of a course in the PESU Academy system.
 
+    The aggregates are computed from the assessments once, when the result is created.
+
     Attributes:
         code (str): Unique identifier for the course.
         title (str): Title of the course.
         credits (Optional[Credits]): Credits information for the course, if available.
         assessments (List[Assessment]): List of assessments associated with the course.
+        marks_obtained (float): Sum of the numeric marks of all assessments.
+        marks_possible (float): Sum of the numeric totals of all assessments.
+        percentage (Optional[float]): `marks_obtained` as a percentage of `marks_possible`, or None if there are no
+            totals.
+        breakdown (dict[str, float]): Marks of the assessments by kind: "assignments", "isa_1", "isa_2", "esa" and
+            "lab". Kinds the course does not have are left out, and non-numeric marks count as 0.
+        grade (Optional[str]): The letter grade of the course, if published.
     """
 
     code: str
     title: str
     credits: Credits | None = None
     assessments: list[Assessment]
+    marks_obtained: float = 0.0
+    marks_possible: float = 0.0
+    percentage: float | None = None
+    breakdown: dict[str, float] = {}
+    grade: str | None = None
+
+    @model_validator(mode="after")
+    def _aggregate(self) -> Self:
+        """Computes the aggregates from the assessments."""
+        self.marks_obtained = sum(assessment.marks_value or 0.0 for assessment in self.assessments)
+        self.marks_possible = sum(assessment.total_value or 0.0 for assessment in self.assessments)
+        self.percentage = self.marks_obtained / self.marks_possible * 100 if self.marks_possible > 0 else None
+        breakdown = {}
+        for assessment in self.assessments:
+            name = assessment.name.lower()
+            kind = next((kind for pattern, kind in _ASSESSMENT_KINDS if pattern.search(name)), None)
+            if kind is not None:
+                breakdown[kind] = assessment.marks_value or 0.0
+        self.breakdown = breakdown
+        self.grade = next((assessment.grade for assessment in self.assessments if assessment.grade), None)
+        return self
 
 
 class SemesterResult(BaseModel):
@@ -53,8 +130,107 @@ class SemesterResult(BaseModel):
         sgpa (str): Semester Grade Point Average.
         credits (Optional[Credits]): Credits information for the semester, if available.
         courses (List[CourseResult]): List of course results for the semester.
+        sgpa_value (Optional[float]): `sgpa` as a number, or None if it is not one.
     """
 
     sgpa: str
     credits: Credits | None = None
     courses: list[CourseResult]
+    sgpa_value: float | None = None
+
+    @model_validator(mode="after")
+    def _parse_numbers(self) -> Self:
+        """Parses the SGPA."""
+        self.sgpa_value = _to_float(self.sgpa)
+        return self
+
+    @property
+    def published(self) -> bool:
+        """Whether these are the published final results: a numeric SGPA, credits, and a grade for every course."""
+        return (
+            self.sgpa_value is not None
+            and self.credits is not None
+            and bool(self.courses)
+            and all(course.grade for course in self.courses)
+        )
+
+
+class SemesterSummary(BaseModel):
+    """Represents the grades of one semester within a transcript.
+
+    Attributes:
+        semester (int): Semester number.
+        sgpa (Optional[float]): Semester Grade Point Average, if published.
+        credits_earned (Optional[float]): Credits earned in the semester.
+        credits_total (Optional[float]): Credits registered for in the semester.
+        cgpa (Optional[float]): Cumulative Grade Point Average up to and including this semester.
+    """
+
+    semester: int
+    sgpa: float | None = None
+    credits_earned: float | None = None
+    credits_total: float | None = None
+    cgpa: float | None = None
+
+
+class Transcript(BaseModel):
+    """Represents the results of every semester of a student, with the CGPA and its trend.
+
+    The CGPA weighs the SGPA of every semester by the credits registered for in it.
+
+    Attributes:
+        results (dict[int, SemesterResult]): The results of every semester with published results, keyed by number.
+        unavailable (dict[int, str]): Semesters without published results, with the reason.
+        trend (List[SemesterSummary]): SGPA and running CGPA of every semester with results, in order.
+        cgpa (Optional[float]): Cumulative Grade Point Average over all semesters with results.
+        credits_earned (float): Credits earned over all semesters with results.
+        archived (List[int]): Semesters whose final results were read from an archive instead of the portal.
+    """
+
+    results: dict[int, SemesterResult]
+    unavailable: dict[int, str] = {}
+    trend: list[SemesterSummary] = []
+    cgpa: float | None = None
+    credits_earned: float = 0.0
+    archived: list[int] = []
+
+    @classmethod
+    def from_results(
+        cls,
+        results: dict[int, SemesterResult],
+        unavailable: dict[int, str] | None = None,
+        archived: list[int] | None = None,
+    ) -> "Transcript":
+        """Builds a transcript, computing the trend and CGPA from the results of each semester.
+
+        Args:
+            results (dict[int, SemesterResult]): The results of every semester with published results.
+            unavailable (Optional[dict[int, str]]): Semesters without published results, with the reason.
+            archived (Optional[List[int]]): Semesters whose results were read from an archive.
+
+        Returns:
+            Transcript: The transcript.
+        """
+        trend = []
+        weighted_sum = total_credits = credits_earned = 0.0
+        for semester in sorted(results):
+            result = results[semester]
+            sgpa = result.sgpa_value
+            earned = result.credits.earned_value if result.credits else None
+            total = result.credits.total_value if result.credits else None
+            credits_earned += earned or 0.0
+            if sgpa is not None and total:
+                weighted_sum += sgpa * total
+                total_credits += total
+            cgpa = round(weighted_sum / total_credits, 2) if total_credits else None
+            trend.append(
+                SemesterSummary(semester=semester, sgpa=sgpa, credits_earned=earned, credits_total=total, cgpa=cgpa)
+            )
+        return cls(
+            results=dict(sorted(results.items())),
+            unavailable=dict(sorted((unavailable or {}).items())),
+            trend=trend,
+            cgpa=trend[-1].cgpa if trend else None,
+            credits_earned=credits_earned,
+            archived=sorted(archived or []),
+        )
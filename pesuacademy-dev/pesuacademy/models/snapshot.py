@@ -0,0 +1,56 @@
+"""Model for a combined dashboard snapshot in the PESU Academy system."""
+
+from pydantic import BaseModel
+
+from .announcement import Announcement
+from .course import Course
+from .profile import Profile
+from .results import SemesterResult
+from .seating_information import SeatingInformation
+from .timetable import Timetable
+
+
+class SectionStatus(BaseModel):
+    """Represents the outcome of fetching a single section of a snapshot.
+
+    Attributes:
+        ok (bool): True if the section was fetched and parsed successfully.
+        elapsed (float): Time spent on the section, in seconds.
+        error (Optional[str]): The error message if the section failed.
+    """
+
+    ok: bool
+    elapsed: float
+    error: str | None = None
+
+
+class Snapshot(BaseModel):
+    """Represents everything shown on the dashboard, fetched in one go over a single session.
+
+    Sections that failed are left as None and their errors are reported in `sections`.
+
+    Attributes:
+        semester (Optional[int]): The current semester number.
+        profile (Optional[Profile]): The student's profile, without the photo (see `PESUAcademy.get_profile_image()`).
+        courses (Optional[List[Course]]): Courses registered in the current semester.
+        attendance (Optional[List[Course]]): Attendance for the current semester.
+        timetable (Optional[Timetable]): The weekly timetable.
+        announcements (Optional[List[Announcement]]): The latest announcements.
+        seating_info (Optional[List[SeatingInformation]]): Upcoming exam seating arrangements.
+        results (Optional[SemesterResult]): The most recent published results.
+        results_semester (Optional[int]): The semester number `results` belongs to.
+        sections (Dict[str, SectionStatus]): Per-section status, error and timing, keyed by field name.
+        elapsed (float): Total time taken for the snapshot, in seconds.
+    """
+
+    semester: int | None = None
+    profile: Profile | None = None
+    courses: list[Course] | None = None
+    attendance: list[Course] | None = None
+    timetable: Timetable | None = None
+    announcements: list[Announcement] | None = None
+    seating_info: list[SeatingInformation] | None = None
+    results: SemesterResult | None = None
+    results_semester: int | None = None
+    sections: dict[str, SectionStatus] = {}
+    elapsed: float = 0.0
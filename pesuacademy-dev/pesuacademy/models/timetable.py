@@ -1,9 +1,10 @@
 """Model for TimeTable in the PESU Academy system."""
 
-from datetime import time
+from bisect import bisect_right
+from datetime import datetime, time
 from enum import Enum
 
-from pydantic import BaseModel
+from pydantic import BaseModel, PrivateAttr
 
 
 class ClassSession(BaseModel):
@@ -59,14 +60,126 @@ class Weekday(str, Enum):
     saturday = "saturday"
 
 
+# Weekdays in the order of datetime.weekday(), which counts from Monday = 0
+_WEEK = list(Weekday)
+
+
+def _minutes(value: time) -> int:
+    """Returns the number of minutes since midnight of a time."""
+    return value.hour * 60 + value.minute
+
+
+class _DayIndex:
+    """The slots of one day, sorted by start time, with the lookups of `Timetable` precomputed."""
+
+    def __init__(self, slots: list[Slot]) -> None:
+        """Sorts the slots of a day and finds its classes and free windows.
+
+        Args:
+            slots (List[Slot]): The slots of the day, in any order.
+        """
+        self.slots = sorted(slots, key=lambda slot: _minutes(slot.time.start))
+        self.starts = [_minutes(slot.time.start) for slot in self.slots]
+        # Positions of the slots that hold a class, and their start times
+        self.class_positions = [i for i, slot in enumerate(self.slots) if not slot.is_break and slot.session]
+        self.class_starts = [self.starts[i] for i in self.class_positions]
+
+        classes = set(self.class_positions)
+        self.free_windows: list[tuple[time, time]] = []
+        for position, slot in enumerate(self.slots):
+            if position in classes:
+                continue
+            if self.free_windows and self.free_windows[-1][1] == slot.time.start:
+                self.free_windows[-1] = (self.free_windows[-1][0], slot.time.end)
+            else:
+                self.free_windows.append((slot.time.start, slot.time.end))
+
+    def slot_at(self, minute: int) -> Slot | None:
+        """Returns the slot that is running at a minute of the day, or None."""
+        position = bisect_right(self.starts, minute) - 1
+        if position < 0:
+            return None
+        slot = self.slots[position]
+        return slot if minute < _minutes(slot.time.end) else None
+
+    def next_class(self, minute: int) -> Slot | None:
+        """Returns the first class that starts after a minute of the day, or None."""
+        position = bisect_right(self.class_starts, minute)
+        return self.slots[self.class_positions[position]] if position < len(self.class_positions) else None
+
+
 class Timetable(BaseModel):
-    """The main model to hold the entire weekly schedule, organized by day."""
+    """The main model to hold the entire weekly schedule, organized by day.
+
+    Besides the slots of every day, a timetable answers "what is on now" and "what is next" without walking the
+    slots: the first of these queries sorts the slots of each day by start time, and every query after it is a binary
+    search.
+    """
 
     days: dict[Weekday, list[Slot]]
+    _index: dict[Weekday, _DayIndex] | None = PrivateAttr(default=None)
 
     def __getattr__(self, item: str) -> list[Slot]:
         """Allows for convenient dot-access to days (e.g., timetable.monday)."""
+        if item.startswith("_"):
+            return super().__getattr__(item)
         try:
             return self.days[Weekday(item)]
         except (ValueError, KeyError):
             raise AttributeError(f"Timetable has no attribute or day named '{item}'")
+
+    def _day_index(self, day: Weekday) -> _DayIndex:
+        """Returns the index of a day, building the indexes of all days on first use."""
+        if self._index is None:
+            self._index = {weekday: _DayIndex(slots) for weekday, slots in self.days.items()}
+        return self._index.get(day) or _DayIndex([])
+
+    def current_slot(self, now: datetime) -> Slot | None:
+        """Returns the slot (class, break or free period) that is running at a given moment.
+
+        Args:
+            now (datetime): The moment to look up, in the timezone of the timetable.
+
+        Returns:
+            Optional[Slot]: The running slot, or None outside of the day's slots and on Sundays.
+        """
+        if now.weekday() >= len(_WEEK):
+            return None
+        return self._day_index(_WEEK[now.weekday()]).slot_at(_minutes(now.time()))
+
+    def next_class(self, now: datetime) -> tuple[Weekday, Slot] | None:
+        """Returns the next class that starts after a given moment, looking ahead up to a week.
+
+        Args:
+            now (datetime): The moment to look from, in the timezone of the timetable.
+
+        Returns:
+            Optional[Tuple[Weekday, Slot]]: The day and slot of the next class, or None if the timetable has no classes.
+        """
+        minute = _minutes(now.time())
+        for offset in range(7):
+            weekday = (now.weekday() + offset) % 7
+            if weekday >= len(_WEEK):
+                continue
+            # Later in the day on the first day, any time on the following ones
+            slot = self._day_index(_WEEK[weekday]).next_class(minute if offset == 0 else -1)
+            if slot is not None:
+                return _WEEK[weekday], slot
+        # The only classes of the week may be earlier on the same weekday, a week from now
+        if now.weekday() < len(_WEEK):
+            slot = self._day_index(_WEEK[now.weekday()]).next_class(-1)
+            if slot is not None:
+                return _WEEK[now.weekday()], slot
+        return None
+
+    def free_windows(self, day: Weekday | str) -> list[tuple[time, time]]:
+        """Returns the periods of a day without a class: breaks and free slots, merged where they are adjacent.
+
+        Args:
+            day (Weekday | str): The day, e.g. "monday".
+
+        Returns:
+            List[Tuple[time, time]]: The start and end of every free window, in order. Time before the first and after
+            the last slot of the day is not included.
+        """
+        return list(self._day_index(Weekday(day)).free_windows)
@@ -1,92 +1,182 @@
 """This module handles the scraping of announcements from the PESU Academy website."""
 
-import copy
 import datetime
 import re
+from collections.abc import AsyncIterator, Collection, Iterator
 
 import httpx
-from bs4 import BeautifulSoup
 
 from pesuacademy import constants
 from pesuacademy.models import Announcement
+from pesuacademy.models.announcement import _announcement_key
+from pesuacademy.parsers import _HTMLNode, _parse_html, _run_parse
 from pesuacademy.util import _build_params
 
+_ATTACHMENT_ID_PATTERN = re.compile(r"handleDownloadAnoncemntdoc\('(\d+)'\)")
+
 
 class _AnnouncementPageHandler:
     @staticmethod
-    async def _get(session: httpx.AsyncClient) -> list[Announcement]:
-        """Fetches the main announcements page and scrapes all announcements.
+    def _is_excluded_from_content(node: _HTMLNode) -> bool:
+        """Checks whether a node inside an announcement body is a "Read more" link or an attachment block."""
+        if node.tag == "a":
+            return node.has_class("readmorelink")
+        return node.tag == "div" and node.css_first('a[href*="handleDownloadAnoncemntdoc"]') is not None
+
+    @staticmethod
+    def _parse_header(wrapper: _HTMLNode) -> tuple[str, datetime.date]:
+        """Parses the title and date of an announcement block, which are enough to tell whether it was seen before.
 
         Args:
-            session (httpx.AsyncClient): The HTTP client session to use for requests.
+            wrapper (_HTMLNode): A div.elem-info-wrapper element of the announcements page.
 
         Returns:
-            List[Announcement]: A list of Announcement objects containing the scraped data.
+            Tuple[str, datetime.date]: The title and date of the announcement.
 
         Raises:
-            httpx.HTTPStatusError: If the request to the announcements page fails.
+            ValueError: If the date of the announcement cannot be parsed.
         """
-        params = _build_params(constants._PageURLParams.Announcements, url="studentProfilePESUAdmin")
-        response = await session.get(constants.PAGES_BASE_URL, params=params)
-        response.raise_for_status()
+        title_tag = wrapper.css_first("h4.text-info")
+        title = title_tag.text.strip() if title_tag else "No Title"
 
-        soup = BeautifulSoup(response.text, "lxml")
+        date_tag = wrapper.css_first("span.text-muted")
+        date_str = date_tag.text.strip() if date_tag else ""
+        date = datetime.datetime.strptime(date_str, "%d-%B-%Y").date()
+        return title, date
 
-        announcements = []
+    @staticmethod
+    def _parse_announcement(wrapper: _HTMLNode, header: tuple[str, datetime.date] | None = None) -> Announcement | None:
+        """Parses a single announcement block.
 
-        # Find all announcement wrappers
-        announcement_wrappers = soup.find_all("div", class_="elem-info-wrapper")
+        Args:
+            wrapper (_HTMLNode): A div.elem-info-wrapper element of the announcements page.
+            header (Optional[Tuple[str, datetime.date]]): The title and date, if already parsed by `_parse_header`.
 
-        for wrapper in announcement_wrappers:
-            try:
-                # Title
-                title_tag = wrapper.find("h4", class_="text-info")
-                title = title_tag.text.strip() if title_tag else "No Title"
-
-                # Date
-                date_tag = wrapper.find("span", class_="text-muted")
-                date_str = date_tag.text.strip() if date_tag else ""
-                date = datetime.datetime.strptime(date_str, "%d-%B-%Y").date()
-
-                content_div = wrapper.find("div", class_="col-md-12")
-                if not content_div:
-                    continue
-
-                # Content attachments
-                attachments = []
-                link_tags = content_div.find_all("a", href=re.compile(r"handleDownloadAnoncemntdoc"))
-                for link_tag in link_tags:
-                    href_attr = link_tag.get("href", "")
-                    match = re.search(r"handleDownloadAnoncemntdoc\('(\d+)'\)", href_attr)
-                    if match:
-                        doc_id = match.group(1)
-                        # Construct the full download URL
-                        partial_url = f"{constants.BASE_URL}/Academy/s/studentProfilePESUAdmin/downloadAnoncemntdoc/"
-                        full_url = f"{partial_url}{doc_id}"
-                        attachments.append(full_url)
-
-                # Content without "Read more" attachments and download attachments
-                # To get clean content, we make a copy and remove the elements we don't want
-                content_clone = copy.copy(content_div)
-                if read_more := content_clone.find("a", class_="readmorelink"):
-                    read_more.decompose()
-                for link_div in content_clone.find_all("div"):
-                    if link_div.find("a", href=re.compile(r"handleDownloadAnoncemntdoc")):
-                        link_div.decompose()
-                content = content_clone.text.strip()
-
-                announcements.append(
-                    Announcement(
-                        title=title,
-                        date=date,
-                        content=content,
-                        attachments=attachments or None,
-                    )
-                )
+        Returns:
+            Optional[Announcement]: The parsed announcement, or None if the block has no content.
+
+        Raises:
+            AttributeError: If the block does not have the expected structure.
+            ValueError: If the date of the announcement cannot be parsed.
+        """
+        title, date = header or _AnnouncementPageHandler._parse_header(wrapper)
+
+        content_div = wrapper.css_first("div.col-md-12")
+        if not content_div:
+            return None
+
+        # Content attachments
+        attachments = []
+        partial_url = f"{constants.BASE_URL}/Academy/s/studentProfilePESUAdmin/downloadAnoncemntdoc/"
+        for link_tag in content_div.css('a[href*="handleDownloadAnoncemntdoc"]'):
+            match = _ATTACHMENT_ID_PATTERN.search(link_tag.get("href", ""))
+            if match:
+                attachments.append(f"{partial_url}{match.group(1)}")
+
+        # Content without "Read more" links and download attachments
+        # The unwanted subtrees are skipped while collecting the text instead of removing them from a copy
+        content = content_div.text_skipping(_AnnouncementPageHandler._is_excluded_from_content).strip()
+
+        return Announcement(
+            title=title,
+            date=date,
+            content=content,
+            attachments=attachments or None,
+        )
 
+    @staticmethod
+    def _iter_document(
+        document: _HTMLNode, since: datetime.date | None = None, seen: frozenset[str] | None = None
+    ) -> Iterator[Announcement]:
+        """Yields the announcements of the parsed announcements page, newest first, down to the watermark.
+
+        The page lists announcements newest first, so with a watermark (`since` or `seen`) parsing stops at the first
+        announcement that is older than `since` or whose key is in `seen`: only its title and date are parsed, and
+        none of the blocks after it.
+        """
+        # Find all announcement wrappers
+        for wrapper in document.css("div.elem-info-wrapper"):
+            try:
+                header = _AnnouncementPageHandler._parse_header(wrapper)
+                if (since is not None and header[1] < since) or (seen and _announcement_key(*header) in seen):
+                    return
+                announcement = _AnnouncementPageHandler._parse_announcement(wrapper, header)
             except (AttributeError, ValueError) as e:
                 # Skip any panels that have parsing errors
                 print(f"Skipping a panel due to parsing error: {e}")
                 continue
+            if announcement is not None:
+                yield announcement
+
+    @staticmethod
+    async def _fetch(session: httpx.AsyncClient) -> bytes:
+        """Fetches the main announcements page.
+
+        Raises:
+            httpx.HTTPStatusError: If the request to the announcements page fails.
+        """
+        params = _build_params(constants._PageURLParams.Announcements, url="studentProfilePESUAdmin")
+        response = await session.get(constants.PAGES_BASE_URL, params=params)
+        response.raise_for_status()
+        return response.content
 
-        return announcements
+    @staticmethod
+    def _parse(
+        content: bytes, since: datetime.date | None = None, seen: frozenset[str] | None = None
+    ) -> list[Announcement]:
+        """Parses every announcement of the announcements page down to the watermark.
+
+        Args:
+            content (bytes): The body of the announcements page.
+            since (Optional[datetime.date]): Only return announcements from this date on.
+            seen (Optional[FrozenSet[str]]): Keys (`Announcement.key`) of announcements that were already seen.
+
+        Returns:
+            List[Announcement]: The announcements, in the order they appear on the page.
+        """
+        return list(_AnnouncementPageHandler._iter_document(_parse_html(content), since, seen))
+
+    @staticmethod
+    async def _iter(
+        session: httpx.AsyncClient, since: datetime.date | None = None, seen: Collection[str] | None = None
+    ) -> AsyncIterator[Announcement]:
+        """Fetches the main announcements page and yields each announcement as soon as its block is parsed.
+
+        The blocks are parsed on the event loop, between the items consumed by the caller. `_get` parses them all at
+        once instead, in the parse executor if there is one.
+
+        Args:
+            session (httpx.AsyncClient): The HTTP client session to use for requests.
+            since (Optional[datetime.date]): Only yield announcements from this date on.
+            seen (Optional[Collection[str]]): Keys (`Announcement.key`) of announcements that were already seen.
+
+        Yields:
+            Announcement: The announcements, in the order they appear on the page.
+
+        Raises:
+            httpx.HTTPStatusError: If the request to the announcements page fails.
+        """
+        content = await _AnnouncementPageHandler._fetch(session)
+        document = _parse_html(content)
+        for announcement in _AnnouncementPageHandler._iter_document(document, since, frozenset(seen) if seen else None):
+            yield announcement
+
+    @staticmethod
+    async def _get(
+        session: httpx.AsyncClient, since: datetime.date | None = None, seen: Collection[str] | None = None
+    ) -> list[Announcement]:
+        """Fetches the main announcements page and scrapes all announcements, or only those newer than a watermark.
+
+        Args:
+            session (httpx.AsyncClient): The HTTP client session to use for requests.
+            since (Optional[datetime.date]): Only return announcements from this date on.
+            seen (Optional[Collection[str]]): Keys (`Announcement.key`) of announcements that were already seen.
+
+        Returns:
+            List[Announcement]: A list of Announcement objects containing the scraped data.
+
+        Raises:
+            httpx.HTTPStatusError: If the request to the announcements page fails.
+        """
+        content = await _AnnouncementPageHandler._fetch(session)
+        return await _run_parse(_AnnouncementPageHandler._parse, content, since, frozenset(seen) if seen else None)
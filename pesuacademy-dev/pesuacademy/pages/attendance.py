@@ -1,10 +1,10 @@
 """This module handles the scraping of attendance data from the PESU Academy website."""
 
 import httpx
-from bs4 import BeautifulSoup
 
 from pesuacademy import constants
 from pesuacademy.models import Attendance, Course
+from pesuacademy.parsers import _parse_html, _run_parse
 from pesuacademy.util import _build_params
 
 
@@ -27,16 +27,28 @@ class _AttendancePageHandler:
         response = await session.get(constants.PAGES_BASE_URL, params=params)
         response.raise_for_status()
 
-        soup = BeautifulSoup(response.text, "lxml")
-        table = soup.find("table", class_="box-shadow")
+        return await _run_parse(_AttendancePageHandler._parse, response.content)
+
+    @staticmethod
+    def _parse(content: bytes) -> list[Course]:
+        """Parses the attendance table of a semester.
+
+        Args:
+            content (bytes): The body of the attendance page.
+
+        Returns:
+            List[Course]: A list of Course objects containing attendance information.
+        """
+        document = _parse_html(content)
+        table = document.css_first("table.box-shadow")
         if not table or "Data Not Available" in table.text:
             return []
 
         # Parse the attendance data
         # The table structure is assumed to have columns: Code, Title, Attended/Total, Percentage
         attendance_data = []
-        for row in table.find("tbody").find_all("tr"):
-            cols = [c.text.strip() for c in row.find_all("td")]
+        for row in table.css_first("tbody").css("tr"):
+            cols = [c.text.strip() for c in row.css("td")]
             if len(cols) >= constants.ATTENDANCE_EXPECTED_COLUMNS:
                 attended, total = None, None
                 if "/" in cols[2]:
@@ -3,10 +3,10 @@
 import re
 
 import httpx
-from bs4 import BeautifulSoup
 
 from pesuacademy import constants
 from pesuacademy.models import Unit
+from pesuacademy.parsers import _parse_html, _run_parse
 from pesuacademy.util import _build_params
 
 
@@ -29,15 +29,27 @@ class _CourseDetailPageHandler:
         response = await session.get(constants.PAGES_BASE_URL, params=params)
         response.raise_for_status()
 
-        soup = BeautifulSoup(response.text, "lxml")
+        return await _run_parse(_CourseDetailPageHandler._parse, response.content)
+
+    @staticmethod
+    def _parse(content: bytes) -> list[Unit]:
+        """Parses the list of units of a course.
+
+        Args:
+            content (bytes): The body of the course page.
+
+        Returns:
+            List[Unit]: A list of Unit objects containing the scraped data.
+        """
+        document = _parse_html(content)
 
         # Find the units container
-        units_container = soup.find("ul", id="courselistunit")
+        units_container = document.css_first("ul#courselistunit")
         if not units_container:
             return []
 
         units = []
-        unit_links = units_container.find_all("a")
+        unit_links = units_container.css("a")
 
         for link in unit_links:
             # Title
@@ -1,10 +1,10 @@
 """This module handles the scraping of courses from the PESU Academy website."""
 
 import httpx
-from bs4 import BeautifulSoup
 
 from pesuacademy import constants
 from pesuacademy.models import Course
+from pesuacademy.parsers import _parse_html, _run_parse
 from pesuacademy.util import _build_params
 
 
@@ -28,14 +28,26 @@ class _CoursesPageHandler:
         response = await session.get(constants.PAGES_BASE_URL, params=params)
         response.raise_for_status()
 
-        soup = BeautifulSoup(response.text, "lxml")
-        table = soup.find("table", class_="table-hover")
+        return await _run_parse(_CoursesPageHandler._parse, response.content)
+
+    @staticmethod
+    def _parse(content: bytes) -> list[Course]:
+        """Parses the course list of a semester.
+
+        Args:
+            content (bytes): The body of the courses page.
+
+        Returns:
+            List[Course]: A list of Course objects containing course information.
+        """
+        document = _parse_html(content)
+        table = document.css_first("table.table-hover")
         if not table or "No subjects found" in table.text:
             return []
 
         courses = []
         # Iterate through each Course row
-        for row in table.find("tbody").find_all("tr"):
+        for row in table.css_first("tbody").css("tr"):
             row_id = row.get("id")
             # Ensure the row ID is valid and contains the expected prefix
             if not row_id or "rowWiseCourseContent_" not in row_id:
@@ -46,7 +58,7 @@ class _CoursesPageHandler:
             except IndexError:
                 continue
 
-            cols = [c.text.strip() for c in row.find_all("td")]
+            cols = [c.text.strip() for c in row.css("td")]
 
             if len(cols) >= constants.COURSES_EXPECTED_COLUMNS:
                 courses.append(
@@ -1,54 +1,59 @@
 """This module provides functionality to scrape ESA results from the PESU Academy website."""
 
 import httpx
-from bs4 import BeautifulSoup
 
 from pesuacademy import constants
+from pesuacademy.exceptions import ResultsNotPublishedError
 from pesuacademy.models import Assessment, CourseResult, Credits, SemesterResult
+from pesuacademy.parsers import _HTMLNode, _parse_html, _run_parse
 from pesuacademy.util import _build_params
 
 
 class _ResultsPageHandler:
     @staticmethod
-    def _parse_assessments(container: BeautifulSoup) -> list[Assessment]:
+    def _parse_assessments(container: _HTMLNode) -> list[Assessment]:
         """Parses the assessments for a single course."""
         assessments = []
-        assessment_bar = container.find("div", class_="dashboard-info-bar")
+        assessment_bar = container.css_first("div.dashboard-info-bar")
         if not assessment_bar:
             return []
 
-        for assessment_div in assessment_bar.find_all("div", recursive=False):
-            name_tag = assessment_div.find("h6")
+        for assessment_div in assessment_bar.children():
+            if assessment_div.tag != "div":
+                continue
+            name_tag = assessment_div.css_first("h6")
             if not name_tag:
                 continue
             name = name_tag.text.strip()
 
-            marks, total = None, None
-            marks_span = assessment_div.find("span", class_="dark-text")
+            marks, total, grade = None, None, None
+            marks_span = assessment_div.css_first("span.dark-text")
             if marks_span:
                 marks = marks_span.text.strip()
-                if marks_span.next_sibling and isinstance(marks_span.next_sibling, str):
-                    total_raw = marks_span.next_sibling.strip()
+                next_sibling = marks_span.next_sibling()
+                if next_sibling and isinstance(next_sibling, str):
+                    total_raw = next_sibling.strip()
                     if total_raw.startswith("/"):
                         total = total_raw.replace("/", "").strip()
-            elif grade_span := assessment_div.find("span", class_="f-size-2x-big"):
-                marks = grade_span.text.strip()
+            elif grade_span := assessment_div.css_first("span.f-size-2x-big"):
+                # Only published grades are shown this way. Marks such as "AB" or "NA" are not grades.
+                marks = grade = grade_span.text.strip()
 
             if name:
-                assessments.append(Assessment(name=name, marks=marks, total=total))
+                assessments.append(Assessment(name=name, marks=marks, total=total, grade=grade))
         return assessments
 
     @staticmethod
-    def _parse_single_course(container: BeautifulSoup) -> CourseResult | None:
+    def _parse_single_course(container: _HTMLNode) -> CourseResult | None:
         """Parses a single course container from the results page."""
-        header = container.find("div", class_="header-info")
+        header = container.css_first("div.header-info")
         if not header:
             return None
 
-        header_text = header.find("h6").text.strip()
+        header_text = header.css_first("h6").text.strip()
         code, title = (part.strip() for part in header_text.split("-", 1))
 
-        credits_text = header.find("h6", class_="text-right").text.strip().split(":")[-1]
+        credits_text = header.css_first("h6.text-right").text.strip().split(":")[-1]
         s_credit_parts = credits_text.split("/")
         s_credits_earned = s_credit_parts[0].strip()
         s_credits_total = s_credit_parts[1].strip() if len(s_credit_parts) > 1 else s_credits_earned
@@ -63,13 +68,13 @@ class _ResultsPageHandler:
         )
 
     @staticmethod
-    def _parse_course_results(soup: BeautifulSoup) -> list[CourseResult]:
+    def _parse_course_results(document: _HTMLNode) -> list[CourseResult]:
         """Parses all course results from the page."""
-        wrapper = soup.find("div", class_="multiple-info-wrapper")
+        wrapper = document.css_first("div.multiple-info-wrapper")
         if not wrapper:
             return []
 
-        course_containers = wrapper.find_all("div", class_="clearfix")
+        course_containers = wrapper.css("div.clearfix")
         course_results = []
         for container in course_containers:
             if course_result := _ResultsPageHandler._parse_single_course(container):
@@ -77,16 +82,22 @@ class _ResultsPageHandler:
         return course_results
 
     @staticmethod
-    def _parse_summary(soup: BeautifulSoup) -> tuple[str, str, str]:
-        """Parses the summary section (SGPA, credits) of the results page."""
-        summary_divs = soup.select("div.dashboard-info-bar > div")
-        summary_credits_raw = summary_divs[0].contents[-1].strip()
+    def _parse_summary(document: _HTMLNode) -> tuple[str, str, str]:
+        """Parses the summary section (SGPA, credits) of the results page.
+
+        Raises:
+            ResultsNotPublishedError: If the page has no summary, as for a semester without published results.
+        """
+        summary_divs = document.css("div.dashboard-info-bar > div")
+        if len(summary_divs) < 2:
+            raise ResultsNotPublishedError("No results have been published for this semester yet.")
+        summary_credits_raw = summary_divs[0].contents()[-1].strip()
 
         credit_parts = summary_credits_raw.split("/")
         credits_earned = credit_parts[0].strip()
         credits_total = credit_parts[1].strip() if len(credit_parts) > 1 else credits_earned
 
-        sgpa_raw = summary_divs[1].contents[-1].strip()
+        sgpa_raw = summary_divs[1].contents()[-1].strip()
         return sgpa_raw, credits_earned, credits_total
 
     @staticmethod
@@ -103,15 +114,31 @@ class _ResultsPageHandler:
 
         Raises:
             httpx.HTTPStatusError: If the request to the results page fails.
+            ResultsNotPublishedError: If the semester has no published results.
         """
         params = _build_params(constants._PageURLParams.Results, semid=semester_id)
         response = await session.get(constants.PAGES_BASE_URL, params=params)
         response.raise_for_status()
 
-        soup = BeautifulSoup(response.text, "lxml")
+        return await _run_parse(_ResultsPageHandler._parse, response.content)
+
+    @staticmethod
+    def _parse(content: bytes) -> SemesterResult:
+        """Parses the results page of a semester.
+
+        Args:
+            content (bytes): The body of the results page.
+
+        Returns:
+            SemesterResult: The SGPA, credits and course results of the semester.
+
+        Raises:
+            ResultsNotPublishedError: If the semester has no published results.
+        """
+        document = _parse_html(content)
 
-        sgpa, credits_earned, credits_total = _ResultsPageHandler._parse_summary(soup)
-        course_results = _ResultsPageHandler._parse_course_results(soup)
+        sgpa, credits_earned, credits_total = _ResultsPageHandler._parse_summary(document)
+        course_results = _ResultsPageHandler._parse_course_results(document)
 
         return SemesterResult(
             sgpa=sgpa,
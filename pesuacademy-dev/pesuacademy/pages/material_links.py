@@ -3,10 +3,10 @@
 import re
 
 import httpx
-from bs4 import BeautifulSoup
 
 from pesuacademy import constants
 from pesuacademy.models import MaterialLink, Topic
+from pesuacademy.parsers import _parse_html, _run_parse
 from pesuacademy.util import _build_params
 
 
@@ -36,11 +36,27 @@ class _MaterialLinksHandler:
         response = await session.get(constants.PAGES_BASE_URL, params=params)
         response.raise_for_status()
 
-        soup = BeautifulSoup(response.text, "lxml")
+        # Without the cache-buster, so that an unchanged page is recognised by the parse memo
+        page_url = str(response.url.copy_remove_param("_"))
+        return await _run_parse(_MaterialLinksHandler._parse, response.content, page_url)
+
+    @staticmethod
+    def _parse(content: bytes, page_url: str) -> list[MaterialLink]:
+        """Parses the material links of a topic.
+
+        Args:
+            content (bytes): The body of the material links page.
+            page_url (str): The URL the page was served from, which the download URLs are relative to.
+
+        Returns:
+            List[MaterialLink]: A list of MaterialLink objects containing the scraped data.
+        """
+        base_url = httpx.URL(page_url)
+        document = _parse_html(content)
         links = []
 
         # Find all link containers
-        link_containers = soup.find_all("div", class_="link-preview")
+        link_containers = document.css("div.link-preview")
 
         for container in link_containers:
             onclick_attr = container.get("onclick", "")
@@ -51,13 +67,13 @@ class _MaterialLinksHandler:
                 if match:
                     doc_id = match.group(1)
                     title = container.text.strip()
-                    # Construct the full download URL
-                    full_url = f"{constants.BASE_URL}/Academy/s/referenceMeterials/downloadcoursedoc/{doc_id}"
+                    # Construct the full download URL on the host that served the page
+                    full_url = str(base_url.join(f"/Academy/s/referenceMeterials/downloadcoursedoc/{doc_id}"))
                     links.append(MaterialLink(title=title, url=full_url, is_pdf=False))
 
             # PDF links which are in the form of an Iframe
             else:
-                link_tag = container.find("a")
+                link_tag = container.css_first("a")
                 if link_tag:
                     onclick_attr = link_tag.get("onclick", "")
                     match = re.search(r"loadIframe\('([^']*)'", onclick_attr)
@@ -65,7 +81,7 @@ class _MaterialLinksHandler:
                         partial_url = match.group(1).split("#")[0]  # Get URL part before the '#'
                         title = link_tag.text.strip()
                         # Construct the full download URL
-                        full_url = f"{constants.BASE_URL}{partial_url}"
+                        full_url = str(base_url.join(partial_url))
                         links.append(MaterialLink(title=title, url=full_url, is_pdf=True))
 
         return links
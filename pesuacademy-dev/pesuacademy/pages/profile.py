@@ -1,9 +1,9 @@
 """This module handles fetching and parsing the student Profile page from the PESU Academy website."""
 
-import re
+import base64
+import binascii
 
 import httpx
-from bs4 import BeautifulSoup, Tag
 
 from pesuacademy import constants
 from pesuacademy.models import (
@@ -15,8 +15,12 @@ from pesuacademy.models import (
     Profile,
     QualifyingExamination,
 )
+from pesuacademy.parsers import _HTMLNode, _parse_html, _run_parse
 from pesuacademy.util import _build_params
 
+# Prefix of the profile photo, which is inlined in the page as a base64 data URI
+_IMAGE_PREFIX = b"data:image/jpeg;base64,"
+
 
 class _ProfilePageHandler:
     """Handles fetching and parsing the user profile page in the PESU Academy system.
@@ -25,36 +29,92 @@ class _ProfilePageHandler:
     """
 
     @staticmethod
-    def _find_value_for_label(container: Tag, text: str) -> str:
-        """Finds a value associated with a label within a specific container.
+    def _label_values(container: _HTMLNode) -> dict[str, str]:
+        """Maps every label within a container to its value, in a single pass over the container.
+
+        The value of a label is the text of its next sibling label or, if it has none, the value of the next input
+        field. Labels without either map to "N/A". If a label occurs twice, its first occurrence is kept.
 
         Args:
-            container (Tag): The BeautifulSoup Tag object containing the profile information.
-            text (str): The label text to search for.
+            container (_HTMLNode): The node containing a section of the profile.
+
+        Returns:
+            Dict[str, str]: The values, by label text without surrounding whitespace, in document order.
+        """
+        values: dict[str, str] = {}
+        # Labels without a value label, waiting for the next input field
+        awaiting: list[str] = []
+        for field in container.css("label, input"):
+            if field.tag == "input":
+                for label in awaiting:
+                    values[label] = field.get("value").strip() if field.has_attr("value") else "N/A"
+                awaiting.clear()
+                continue
+            if (string := field.string) is None or (label := string.strip()) in values:
+                continue
+            value_tag = field.find_next_sibling("label")
+            if value_tag:
+                values[label] = value_tag.text.strip()
+            else:
+                values[label] = "N/A"
+                awaiting.append(label)
+        return values
+
+    @staticmethod
+    def _value(values: dict[str, str], label: str) -> str:
+        """Returns the value of a label from a map built by `_label_values()`.
+
+        Args:
+            values (Dict[str, str]): The values of a section, by label.
+            label (str): The label to look up. If no label is exactly this text, the first label containing it is used.
 
         Returns:
             str: The value associated with the label, or "N/A" if not found.
         """
-        label_tag = container.find("label", string=re.compile(r"\s*" + text + r"\s*"))
-        if not label_tag:
-            return "N/A"
-        # Find the next sibling label or input to get the value
-        value_tag = label_tag.find_next_sibling("label")
-        if value_tag:
-            return value_tag.text.strip()
-        # If the next sibling is not a label, check for an input field
-        input_tag = label_tag.find_next("input")
-        if input_tag and input_tag.has_attr("value"):
-            return input_tag["value"].strip()
-
-        return "N/A"
+        value = values.get(label)
+        if value is None:
+            value = next((value for text, value in values.items() if label in text), "N/A")
+        return value
+
+    @staticmethod
+    def _headings(document: _HTMLNode) -> dict[str, _HTMLNode]:
+        """Maps the text of every <h4> heading with a single string to the first heading with that text."""
+        headings: dict[str, _HTMLNode] = {}
+        for heading in document.css("h4"):
+            if (string := heading.string) is not None:
+                headings.setdefault(string, heading)
+        return headings
 
     @staticmethod
-    def _parse_profile_soup(soup: BeautifulSoup) -> Profile:
+    def _extract_image(content: bytes) -> bytes | None:
+        """Extracts the profile photo from the raw profile page, without parsing the rest of the page.
+
+        Args:
+            content (bytes): The body of the profile page.
+
+        Returns:
+            Optional[bytes]: The JPEG image, or None if the page has no (valid) photo.
+        """
+        start = content.find(_IMAGE_PREFIX)
+        if start == -1:
+            return None
+        start += len(_IMAGE_PREFIX)
+        # The data URI ends at the closing quote of the src attribute
+        end = min((i for i in (content.find(b'"', start), content.find(b"'", start)) if i != -1), default=-1)
+        if end == -1:
+            return None
+        try:
+            return base64.b64decode(content[start:end]) or None
+        except binascii.Error:
+            return None
+
+    @staticmethod
+    def _parse_profile_soup(document: _HTMLNode, include_image: bool = True) -> Profile:
         """Parses the profile page HTML into a structured Profile object.
 
         Args:
-            soup (BeautifulSoup): The BeautifulSoup object containing the parsed HTML of the profile page.
+            document (_HTMLNode): The parsed HTML of the profile page.
+            include_image (bool): Whether to copy the base64 profile photo into `PersonalDetails.image`.
 
         Returns:
             Profile: A Profile object containing personal, parent, and address details.
@@ -63,77 +123,84 @@ class _ProfilePageHandler:
             ValueError: If the profile page structure is not as expected.
         """
         # Personal Details
-        personal_container = soup.find("div", class_="media-body")
-        img_tag = soup.find("img", class_="media-object")
-        profile_image_base64 = img_tag["src"] if img_tag else None
-        profile_image_base64 = profile_image_base64.split("data:image/jpeg;base64,")[1]
+        personal_container = document.css_first("div.media-body")
+        profile_image_base64 = None
+        if include_image:
+            img_tag = document.css_first("img.media-object")
+            profile_image_base64 = img_tag.get("src") if img_tag else None
+            profile_image_base64 = profile_image_base64.split("data:image/jpeg;base64,")[1]
 
+        value = _ProfilePageHandler._value
+        personal_values = _ProfilePageHandler._label_values(personal_container)
         personal = PersonalDetails(
-            name=_ProfilePageHandler._find_value_for_label(personal_container, "Name"),
-            pesu_id=_ProfilePageHandler._find_value_for_label(personal_container, "PESU Id"),
-            srn=_ProfilePageHandler._find_value_for_label(personal_container, "SRN"),
-            program=_ProfilePageHandler._find_value_for_label(personal_container, "Program"),
-            branch=_ProfilePageHandler._find_value_for_label(personal_container, "Branch"),
-            semester=_ProfilePageHandler._find_value_for_label(personal_container, "Semester"),
-            section=_ProfilePageHandler._find_value_for_label(personal_container, "Section"),
-            email_id=_ProfilePageHandler._find_value_for_label(personal_container, "Email ID"),
-            contact_no=_ProfilePageHandler._find_value_for_label(personal_container, "Contact No"),
-            aadhar_no=_ProfilePageHandler._find_value_for_label(personal_container, "Aadhar No"),
-            name_as_in_aadhar=_ProfilePageHandler._find_value_for_label(personal_container, "Name as in aadhar"),
+            name=value(personal_values, "Name"),
+            pesu_id=value(personal_values, "PESU Id"),
+            srn=value(personal_values, "SRN"),
+            program=value(personal_values, "Program"),
+            branch=value(personal_values, "Branch"),
+            semester=value(personal_values, "Semester"),
+            section=value(personal_values, "Section"),
+            email_id=value(personal_values, "Email ID"),
+            contact_no=value(personal_values, "Contact No"),
+            aadhar_no=value(personal_values, "Aadhar No"),
+            name_as_in_aadhar=value(personal_values, "Name as in aadhar"),
             image=profile_image_base64,
         )
 
         # Other Information and Qualifying Examination
-        other_info_container = soup.find("h4", string="Other Information").find_next("div", class_="info-contents")
-        qualifying_exam_container = soup.find("h4", string="Qualifying examination").find_next(
-            "div", class_="info-contents"
+        headings = _ProfilePageHandler._headings(document)
+        other_info_values = _ProfilePageHandler._label_values(
+            headings["Other Information"].find_next("div", class_="info-contents")
+        )
+        qualifying_exam_values = _ProfilePageHandler._label_values(
+            headings["Qualifying examination"].find_next("div", class_="info-contents")
         )
 
         other_info = OtherInformation(
-            sslc_marks=_ProfilePageHandler._find_value_for_label(other_info_container, "SSLC Marks"),
-            puc_marks=_ProfilePageHandler._find_value_for_label(other_info_container, "PUC Marks"),
-            date_of_birth=_ProfilePageHandler._find_value_for_label(other_info_container, "Date of birth"),
-            blood_group=_ProfilePageHandler._find_value_for_label(other_info_container, "Blood Group"),
+            sslc_marks=value(other_info_values, "SSLC Marks"),
+            puc_marks=value(other_info_values, "PUC Marks"),
+            date_of_birth=value(other_info_values, "Date of birth"),
+            blood_group=value(other_info_values, "Blood Group"),
         )
         qualifying_exam = QualifyingExamination(
-            exam=_ProfilePageHandler._find_value_for_label(qualifying_exam_container, "Exam"),
-            rank=_ProfilePageHandler._find_value_for_label(qualifying_exam_container, "Rank"),
-            score=_ProfilePageHandler._find_value_for_label(qualifying_exam_container, "Score"),
+            exam=value(qualifying_exam_values, "Exam"),
+            rank=value(qualifying_exam_values, "Rank"),
+            score=value(qualifying_exam_values, "Score"),
         )
 
         # Parent Details
         # Correctly handles the parent details section by just spltting the containers
         # Assumes Father is always first and Mother is always second (just in this context, lol)
-        parent_containers = soup.find("h4", string="Parent Details").find_next("div").find_all("div", class_="col-md-6")
-        father_container = parent_containers[0]
-        mother_container = parent_containers[1]
+        parent_containers = headings["Parent Details"].find_next("div").css("div.col-md-6")
+        father_values = _ProfilePageHandler._label_values(parent_containers[0])
+        mother_values = _ProfilePageHandler._label_values(parent_containers[1])
 
         parents = ParentInformation(
             father=ParentDetails(
-                name=_ProfilePageHandler._find_value_for_label(father_container, "Father Name"),
-                mobile=_ProfilePageHandler._find_value_for_label(father_container, "Mobile"),
-                email=_ProfilePageHandler._find_value_for_label(father_container, "Email"),
-                occupation=_ProfilePageHandler._find_value_for_label(father_container, "Occupation"),
-                qualification=_ProfilePageHandler._find_value_for_label(father_container, "Qualification"),
-                designation=_ProfilePageHandler._find_value_for_label(father_container, "Designation"),
-                employer=_ProfilePageHandler._find_value_for_label(father_container, "Employer"),
+                name=value(father_values, "Father Name"),
+                mobile=value(father_values, "Mobile"),
+                email=value(father_values, "Email"),
+                occupation=value(father_values, "Occupation"),
+                qualification=value(father_values, "Qualification"),
+                designation=value(father_values, "Designation"),
+                employer=value(father_values, "Employer"),
             ),
             mother=ParentDetails(
-                name=_ProfilePageHandler._find_value_for_label(mother_container, "Mother Name"),
-                mobile=_ProfilePageHandler._find_value_for_label(mother_container, "Mobile"),
-                email=_ProfilePageHandler._find_value_for_label(mother_container, "Email"),
-                occupation=_ProfilePageHandler._find_value_for_label(mother_container, "Occupation"),
-                qualification=_ProfilePageHandler._find_value_for_label(mother_container, "Qualification"),
-                designation=_ProfilePageHandler._find_value_for_label(mother_container, "Designation"),
-                employer=_ProfilePageHandler._find_value_for_label(mother_container, "Employer"),
+                name=value(mother_values, "Mother Name"),
+                mobile=value(mother_values, "Mobile"),
+                email=value(mother_values, "Email"),
+                occupation=value(mother_values, "Occupation"),
+                qualification=value(mother_values, "Qualification"),
+                designation=value(mother_values, "Designation"),
+                employer=value(mother_values, "Employer"),
             ),
         )
 
         # Address Details
-        address_container = soup.find("h4", string="Address").find_next("div")
+        address_values = _ProfilePageHandler._label_values(headings["Address"].find_next("div"))
         address = AddressDetails(
-            present=_ProfilePageHandler._find_value_for_label(address_container, "Present Address"),
-            permanent=_ProfilePageHandler._find_value_for_label(address_container, "Permanent Address"),
+            present=value(address_values, "Present Address"),
+            permanent=value(address_values, "Permanent Address"),
         )
 
         return Profile(
@@ -145,14 +212,21 @@ class _ProfilePageHandler:
         )
 
     @staticmethod
-    async def _get(session: httpx.AsyncClient) -> Profile:
-        """Fetches and parses the user's profile page.
+    def _parse(content: bytes, include_image: bool = True) -> Profile:
+        """Parses the raw profile page into a Profile object.
 
         Args:
-            session (httpx.AsyncClient): An authenticated HTTP client session.
+            content (bytes): The body of the profile page.
+            include_image (bool): Whether to copy the base64 profile photo into `PersonalDetails.image`.
 
         Returns:
-            Profile: A Profile object containing the user's profile information.
+            Profile: A Profile object containing personal, parent, and address details.
+        """
+        return _ProfilePageHandler._parse_profile_soup(_parse_html(content), include_image)
+
+    @staticmethod
+    async def _fetch(session: httpx.AsyncClient) -> httpx.Response:
+        """Fetches the user's profile page.
 
         Raises:
             httpx.HTTPStatusError: If the request to fetch the profile page fails.
@@ -162,6 +236,38 @@ class _ProfilePageHandler:
         )
         response = await session.get(constants.PAGES_BASE_URL, params=params)
         response.raise_for_status()
+        return response
+
+    @staticmethod
+    async def _get(session: httpx.AsyncClient, include_image: bool = True) -> Profile:
+        """Fetches and parses the user's profile page.
+
+        Args:
+            session (httpx.AsyncClient): An authenticated HTTP client session.
+            include_image (bool): Whether to copy the base64 profile photo into `PersonalDetails.image`.
+
+        Returns:
+            Profile: A Profile object containing the user's profile information.
+
+        Raises:
+            httpx.HTTPStatusError: If the request to fetch the profile page fails.
+        """
+        response = await _ProfilePageHandler._fetch(session)
+        # The page embeds the photo, which the process-wide parse memo should not keep
+        return await _run_parse(_ProfilePageHandler._parse, response.content, include_image, memoize=False)
+
+    @staticmethod
+    async def _get_image(session: httpx.AsyncClient) -> bytes | None:
+        """Fetches the user's profile photo.
+
+        Args:
+            session (httpx.AsyncClient): An authenticated HTTP client session.
+
+        Returns:
+            Optional[bytes]: The JPEG image, or None if the user has no photo.
 
-        soup = BeautifulSoup(response.text, "lxml")
-        return _ProfilePageHandler._parse_profile_soup(soup)
+        Raises:
+            httpx.HTTPStatusError: If the request to fetch the profile page fails.
+        """
+        response = await _ProfilePageHandler._fetch(session)
+        return await _run_parse(_ProfilePageHandler._extract_image, response.content, memoize=False)
@@ -1,10 +1,10 @@
 """This module handles fetching and parsing the seating information page from the PESU Academy website.."""
 
 import httpx
-from bs4 import BeautifulSoup
 
 from pesuacademy import constants
 from pesuacademy.models import SeatingInformation
+from pesuacademy.parsers import _parse_html, _run_parse
 from pesuacademy.util import _build_params
 
 
@@ -28,19 +28,31 @@ class _SeatingInformationHandler:
         response = await session.get(constants.PAGES_BASE_URL, params=params)
         response.raise_for_status()
 
-        if "No Test Seating Info is available" in response.text:  # Check if no seating info is available
+        return await _run_parse(_SeatingInformationHandler._parse, response.content)
+
+    @staticmethod
+    def _parse(content: bytes) -> list[SeatingInformation]:
+        """Parses the seating information page.
+
+        Args:
+            content (bytes): The body of the seating information page.
+
+        Returns:
+            List[SeatingInformation]: A list of SeatingInformation objects containing the seating details.
+        """
+        if b"No Test Seating Info is available" in content:  # Check if no seating info is available
             return []
 
-        soup = BeautifulSoup(response.text, "lxml")
-        info_table = soup.find("table", id="seatinginfo")
+        document = _parse_html(content)
+        info_table = document.css_first("table#seatinginfo")
         if not info_table:
             return []
 
         # Parse the seating information data
         # The table structure is assumed to have columns: Name, Course Code, Date, Time, Terminal, Block
         seating_info = []
-        for row in info_table.find("tbody").find_all("tr"):
-            cols = [c.text.strip() for c in row.find_all("td")]
+        for row in info_table.css_first("tbody").css("tr"):
+            cols = [c.text.strip() for c in row.css("td")]
             if len(cols) >= constants.SEATING_INFO_EXPECTED_COLUMNS:
                 seating_info.append(
                     SeatingInformation(
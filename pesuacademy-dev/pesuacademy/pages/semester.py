@@ -4,9 +4,9 @@ import datetime
 import re
 
 import httpx
-from bs4 import BeautifulSoup
 
 from pesuacademy import constants
+from pesuacademy.parsers import _parse_html, _run_parse
 
 
 class _SemesterHandler:
@@ -29,8 +29,23 @@ class _SemesterHandler:
         response = await session.get(constants.SEMESTER_BASE_URL, params=params)
         response.raise_for_status()
 
-        soup = BeautifulSoup(response.text, "lxml")
-        options = soup.find_all("option")
+        return await _run_parse(_SemesterHandler._parse, response.content)
+
+    @staticmethod
+    def _parse(content: bytes) -> dict[int, str]:
+        """Parses the semester dropdown into semester numbers and IDs.
+
+        Args:
+            content (bytes): The body of the semester endpoint.
+
+        Returns:
+            dict[int, str]: A dictionary mapping semester numbers to their corresponding IDs.
+
+        Raises:
+            Exception: If the semester data cannot be parsed correctly.
+        """
+        document = _parse_html(content)
+        options = document.css("option")
 
         if not options:
             raise Exception("Failed to fetch semester data from the endpoint.")
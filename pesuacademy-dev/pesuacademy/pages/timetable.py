@@ -1,15 +1,28 @@
 """This module handles the scraping of the timetable from the PESU Academy website."""
 
+import functools
 import json
 import re
-from datetime import datetime
+from datetime import datetime, time
 
 import httpx
 
 from pesuacademy import constants
 from pesuacademy.models import ClassSession, Slot, Time, Timetable
+from pesuacademy.parsers import _run_parse
 from pesuacademy.util import _build_params
 
+# Both JSON blobs of the page, found in a single scan
+_JSON_PATTERN = re.compile(r"var (timeTableTemplateDetailsJson|timeTableJson)=([^;]+);")
+# Subject code and name, e.g. "UE24CS151B (LAB)-Subject Name" or "UE24CS151B-Subject Name"
+_SUBJECT_PATTERN = re.compile(r"([A-Z0-9]+(?:\s*\(LAB\))?)\s*-\s*(.*)")
+
+
+@functools.lru_cache(maxsize=128)
+def _parse_clock(value: str) -> time:
+    """Parses a template time such as "09:45:00 AM". The same few times repeat across slots and pages."""
+    return datetime.strptime(value, "%I:%M:%S %p").time()
+
 
 class _TimetablePageHandler:
     @staticmethod
@@ -30,50 +43,79 @@ class _TimetablePageHandler:
         response = await session.get(constants.PAGES_BASE_URL, params=params)
         response.raise_for_status()
 
-        html_content = response.text
-        template_data, class_data = _TimetablePageHandler._extract_json_data(html_content)
-        time_slots_info, ordered_slots = _TimetablePageHandler._process_template(template_data)
+        return await _run_parse(_TimetablePageHandler._parse, response.text)
+
+    @staticmethod
+    def _parse(html_content: str) -> Timetable:
+        """Extracts the JSON data of the timetable page and reconstructs the weekly time_slots.
+
+        Args:
+            html_content (str): The source of the timetable page.
+
+        Returns:
+            Timetable: An object containing the reconstructed weekly time_slots.
+
+        Raises:
+            ValueError: If the JSON data cannot be found or parsed.
+        """
+        template_json, class_json = _TimetablePageHandler._extract_json_blobs(html_content)
+        time_slots_info, ordered_slots = _TimetablePageHandler._section_template(template_json)
+        class_data = json.loads(class_json)
 
         schedule_by_day = _TimetablePageHandler._build_schedule_by_day(time_slots_info, ordered_slots, class_data)
         return Timetable(days=schedule_by_day)
 
+    @staticmethod
+    def _extract_json_blobs(html_content: str) -> tuple[str, str]:
+        """Finds the two JSON blobs of the page source: the time slots template and the timetable data."""
+        blobs: dict[str, str] = {}
+        for match in _JSON_PATTERN.finditer(html_content):
+            blobs.setdefault(match.group(1), match.group(2))
+            if len(blobs) == 2:
+                break
+
+        if len(blobs) < 2:
+            raise ValueError("Could not find timetable JSON data in the page source.")
+        return blobs["timeTableTemplateDetailsJson"], blobs["timeTableJson"]
+
     @staticmethod
     def _extract_json_data(html_content: str) -> tuple[dict, dict]:
         """Extracts the JSON data from the page source into two dictionaries: template_data and class_data."""
-        template_match = re.search(r"var timeTableTemplateDetailsJson=([^;]+);", html_content)
-        data_match = re.search(r"var timeTableJson=([^;]+);", html_content)
-
-        if not template_match or not data_match:
-            raise ValueError("Could not find timetable JSON data in the page source.")
+        template_json, class_json = _TimetablePageHandler._extract_json_blobs(html_content)
         # template_data holds the time slots template
         # class_data holds the actual timetable data
-        template_data = json.loads(template_match.group(1))
-        class_data = json.loads(data_match.group(1))
-        return template_data, class_data
+        return json.loads(template_json), json.loads(class_json)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=64)
+    def _section_template(template_json: str) -> tuple[dict[int, dict], list[int]]:
+        """Processes a time slots template, keyed by its JSON.
+
+        The template is the same for a whole section, so it is processed once for every student of the section. The
+        result is shared and must not be modified.
+        """
+        return _TimetablePageHandler._process_template(json.loads(template_json))
 
     @staticmethod
     def _process_template(template_data: dict) -> tuple[dict[int, dict], list[int]]:
         """Processes the template data to extract time slots and their order, including breaks."""
         time_slots_info: dict[int, dict] = {}
-        ordered_slots: list[int] = []
 
         for slot in template_data:
             order = slot["orderedBy"]
-            start_time = datetime.strptime(slot["startTime"], "%I:%M:%S %p")
-            end_time = datetime.strptime(slot["endTime"], "%I:%M:%S %p")
-            duration = int((end_time - start_time).total_seconds() // 60)
+            start_time = _parse_clock(slot["startTime"])
+            end_time = _parse_clock(slot["endTime"])
+            duration = (end_time.hour * 60 + end_time.minute) - (start_time.hour * 60 + start_time.minute)
 
             # Check the status: 1 means it's a break, 0 is a class
             is_break = slot.get("timeTableTemplateDetailsStatus") == 1
-            time_obj = Time(start=start_time.time(), end=end_time.time(), duration=duration)
+            time_obj = Time(start=start_time, end=end_time, duration=duration)
             time_slots_info[order] = {
                 "time": time_obj,
                 "is_break": is_break,
             }
-            if order not in ordered_slots:
-                ordered_slots.append(order)
 
-        ordered_slots.sort()
+        ordered_slots = sorted(time_slots_info)
         return time_slots_info, ordered_slots
 
     @staticmethod
@@ -103,7 +145,7 @@ class _TimetablePageHandler:
                         subject_full = details[0].split("_&&")[-1]
                         # Use regex to extract subject code and name while handling optional "(LAB)" suffix
                         # Subject code can be in the format "UE24CS151B (LAB)" or "UE24CS151B"
-                        code_match = re.match(r"([A-Z0-9]+(?:\s*\(LAB\))?)\s*-\s*(.*)", subject_full)
+                        code_match = _SUBJECT_PATTERN.match(subject_full)
                         if code_match:
                             subject_code, subject_name = code_match.groups()
                         else:
@@ -3,10 +3,10 @@
 import re
 
 import httpx
-from bs4 import BeautifulSoup
 
 from pesuacademy import constants
 from pesuacademy.models import Topic
+from pesuacademy.parsers import _parse_html, _run_parse
 from pesuacademy.util import _build_params
 
 
@@ -29,15 +29,27 @@ class _UnitPageHandler:
         response = await session.get(constants.PAGES_BASE_URL, params=params)
         response.raise_for_status()
 
-        soup = BeautifulSoup(response.text, "lxml")
+        return await _run_parse(_UnitPageHandler._parse, response.content)
+
+    @staticmethod
+    def _parse(content: bytes) -> list[Topic]:
+        """Parses the list of topics of a unit and their required IDs.
+
+        Args:
+            content (bytes): The body of the unit page.
+
+        Returns:
+            List[Topic]: A list of Topic objects containing the scraped data.
+        """
+        document = _parse_html(content)
 
         # Find the topics table
-        table = soup.find("table", class_="table-bordered")
+        table = document.css_first("table.table-bordered")
         if not table:
             return []
 
         topics = []
-        for row in table.find("tbody").find_all("tr"):
+        for row in table.css_first("tbody").css("tr"):
             onclick_attr = row.get("onclick")
             if not onclick_attr:
                 continue
@@ -53,7 +65,7 @@ class _UnitPageHandler:
             # The MaterialLinksHandler needs only these 3 ids to fetch the material links
             topic_id, course_id, scraped_unit_id = match.groups()
 
-            title_tag = row.find("span", class_="short-title")
+            title_tag = row.css_first("span.short-title")
             if not title_tag:
                 continue
             # Get the title of the topic, defaulting to "Untitled Topic" if not found
@@ -0,0 +1,72 @@
+"""Pluggable HTML parser engines used by the page handlers."""
+
+import os
+from collections.abc import Callable
+
+from pesuacademy.metrics import _time_parse
+
+from .base import _HTMLNode
+from .lexbor import _parse_with_lexbor
+from .memo import ParseMemo, get_parse_memo, set_parse_memo
+from .offload import _run_parse, get_parse_executor, parse_executor_status, set_parse_executor
+from .soup import _parse_with_soup
+
+_ENGINES: dict[str, Callable[[bytes], _HTMLNode]] = {
+    "lexbor": _parse_with_lexbor,
+    "bs4": _parse_with_soup,
+}
+_DEFAULT_ENGINE = "lexbor"
+
+_engine = os.environ.get("PESUACADEMY_PARSER", _DEFAULT_ENGINE)
+if _engine not in _ENGINES:
+    _engine = _DEFAULT_ENGINE
+
+
+def set_parser_engine(engine: str) -> None:
+    """Selects the HTML parser engine used by all page handlers.
+
+    The default engine can also be chosen with the PESUACADEMY_PARSER environment variable.
+
+    Args:
+        engine (str): "lexbor" for selectolax's Lexbor backend (the default) or "bs4" for BeautifulSoup with lxml.
+
+    Raises:
+        ValueError: If the engine is unknown.
+    """
+    global _engine
+    if engine not in _ENGINES:
+        raise ValueError(f"Unknown parser engine: {engine}. Available: {list(_ENGINES)}")
+    _engine = engine
+
+
+def get_parser_engine() -> str:
+    """Returns the name of the HTML parser engine currently in use."""
+    return _engine
+
+
+def _parse_html(content: bytes, engine: str | None = None) -> _HTMLNode:
+    """Parses raw HTML bytes into a document node with the selected engine.
+
+    Args:
+        content (bytes): The raw response body. It is handed to the engine without decoding it first.
+        engine (Optional[str]): Overrides the globally selected engine for this document.
+
+    Returns:
+        _HTMLNode: The root node of the parsed document.
+    """
+    return _time_parse(_ENGINES[engine or _engine], content)
+
+
+__all__ = [
+    "ParseMemo",
+    "_HTMLNode",
+    "_parse_html",
+    "_run_parse",
+    "get_parse_executor",
+    "get_parse_memo",
+    "get_parser_engine",
+    "parse_executor_status",
+    "set_parse_executor",
+    "set_parse_memo",
+    "set_parser_engine",
+]
@@ -0,0 +1,77 @@
+"""Engine-independent interface over parsed HTML documents."""
+
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from typing import Self
+
+
+class _HTMLNode(ABC):
+    """An element of a parsed HTML document.
+
+    Page handlers only talk to this interface, so the same parsing code runs on every parser engine. Text is always
+    returned the way BeautifulSoup's `.text` returns it: the concatenation of all descendant text nodes, excluding
+    comments and the contents of `<script>`, `<style>` and `<template>` elements.
+    """
+
+    @property
+    @abstractmethod
+    def tag(self) -> str:
+        """The lowercase tag name of the element."""
+
+    @property
+    @abstractmethod
+    def text(self) -> str:
+        """The concatenated text of all descendant text nodes."""
+
+    @property
+    @abstractmethod
+    def string(self) -> str | None:
+        """The element's only string, following single-child elements downwards, like BeautifulSoup's `.string`."""
+
+    @abstractmethod
+    def get(self, name: str, default: str | None = None) -> str | None:
+        """Returns the value of an attribute, or `default` if the element does not have it."""
+
+    @abstractmethod
+    def css(self, selector: str) -> list[Self]:
+        """Returns all descendants matching a CSS selector, in document order."""
+
+    @abstractmethod
+    def css_first(self, selector: str) -> Self | None:
+        """Returns the first descendant matching a CSS selector, or None."""
+
+    @abstractmethod
+    def contents(self) -> list[Self | str]:
+        """Returns the direct children of the element. Text nodes are returned as plain strings."""
+
+    @abstractmethod
+    def next_sibling(self) -> Self | str | None:
+        """Returns the node immediately following the element, as a plain string if it is a text node."""
+
+    @abstractmethod
+    def find_next(self, tag: str, class_: str | None = None) -> Self | None:
+        """Returns the first element after this one in document order with the given tag and class."""
+
+    @abstractmethod
+    def find_next_sibling(self, tag: str) -> Self | None:
+        """Returns the first following sibling element with the given tag."""
+
+    @abstractmethod
+    def text_skipping(self, skip: Callable[[Self], bool]) -> str:
+        """Returns the element's text, leaving out every descendant subtree for which `skip` returns True."""
+
+    def has_attr(self, name: str) -> bool:
+        """Checks whether the element has an attribute."""
+        return self.get(name) is not None
+
+    def has_class(self, class_: str) -> bool:
+        """Checks whether the element has a CSS class."""
+        return class_ in (self.get("class") or "").split()
+
+    def children(self) -> list[Self]:
+        """Returns the direct child elements of the element, without text nodes."""
+        return [child for child in self.contents() if not isinstance(child, str)]
+
+    def _matches(self, tag: str, class_: str | None) -> bool:
+        """Checks an element against a tag name and an optional CSS class."""
+        return self.tag == tag and (class_ is None or self.has_class(class_))
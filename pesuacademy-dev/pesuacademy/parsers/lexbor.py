@@ -0,0 +1,151 @@
+"""selectolax (Lexbor) implementation of the HTML node interface."""
+
+from collections.abc import Callable
+
+from selectolax.lexbor import LexborHTMLParser, LexborNode
+
+from pesuacademy.parsers.base import _HTMLNode
+
+_TEXT_NODE = "-text"
+# Elements whose text BeautifulSoup's `.text` leaves out
+_EXCLUDED_TAGS = frozenset({"script", "style", "template"})
+_EXCLUDED_SELECTOR = ", ".join(sorted(_EXCLUDED_TAGS))
+
+
+class _LexborNode(_HTMLNode):
+    """Wraps a selectolax `LexborNode`."""
+
+    __slots__ = ("_node",)
+
+    def __init__(self, node: LexborNode) -> None:
+        """Initializes the wrapper around a selectolax node."""
+        self._node = node
+
+    @staticmethod
+    def _wrap(node: LexborNode | None) -> "_LexborNode | str | None":
+        """Wraps elements and converts text nodes to plain strings. Comments and other nodes yield None."""
+        if node is None:
+            return None
+        if node.tag == _TEXT_NODE:
+            return node.text_content or ""
+        if node.tag.startswith("-") or node.tag.startswith("_"):
+            return None
+        return _LexborNode(node)
+
+    @property
+    def tag(self) -> str:
+        """The lowercase tag name of the element."""
+        return self._node.tag
+
+    @property
+    def text(self) -> str:
+        """The concatenated text of all descendant text nodes."""
+        if self._node.css_first(_EXCLUDED_SELECTOR) is None:
+            # Fast path: nothing to leave out, let Lexbor concatenate the text natively
+            return self._node.text(deep=True)
+        return self.text_skipping(lambda node: False)
+
+    @property
+    def string(self) -> str | None:
+        """The element's only string, following single-child elements downwards."""
+        node = self._node
+        while True:
+            child = node.child
+            if child is None or child.next is not None:
+                return None
+            if child.tag == _TEXT_NODE:
+                return None if node.tag in _EXCLUDED_TAGS else child.text_content
+            if child.tag.startswith("-") or child.tag.startswith("_"):
+                return None
+            node = child
+
+    def get(self, name: str, default: str | None = None) -> str | None:
+        """Returns the value of an attribute, or `default` if the element does not have it."""
+        attributes = self._node.attributes
+        if name not in attributes:
+            return default
+        # Valueless attributes (e.g. <input disabled>) are reported as None by selectolax
+        value = attributes[name]
+        return value if value is not None else ""
+
+    def css(self, selector: str) -> list["_LexborNode"]:
+        """Returns all descendants matching a CSS selector, in document order."""
+        return [_LexborNode(node) for node in self._node.css(selector)]
+
+    def css_first(self, selector: str) -> "_LexborNode | None":
+        """Returns the first descendant matching a CSS selector, or None."""
+        node = self._node.css_first(selector)
+        return _LexborNode(node) if node is not None else None
+
+    def contents(self) -> list["_LexborNode | str"]:
+        """Returns the direct children of the element. Text nodes are returned as plain strings."""
+        contents = []
+        child = self._node.child
+        while child is not None:
+            wrapped = self._wrap(child)
+            if wrapped is not None:
+                contents.append(wrapped)
+            child = child.next
+        return contents
+
+    def next_sibling(self) -> "_LexborNode | str | None":
+        """Returns the node immediately following the element, as a plain string if it is a text node."""
+        sibling = self._node.next
+        # Comments are skipped so that the result matches the other engines
+        while sibling is not None and sibling.tag == "-comment":
+            sibling = sibling.next
+        return self._wrap(sibling)
+
+    def find_next(self, tag: str, class_: str | None = None) -> "_LexborNode | None":
+        """Returns the first element after this one in document order with the given tag and class."""
+        node = self._node
+        while node is not None:
+            # Descend first, then move to the next sibling of the nearest ancestor that has one
+            if node.child is not None:
+                node = node.child
+            else:
+                while node is not None and node.next is None:
+                    node = node.parent
+                if node is None:
+                    return None
+                node = node.next
+            if node.tag == tag:
+                candidate = _LexborNode(node)
+                if candidate._matches(tag, class_):
+                    return candidate
+        return None
+
+    def find_next_sibling(self, tag: str) -> "_LexborNode | None":
+        """Returns the first following sibling element with the given tag."""
+        sibling = self._node.next
+        while sibling is not None:
+            if sibling.tag == tag:
+                return _LexborNode(sibling)
+            sibling = sibling.next
+        return None
+
+    def text_skipping(self, skip: Callable[["_LexborNode"], bool]) -> str:
+        """Returns the element's text, leaving out every descendant subtree for which `skip` returns True."""
+        parts: list[str] = []
+        stack: list[LexborNode] = []
+        child = self._node.last_child
+        while child is not None:
+            stack.append(child)
+            child = child.prev
+        while stack:
+            node = stack.pop()
+            if node.tag == _TEXT_NODE:
+                parts.append(node.text_content or "")
+                continue
+            if node.tag.startswith("-") or node.tag in _EXCLUDED_TAGS or skip(_LexborNode(node)):
+                continue
+            child = node.last_child
+            while child is not None:
+                stack.append(child)
+                child = child.prev
+        return "".join(parts)
+
+
+def _parse_with_lexbor(content: bytes) -> _LexborNode:
+    """Parses an HTML document with selectolax's Lexbor backend."""
+    return _LexborNode(LexborHTMLParser(content).root)
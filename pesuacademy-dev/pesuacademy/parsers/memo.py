@@ -0,0 +1,112 @@
+"""Reusing the models parsed from a page when the same page is fetched again."""
+
+import copy
+import hashlib
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any
+
+
+class ParseMemo:
+    """An in-process LRU store of parsed pages, keyed by the page handler, the parser engine and a hash of the raw page.
+
+    Most refreshes fetch byte-identical pages: the timetable, the course lists, unit and topic pages, and results
+    outside result season. When a page handler is handed a page whose hash it has seen before (with the same
+    arguments), the models parsed from it then are returned instead of parsing it again, so an unchanged page costs
+    a hash and a dictionary lookup.
+
+    Every caller gets its own deep copy of the models, so callers may modify them freely. Pages are only hashed, never
+    stored. Page handlers leave pages with personal data that is costly to hold, such as the profile photo, out of
+    the memo.
+    """
+
+    def __init__(self, max_entries: int = 512) -> None:
+        """Initializes an empty memo.
+
+        Args:
+            max_entries (int): Maximum number of parsed pages kept. The least recently used one is evicted first.
+        """
+        self._max_entries = max_entries
+        self._entries: OrderedDict[Hashable, object] = OrderedDict()
+        self._hits: dict[str, int] = {}
+        self._misses: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        """Returns the number of parsed pages currently kept."""
+        return len(self._entries)
+
+    @staticmethod
+    def _key(parse: Callable[..., Any], content: bytes | str, args: tuple[Any, ...]) -> Hashable | None:
+        """Returns the key of a page parsed with some arguments, or None if the arguments cannot be hashed."""
+        from pesuacademy.parsers import get_parser_engine
+
+        digest = hashlib.blake2b(content.encode() if isinstance(content, str) else content, digest_size=16).digest()
+        key = (parse.__qualname__, get_parser_engine(), digest, args)
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def _get(self, key: Hashable, endpoint: str) -> tuple[bool, Any]:
+        """Returns whether the page was parsed before and, if so, a copy of its models."""
+        try:
+            result = self._entries[key]
+        except KeyError:
+            self._misses[endpoint] = self._misses.get(endpoint, 0) + 1
+            return False, None
+        self._entries.move_to_end(key)
+        self._hits[endpoint] = self._hits.get(endpoint, 0) + 1
+        return True, copy.deepcopy(result)
+
+    def _set(self, key: Hashable, result: object) -> None:
+        """Keeps a copy of the models parsed from a page, so that the caller may modify the original."""
+        self._entries[key] = copy.deepcopy(result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Forgets every parsed page and resets the hit counts."""
+        self._entries.clear()
+        self._hits.clear()
+        self._misses.clear()
+
+    def status(self) -> dict[str, object]:
+        """Returns the size of the memo and how often pages were reused, overall and per page handler.
+
+        Hit rates are the share of parsed pages whose models were reused, between 0 and 1.
+        """
+
+        def rates(hits: int, misses: int) -> dict[str, float]:
+            return {"hits": hits, "misses": misses, "hit_rate": hits / (hits + misses) if hits + misses else 0.0}
+
+        endpoints = sorted(self._hits.keys() | self._misses.keys())
+        return {
+            "entries": len(self._entries),
+            "max_entries": self._max_entries,
+            **rates(sum(self._hits.values()), sum(self._misses.values())),
+            "endpoints": {
+                endpoint: rates(self._hits.get(endpoint, 0), self._misses.get(endpoint, 0)) for endpoint in endpoints
+            },
+        }
+
+
+_memo: ParseMemo | None = ParseMemo()
+
+
+def set_parse_memo(memo: ParseMemo | None) -> None:
+    """Selects where all page handlers keep the models of the pages they parsed, to reuse them for identical pages.
+
+    A `ParseMemo` with the default size is used unless another one is set here.
+
+    Args:
+        memo (Optional[ParseMemo]): The memo to use. None parses every page, even if it is unchanged.
+    """
+    global _memo
+    _memo = memo
+
+
+def get_parse_memo() -> ParseMemo | None:
+    """Returns the memo parsed pages are kept in, or None if every page is parsed."""
+    return _memo
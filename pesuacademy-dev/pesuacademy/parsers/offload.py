@@ -0,0 +1,160 @@
+"""Running the parse phase of page handlers in an executor instead of on the event loop."""
+
+import asyncio
+import concurrent.futures
+import time
+from collections.abc import Callable
+
+from pesuacademy.metrics import _page_timings, _PageTimings
+
+from .memo import get_parse_memo
+
+# Pages smaller than this are parsed on the event loop: handing them to a worker would cost more than parsing them
+DEFAULT_MIN_BYTES = 16_384
+
+
+class _ParseOffload:
+    """The executor that parses pages, and its counters."""
+
+    def __init__(self, executor: concurrent.futures.Executor, min_bytes: int) -> None:
+        self.executor = executor
+        self.min_bytes = min_bytes
+        self.pending = 0
+        self.submitted = 0
+        self.inline = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.total_parse = 0.0
+
+
+_offload: _ParseOffload | None = None
+
+
+def set_parse_executor(executor: concurrent.futures.Executor | None, min_bytes: int = DEFAULT_MIN_BYTES) -> None:
+    """Selects where all page handlers parse the pages they fetch.
+
+    By default pages are parsed on the event loop, so while a large page is parsed no other request of any session
+    on that loop makes progress, and the pages of a multi-semester fetch are parsed one after another. With an
+    executor, each page is parsed in a worker while the loop keeps serving other requests:
+
+    - A `concurrent.futures.ThreadPoolExecutor` keeps the loop responsive and runs parsers that release the GIL in
+      parallel.
+    - A `concurrent.futures.ProcessPoolExecutor` parses pages in parallel on all cores. The raw page is sent to the
+      worker and the models are sent back, which costs a little more per page.
+
+    The executor is not shut down by the package.
+
+    Args:
+        executor (Optional[concurrent.futures.Executor]): The executor to parse in. None parses on the event loop.
+        min_bytes (int): Pages smaller than this are still parsed on the event loop.
+    """
+    global _offload
+    _offload = _ParseOffload(executor, min_bytes) if executor is not None else None
+
+
+def get_parse_executor() -> concurrent.futures.Executor | None:
+    """Returns the executor pages are parsed in, or None if they are parsed on the event loop."""
+    return _offload.executor if _offload is not None else None
+
+
+def parse_executor_status() -> dict[str, object]:
+    """Returns the size, backlog and wait times of the parse executor, e.g. to export them to a monitoring system.
+
+    Wait times are in seconds, from the moment a page was handed to the executor until a worker started parsing it.
+    """
+    if _offload is None:
+        return {"executor": None}
+    parsed = _offload.submitted - _offload.pending
+    return {
+        "executor": type(_offload.executor).__name__,
+        "max_workers": getattr(_offload.executor, "_max_workers", None),
+        "min_bytes": _offload.min_bytes,
+        "pending": _offload.pending,
+        "submitted": _offload.submitted,
+        "inline": _offload.inline,
+        "mean_wait": _offload.total_wait / parsed if parsed else 0.0,
+        "max_wait": _offload.max_wait,
+        "mean_parse": _offload.total_parse / parsed if parsed else 0.0,
+    }
+
+
+def _parse_in_worker[T](
+    parse: Callable[..., T], engine: str, submitted_at: float, *args: object
+) -> tuple[T, float, float, float]:
+    """Runs a parse in a worker thread or process.
+
+    Returns:
+        Tuple: The result, when the parse started, how long it took in total and how long HTML parsing took.
+    """
+    from pesuacademy.parsers import get_parser_engine, set_parser_engine
+
+    started = time.monotonic()
+    # A worker process does not inherit the engine selected in the parent
+    if get_parser_engine() != engine:
+        set_parser_engine(engine)
+    timings = _PageTimings()
+    token = _page_timings.set(timings)
+    try:
+        result = parse(*args)
+    finally:
+        _page_timings.reset(token)
+    return result, started - submitted_at, time.monotonic() - started, timings.parse
+
+
+async def _run_parse[T](parse: Callable[..., T], content: bytes | str, *args: object, memoize: bool = True) -> T:
+    """Runs the parse phase of a page handler in the parse executor, or on the event loop if there is none.
+
+    If the parse memo holds the models of an identical page parsed with the same arguments, a copy of them is returned
+    without parsing the page again.
+
+    Args:
+        parse (Callable[..., T]): A module-level function or static method, so that it can be sent to a process.
+        content (bytes | str): The page to parse, passed to `parse` as its first argument.
+        *args: Further arguments of `parse`.
+        memoize (bool): Whether the parse memo may keep the models. False for pages with personal data that is costly
+            to hold, such as the profile photo.
+
+    Returns:
+        T: What `parse` returns.
+    """
+    memo = get_parse_memo()
+    key = memo._key(parse, content, args) if memo is not None and memoize else None
+    if key is not None:
+        page = _page_timings.get()
+        found, result = memo._get(key, parse.__qualname__.removesuffix("._parse"))
+        if page is not None:
+            page.memo = "hit" if found else "miss"
+        if found:
+            return result
+    result = await _offload_parse(parse, content, *args)
+    if key is not None:
+        memo._set(key, result)
+    return result
+
+
+async def _offload_parse[T](parse: Callable[..., T], content: bytes | str, *args: object) -> T:
+    """Parses a page in the parse executor, or on the event loop if there is none or the page is small."""
+    offload = _offload
+    if offload is None or len(content) < offload.min_bytes:
+        if offload is not None:
+            offload.inline += 1
+        return parse(content, *args)
+
+    from pesuacademy.parsers import get_parser_engine
+
+    offload.pending += 1
+    offload.submitted += 1
+    try:
+        result, waited, elapsed, html_parse = await asyncio.get_running_loop().run_in_executor(
+            offload.executor, _parse_in_worker, parse, get_parser_engine(), time.monotonic(), content, *args
+        )
+    finally:
+        offload.pending -= 1
+    offload.total_wait += waited
+    offload.max_wait = max(offload.max_wait, waited)
+    offload.total_parse += elapsed
+    page = _page_timings.get()
+    if page is not None:
+        page.parse += html_parse
+        page.queued += waited
+    return result
@@ -0,0 +1,103 @@
+"""BeautifulSoup implementation of the HTML node interface."""
+
+from collections.abc import Callable
+
+from bs4 import BeautifulSoup, NavigableString, Tag
+from bs4.element import Comment, Script, Stylesheet, TemplateString
+
+from pesuacademy.parsers.base import _HTMLNode
+
+# String types that BeautifulSoup's `.text` leaves out
+_EXCLUDED_STRINGS = (Comment, Script, Stylesheet, TemplateString)
+
+
+class _SoupNode(_HTMLNode):
+    """Wraps a BeautifulSoup `Tag`."""
+
+    __slots__ = ("_tag",)
+
+    def __init__(self, tag: Tag) -> None:
+        """Initializes the wrapper around a BeautifulSoup tag."""
+        self._tag = tag
+
+    @staticmethod
+    def _wrap(node: object) -> "_SoupNode | str | None":
+        """Wraps tags and converts text nodes to plain strings."""
+        if isinstance(node, Tag):
+            return _SoupNode(node)
+        if isinstance(node, NavigableString):
+            return str(node)
+        return None
+
+    @property
+    def tag(self) -> str:
+        """The lowercase tag name of the element."""
+        return self._tag.name
+
+    @property
+    def text(self) -> str:
+        """The concatenated text of all descendant text nodes."""
+        return self._tag.get_text()
+
+    @property
+    def string(self) -> str | None:
+        """The element's only string, following single-child elements downwards."""
+        string = self._tag.string
+        return None if string is None or isinstance(string, _EXCLUDED_STRINGS) else str(string)
+
+    def get(self, name: str, default: str | None = None) -> str | None:
+        """Returns the value of an attribute, or `default` if the element does not have it."""
+        value = self._tag.get(name)
+        if value is None:
+            return default
+        # Multi-valued attributes such as "class" are returned as lists by BeautifulSoup
+        return " ".join(value) if isinstance(value, list) else value
+
+    def css(self, selector: str) -> list["_SoupNode"]:
+        """Returns all descendants matching a CSS selector, in document order."""
+        return [_SoupNode(tag) for tag in self._tag.select(selector)]
+
+    def css_first(self, selector: str) -> "_SoupNode | None":
+        """Returns the first descendant matching a CSS selector, or None."""
+        tag = self._tag.select_one(selector)
+        return _SoupNode(tag) if tag is not None else None
+
+    def contents(self) -> list["_SoupNode | str"]:
+        """Returns the direct children of the element. Text nodes are returned as plain strings."""
+        return [
+            wrapped
+            for child in self._tag.contents
+            if not isinstance(child, Comment) and (wrapped := self._wrap(child)) is not None
+        ]
+
+    def next_sibling(self) -> "_SoupNode | str | None":
+        """Returns the node immediately following the element, as a plain string if it is a text node."""
+        return self._wrap(self._tag.next_sibling)
+
+    def find_next(self, tag: str, class_: str | None = None) -> "_SoupNode | None":
+        """Returns the first element after this one in document order with the given tag and class."""
+        found = self._tag.find_next(tag, class_=class_) if class_ else self._tag.find_next(tag)
+        return _SoupNode(found) if found is not None else None
+
+    def find_next_sibling(self, tag: str) -> "_SoupNode | None":
+        """Returns the first following sibling element with the given tag."""
+        found = self._tag.find_next_sibling(tag)
+        return _SoupNode(found) if found is not None else None
+
+    def text_skipping(self, skip: Callable[["_SoupNode"], bool]) -> str:
+        """Returns the element's text, leaving out every descendant subtree for which `skip` returns True."""
+        parts: list[str] = []
+        stack = list(reversed(self._tag.contents))
+        while stack:
+            node = stack.pop()
+            if isinstance(node, Tag):
+                if not skip(_SoupNode(node)):
+                    stack.extend(reversed(node.contents))
+            elif isinstance(node, NavigableString) and not isinstance(node, _EXCLUDED_STRINGS):
+                parts.append(str(node))
+        return "".join(parts)
+
+
+def _parse_with_soup(content: bytes) -> _SoupNode:
+    """Parses an HTML document with BeautifulSoup and lxml."""
+    return _SoupNode(BeautifulSoup(content, "lxml"))
@@ -1,24 +1,42 @@
 """PESU Academy API Client."""
 
+import datetime
 import os
+from collections.abc import AsyncIterator, Callable, Collection
+from pathlib import Path
+from typing import IO
 
 from dotenv import load_dotenv
 
+from pesuacademy.cache import ResponseCache, ResultsArchive, SharedCache, _bypass_cache
+
 # Import the core engine
 from pesuacademy.client import _PesuScraper
+from pesuacademy.history import AttendanceHistory
+from pesuacademy.metrics import Metrics
 
 # Import all Pydantic models to be used as return types for clarity
 from pesuacademy.models import (
     Announcement,
     Course,
+    CourseTree,
+    ExportedFile,
+    ExportReport,
     MaterialLink,
     Profile,
     SeatingInformation,
     SemesterResult,
+    Snapshot,
     Timetable,
     Topic,
+    TopicMaterials,
+    Transcript,
     Unit,
 )
+from pesuacademy.replay import Recording
+from pesuacademy.runner import BackgroundRunner, SyncPESUAcademy
+from pesuacademy.single_flight import SingleFlight
+from pesuacademy.transport import TransportConfig
 
 
 class PESUAcademy:
@@ -40,7 +58,20 @@ class PESUAcademy:
         self._client = client
 
     @classmethod
-    async def login(cls, username: str | None = None, password: str | None = None) -> "PESUAcademy":
+    async def login(
+        cls,
+        username: str | None = None,
+        password: str | None = None,
+        cache: ResponseCache | None = None,
+        prefetch_semesters: bool = True,
+        transport: TransportConfig | None = None,
+        base_url: str | None = None,
+        recording: Recording | None = None,
+        attendance_history: AttendanceHistory | None = None,
+        shared_flights: SingleFlight | None = None,
+        metrics: Metrics | None = None,
+        shared_cache: SharedCache | None = None,
+    ) -> "PESUAcademy":
         """Creates and returns an authenticated PESUAcademy session.
 
         Credentials can be passed as arguments or loaded from environment variables
@@ -49,6 +80,24 @@ class PESUAcademy:
         Args:
             username (Optional[str]): The user's login identifier.
             password (Optional[str]): The user's password.
+            cache (Optional[ResponseCache]): A response cache to serve repeated page requests from. Every method that
+                fetches data accepts `refresh=True` to skip cached responses. No caching is done if None.
+            prefetch_semesters (bool): Whether to start looking up the semester IDs in the background as soon as
+                the login succeeds. Either way, the login does not wait for them; they are resolved on first use.
+            transport (Optional[TransportConfig]): Timeouts, retries, connection limits, HTTP/2 and circuit breaker
+                settings of the session. Defaults to `TransportConfig()`.
+            base_url (Optional[str]): The URL of the Academy application, e.g. `StandInServer.url` to run against a
+                local stand-in. Defaults to PESU Academy itself.
+            recording (Optional[Recording]): If given, every response of the session is recorded into it, to be
+                replayed offline later.
+            attendance_history (Optional[AttendanceHistory]): If given, every attendance fetched by the session is
+                recorded into it.
+            shared_flights (Optional[SingleFlight]): If given, concurrent requests for course content that is the same
+                for every user (units, topics and material links) share one request with other sessions using it.
+            metrics (Optional[Metrics]): If given, the latency, size, parse time, cache outcome and errors of every
+                request and page fetch of the session are measured into it.
+            shared_cache (Optional[SharedCache]): A cache for course content that is the same for every user (units,
+                topics and material links), so that it is fetched once for all sessions using it instead of per user.
         """
         load_dotenv()  # Load environment variables from .env file
         uname = username or os.environ.get("PESU_USERNAME")
@@ -60,136 +109,434 @@ class PESUAcademy:
                 "Pass them as arguments or set PESU_USERNAME and PESU_PASSWORD environment variables."
             )
 
-        client = _PesuScraper()
-        await client.login(uname, pword)
+        client = _PesuScraper(
+            cache, transport, base_url, recording, attendance_history, shared_flights, metrics, shared_cache
+        )
+        await client.login(uname, pword, prefetch_semesters)
         return cls(client)
 
-    async def get_profile(self) -> Profile:
+    @property
+    def login_elapsed(self) -> float | None:
+        """Time taken by the login, from the first request until the session was authenticated, in seconds."""
+        return self._client.login_elapsed
+
+    async def get_profile(self, refresh: bool = False, include_image: bool = True) -> Profile:
         """Fetches the student's detailed profile information.
 
         Args:
-            None
+            refresh (bool): If True, cached responses are ignored and replaced with fresh ones.
+            include_image (bool): Whether to include the base64 profile photo in `personal.image`. The photo is by
+                far the largest part of the profile; pass False and fetch it with `get_profile_image()` when needed.
 
         Returns:
             Profile: A Profile object containing personal, parent, and address details.
         """
-        return await self._client.get_profile()
+        with _bypass_cache(refresh):
+            return await self._client.get_profile(include_image)
+
+    async def get_profile_image(self, refresh: bool = False) -> bytes | None:
+        """Fetches the student's profile photo.
+
+        The photo is read straight from the profile page without parsing the rest of it, so with a response cache
+        this costs no extra request after `get_profile()`.
+
+        Args:
+            refresh (bool): If True, cached responses are ignored and replaced with fresh ones.
 
-    async def get_seating_info(self) -> list[SeatingInformation]:
+        Returns:
+            Optional[bytes]: The JPEG image, or None if the student has no photo.
+        """
+        with _bypass_cache(refresh):
+            return await self._client.get_profile_image()
+
+    async def get_seating_info(self, refresh: bool = False) -> list[SeatingInformation]:
         """Fetches upcoming exam seating arrangements.
 
         Args:
-            None
+            refresh (bool): If True, cached responses are ignored and replaced with fresh ones.
 
         Returns:
             A list of SeatingInformation objects containing seating details.
         """
-        return await self._client.get_seating_info()
+        with _bypass_cache(refresh):
+            return await self._client.get_seating_info()
 
-    async def get_courses(self, semester: int | None = None) -> dict[int, list[Course]]:
+    async def get_courses(self, semester: int | None = None, refresh: bool = False) -> dict[int, list[Course]]:
         """Fetches registered courses.
 
         Args:
             semester (Optional[int]): The semester number to fetch. If not provided,
                 courses for all available semesters are returned.
+            refresh (bool): If True, cached responses are ignored and replaced with fresh ones.
 
         Returns:
             A dictionary mapping semester numbers to lists of Course objects.
         """
-        return await self._client.get_courses(semester)
+        with _bypass_cache(refresh):
+            return await self._client.get_courses(semester)
 
-    async def get_attendance(self, semester: int | None = None) -> dict[int, list[Course]]:
+    async def get_attendance(self, semester: int | None = None, refresh: bool = False) -> dict[int, list[Course]]:
         """Fetches attendance records.
 
         Args:
             semester (Optional[int]): The semester number to fetch. If not provided,
                 attendance for all available semesters is returned.
+            refresh (bool): If True, cached responses are ignored and replaced with fresh ones.
 
         Returns:
             A dictionary mapping semester numbers to lists of Course objects with attendance data.
         """
-        return await self._client.get_attendance(semester)
+        with _bypass_cache(refresh):
+            return await self._client.get_attendance(semester)
 
-    async def get_results(self, semester: int) -> SemesterResult:
+    async def get_results(self, semester: int, refresh: bool = False) -> SemesterResult:
         """Fetches the final results for a specific semester.
 
         Args:
             semester (int): The semester number for which to fetch results.
+            refresh (bool): If True, cached responses are ignored and replaced with fresh ones.
 
         Returns:
             A SemesterResult object containing SGPA, credits, and subject details.
 
         Raises:
-            ValueError: If the requested semester is invalid or has no results.
+            ValueError: If the requested semester is invalid.
+            ResultsNotPublishedError: If the semester has no published results yet.
         """
-        semester_id_str = self._client._semester_ids.get(semester)
-        if not semester_id_str:
-            raise ValueError(
-                f"Invalid or unavailable semester: {semester}. Available: {list(self._client._semester_ids.keys())}"
-            )
-        return await self._client.get_results(semester_id_str)
+        with _bypass_cache(refresh):
+            semester_ids = await self._client._get_semester_ids()
+            semester_id_str = semester_ids.get(semester)
+            if not semester_id_str:
+                raise ValueError(f"Invalid or unavailable semester: {semester}. Available: {list(semester_ids.keys())}")
+            return await self._client.get_results(semester_id_str)
 
-    async def get_announcements(self) -> list[Announcement]:
-        """Fetches all recent announcements from the dashboard.
+    async def get_all_results(self, refresh: bool = False, archive: ResultsArchive | None = None) -> Transcript:
+        """Fetches the results of every semester concurrently over this session, with the CGPA and its trend.
+
+        Semesters without published results are listed in `Transcript.unavailable` instead of failing the call.
 
         Args:
-            None
+            refresh (bool): If True, cached responses are ignored and replaced with fresh ones. Archived results are
+                still used, since final results do not change.
+            archive (Optional[ResultsArchive]): Where the final results of past semesters are kept permanently. With
+                an archive that already holds them, only the latest semester is requested from the portal.
+
+        Returns:
+            Transcript: The results of every semester, the CGPA and the per-semester trend.
+        """
+        with _bypass_cache(refresh):
+            return await self._client.get_all_results(archive)
+
+    async def get_announcements(
+        self, refresh: bool = False, since: datetime.date | None = None, seen: Collection[str] | None = None
+    ) -> list[Announcement]:
+        """Fetches all recent announcements from the dashboard, or only those newer than a watermark.
+
+        The dashboard lists announcements newest first. Given `since` or `seen`, parsing stops at the first
+        announcement that is older than `since` or whose key is in `seen`, so polling for new announcements only
+        parses the new ones.
+
+        Args:
+            refresh (bool): If True, cached responses are ignored and replaced with fresh ones.
+            since (Optional[datetime.date]): Only return announcements from this date on.
+            seen (Optional[Collection[str]]): Keys (`Announcement.key`) of announcements that were already seen.
 
         Returns:
             A list of Announcement objects containing the latest announcements.
         """
-        return await self._client.get_announcements()
+        with _bypass_cache(refresh):
+            return await self._client.get_announcements(since, seen)
+
+    def aiter_announcements(
+        self,
+        buffer_size: int = 16,
+        refresh: bool = False,
+        since: datetime.date | None = None,
+        seen: Collection[str] | None = None,
+    ) -> AsyncIterator[Announcement]:
+        """Yields the recent announcements one by one, as soon as each one has been parsed.
+
+        Args:
+            buffer_size (int): Maximum number of announcements parsed ahead of the consumer.
+            refresh (bool): If True, cached responses are ignored and replaced with fresh ones.
+            since (Optional[datetime.date]): Only yield announcements from this date on.
+            seen (Optional[Collection[str]]): Keys (`Announcement.key`) of announcements that were already seen.
+
+        Returns:
+            An async iterator of Announcement objects, in the order shown on the dashboard.
+        """
+        return self._client.aiter_announcements(buffer_size, refresh, since, seen)
 
     # < Methods for the Materials Workflow >
 
-    async def get_units_for_course(self, course_id: str) -> list[Unit]:
+    async def get_units_for_course(self, course_id: str, refresh: bool = False) -> list[Unit]:
         """Given a course_id, fetches the list of units within it.
 
         The course_id can be obtained from the Course model returned by `get_courses()`.
 
         Args:
             course_id (str): The unique internal ID for the course.
+            refresh (bool): If True, cached responses are ignored and replaced with fresh ones.
 
         Returns:
-            A list of Unit objects.
+            A list of Unit objects. They may be shared with other sessions and must not be modified.
         """
-        return await self._client.get_units_for_course(course_id)
+        with _bypass_cache(refresh):
+            return await self._client.get_units_for_course(course_id)
 
-    async def get_topics_for_unit(self, unit_id: str) -> list[Topic]:
+    async def get_topics_for_unit(self, unit_id: str, refresh: bool = False) -> list[Topic]:
         """Given a unit_id, fetches the list of topics within it.
 
         The unit_id can be obtained from the Unit model.
 
         Args:
             unit_id (str): The unique internal ID for the unit.
+            refresh (bool): If True, cached responses are ignored and replaced with fresh ones.
 
         Returns:
-            A list of Topic objects, containing IDs needed for the final step.
+            A list of Topic objects, containing IDs needed for the final step. They may be shared with other sessions
+            and must not be modified.
         """
-        return await self._client.get_topics_for_unit(unit_id)
+        with _bypass_cache(refresh):
+            return await self._client.get_topics_for_unit(unit_id)
 
-    async def get_material_links(self, topic: Topic, material_type_id: str) -> list[MaterialLink]:
+    async def get_material_links(
+        self, topic: Topic, material_type_id: str, refresh: bool = False
+    ) -> list[MaterialLink]:
         """Given a Topic object and a material type ID, fetches the final download links.
 
         Args:
             topic (Topic): The Topic object obtained from `get_topics_for_unit()`.
             material_type_id (str): A string representing the material type (e.g., "2" for Slides, "3" for Notes).
+            refresh (bool): If True, cached responses are ignored and replaced with fresh ones.
 
         Returns:
-            A list of MaterialLink objects.
+            A list of MaterialLink objects. They may be shared with other sessions and must not be modified.
         """
-        return await self._client.get_material_links(topic, material_type_id)
+        with _bypass_cache(refresh):
+            return await self._client.get_material_links(topic, material_type_id)
+
+    async def get_course_tree(
+        self,
+        course_id: str,
+        material_types: list[str] | None = None,
+        max_concurrency: int = 8,
+        refresh: bool = False,
+    ) -> CourseTree:
+        """Given a course_id, fetches all of its units, topics and material links in one concurrent crawl.
+
+        This replaces walking `get_units_for_course()`, `get_topics_for_unit()` and `get_material_links()` by hand.
+        Parts of the tree that fail to load are left out and reported in `CourseTree.errors`.
+
+        Args:
+            course_id (str): The unique internal ID for the course.
+            material_types (Optional[List[str]]): Material type IDs to fetch (see `constants.MATERIAL_TYPES`).
+                Defaults to all of them.
+            max_concurrency (int): Maximum number of requests in flight at the same time.
+            refresh (bool): If True, cached responses are ignored and replaced with fresh ones.
+
+        Returns:
+            A CourseTree object with the units, topics and material links of the course.
+
+        Raises:
+            AuthenticationError: If the session expired during the crawl. The crawl stops there.
+            PortalUnavailableError: If PESU Academy stopped responding during the crawl. The crawl stops there.
+        """
+        with _bypass_cache(refresh):
+            return await self._client.get_course_tree(course_id, material_types, max_concurrency)
+
+    def aiter_course_materials(
+        self,
+        course_id: str,
+        material_types: list[str] | None = None,
+        max_concurrency: int = 8,
+        buffer_size: int = 16,
+        refresh: bool = False,
+    ) -> AsyncIterator[TopicMaterials]:
+        """Given a course_id, yields its material links as soon as each request of the crawl completes.
+
+        This walks the same tree as `get_course_tree()`, so results can be shown before the whole course is loaded.
+        Each item holds the links of one topic and one material type, e.g. `item.materials == {"2": [...]}`; group
+        them by `item.topic.unit_id` and `item.topic.id` to rebuild the tree. Types without material are skipped.
+
+        The crawl runs at most `buffer_size` items ahead of the consumer and pauses until they are taken. Breaking
+        out of the loop, closing the iterator or cancelling the consuming task stops the crawl.
+
+        Example:
+            ```python
+            async for item in pesu.aiter_course_materials(course.id):
+                print(item.topic.title, item.materials)
+            ```
+
+        Args:
+            course_id (str): The unique internal ID for the course.
+            material_types (Optional[List[str]]): Material type IDs to fetch (see `constants.MATERIAL_TYPES`).
+                Defaults to all of them.
+            max_concurrency (int): Maximum number of requests in flight at the same time.
+            buffer_size (int): Maximum number of items fetched ahead of the consumer.
+            refresh (bool): If True, cached responses are ignored and replaced with fresh ones.
+
+        Returns:
+            An async iterator of TopicMaterials objects holding a single material type each.
+
+        Raises:
+            httpx.HTTPStatusError: While iterating, if any request of the crawl fails. The crawl stops there.
+        """
+        return self._client.aiter_course_materials(course_id, material_types, max_concurrency, buffer_size, refresh)
+
+    async def get_semester_course_trees(
+        self,
+        semester: int | None = None,
+        material_types: list[str] | None = None,
+        max_concurrency: int = 8,
+        refresh: bool = False,
+    ) -> list[CourseTree]:
+        """Fetches the material trees of every course in a semester in one concurrent crawl.
 
-    async def get_timetable(self) -> Timetable:
+        Args:
+            semester (Optional[int]): The semester number. Defaults to the latest semester.
+            material_types (Optional[List[str]]): Material type IDs to fetch (see `constants.MATERIAL_TYPES`).
+                Defaults to all of them.
+            max_concurrency (int): Maximum number of requests in flight at the same time, across all courses.
+            refresh (bool): If True, cached responses are ignored and replaced with fresh ones.
+
+        Returns:
+            A list of CourseTree objects, one per course, with `CourseTree.course` set.
+
+        Raises:
+            ValueError: If the requested semester is invalid.
+            AuthenticationError: If the session expired during the crawl. The crawl stops there.
+            PortalUnavailableError: If PESU Academy stopped responding during the crawl. The crawl stops there.
+        """
+        with _bypass_cache(refresh):
+            return await self._client.get_semester_course_trees(semester, material_types, max_concurrency)
+
+    async def export_course(
+        self,
+        course_id: str,
+        destination: Path | str | IO[bytes],
+        material_types: list[str] | None = None,
+        max_concurrency: int = 4,
+        as_zip: bool = False,
+        on_file: Callable[[ExportedFile], None] | None = None,
+        refresh: bool = False,
+    ) -> ExportReport:
+        """Downloads every material of a course into a directory or a ZIP archive.
+
+        Files are laid out as `<unit>/<topic>/<material type> - <title>.<ext>` and streamed to disk in chunks, so
+        memory use does not grow with file sizes.
+
+        When exporting to a directory, re-running the export picks up where it left off: unfinished downloads
+        (`*.part` files) are resumed with HTTP range requests, and files whose size on the server and SHA-256 on disk
+        match the previous export are skipped without downloading them again. ZIP archives are always written from
+        scratch.
+
+        Args:
+            course_id (str): The unique internal ID for the course.
+            destination: A directory path, or with `as_zip` the path of the archive or a writable binary file object.
+            material_types (Optional[List[str]]): Material type IDs to export (see `constants.MATERIAL_TYPES`).
+                Defaults to all of them.
+            max_concurrency (int): Maximum number of downloads in flight at the same time.
+            as_zip (bool): Whether to write a ZIP archive instead of a directory.
+            on_file (Optional[Callable[[ExportedFile], None]]): Called as soon as each file has been exported, e.g.
+                to show progress.
+            refresh (bool): If True, cached responses are ignored while listing the materials.
+
+        Returns:
+            An ExportReport object listing every file with its status, plus the bytes transferred and throughput.
+        """
+        with _bypass_cache(refresh):
+            return await self._client.export_course_pack(
+                destination, course_id, None, material_types, max_concurrency, as_zip, on_file
+            )
+
+    async def export_semester(
+        self,
+        destination: Path | str | IO[bytes],
+        semester: int | None = None,
+        material_types: list[str] | None = None,
+        max_concurrency: int = 4,
+        as_zip: bool = False,
+        on_file: Callable[[ExportedFile], None] | None = None,
+        refresh: bool = False,
+    ) -> ExportReport:
+        """Downloads every material of every course in a semester, one folder per course.
+
+        Works like `export_course()`, including resuming and skipping unchanged files.
+
+        Args:
+            destination: A directory path, or with `as_zip` the path of the archive or a writable binary file object.
+            semester (Optional[int]): The semester number. Defaults to the latest semester.
+            material_types (Optional[List[str]]): Material type IDs to export (see `constants.MATERIAL_TYPES`).
+                Defaults to all of them.
+            max_concurrency (int): Maximum number of downloads in flight at the same time.
+            as_zip (bool): Whether to write a ZIP archive instead of a directory.
+            on_file (Optional[Callable[[ExportedFile], None]]): Called as soon as each file has been exported.
+            refresh (bool): If True, cached responses are ignored while listing the materials.
+
+        Returns:
+            An ExportReport object listing every file with its status, plus the bytes transferred and throughput.
+
+        Raises:
+            ValueError: If the requested semester is invalid.
+        """
+        with _bypass_cache(refresh):
+            return await self._client.export_course_pack(
+                destination, None, semester, material_types, max_concurrency, as_zip, on_file
+            )
+
+    async def get_timetable(self, refresh: bool = False) -> Timetable:
         """Fetches the student's timetable.
 
         Args:
-            None
+            refresh (bool): If True, cached responses are ignored and replaced with fresh ones.
 
         Returns:
             Timetable: A Timetable object containing the student's timetable details.
         """
-        return await self._client.get_timetable()
+        with _bypass_cache(refresh):
+            return await self._client.get_timetable()
+
+    async def get_snapshot(self, max_concurrency: int = 4, refresh: bool = False) -> Snapshot:
+        """Fetches everything the dashboard needs in one call over this session.
+
+        Profile, current-semester courses and attendance, timetable, announcements, seating information and the
+        latest published results are fetched concurrently. A failing section does not fail the snapshot; it is left
+        empty and its error is reported in `Snapshot.sections`. The profile photo is left out; fetch it with
+        `get_profile_image()` when it is shown.
+
+        Args:
+            max_concurrency (int): Maximum number of sections fetched at the same time.
+            refresh (bool): If True, cached responses are ignored and replaced with fresh ones.
+
+        Returns:
+            Snapshot: A Snapshot object containing all sections along with per-section errors and timings.
+        """
+        with _bypass_cache(refresh):
+            return await self._client.get_snapshot(max_concurrency)
+
+    def sync(self, runner: BackgroundRunner | None = None) -> SyncPESUAcademy:
+        """Returns a blocking facade over this session, for use from synchronous code.
+
+        The session must have been created on the runner's loop, e.g. with `runner.run(PESUAcademy.login(...))`.
+        To log in from synchronous code in one step, use `SyncPESUAcademy.login()` instead.
+
+        Args:
+            runner (Optional[BackgroundRunner]): The runner the session lives on. Defaults to the process-wide runner.
+
+        Returns:
+            SyncPESUAcademy: A facade whose methods block until the session's coroutines have finished.
+        """
+        return SyncPESUAcademy(self, runner)
+
+    async def invalidate_cache(self, *endpoints: str) -> None:
+        """Removes this user's cached responses so that the next calls fetch fresh data.
+
+        Args:
+            *endpoints (str): Names of the endpoints to invalidate, as used in `constants.CACHE_TTLS`
+                (e.g. "Attendance", "Timetable"). If none are given, every cached response of the user is removed.
+        """
+        await self._client.invalidate_cache(*endpoints)
 
     async def close(self) -> None:
         """Closes the network session gracefully.
@@ -0,0 +1,6 @@
+"""Record PESU Academy sessions and replay them offline, in-process or through a local stand-in server."""
+
+from .recording import RecordedResponse, Recording, _RecordingTransport
+from .server import StandInServer
+
+__all__ = ["RecordedResponse", "Recording", "StandInServer", "_RecordingTransport"]
@@ -0,0 +1,80 @@
+"""Command line entry point: `python -m pesuacademy.replay record|serve ...`."""
+
+import argparse
+import asyncio
+import contextlib
+
+from pesuacademy.replay.recording import Recording
+from pesuacademy.replay.server import StandInServer
+
+
+async def _record(path: str, redact: dict[str, str], material_semester: int | None) -> None:
+    """Logs in with the credentials from the environment, visits every endpoint and saves what was received."""
+    from pesuacademy.pesuacademy import PESUAcademy
+
+    recording = Recording(redact)
+    pesu = await PESUAcademy.login(recording=recording)
+    try:
+        semesters = await pesu._client._get_semester_ids()
+        await asyncio.gather(
+            pesu.get_profile(),
+            pesu.get_seating_info(),
+            pesu.get_timetable(),
+            pesu.get_announcements(),
+            pesu.get_courses(),
+            pesu.get_attendance(),
+            *(pesu.get_results(semester) for semester in semesters),
+            pesu.get_semester_course_trees(material_semester),
+            return_exceptions=True,
+        )
+    finally:
+        await pesu.close()
+    recording.save(path)
+    print(f"Recorded {len(recording)} responses from {len(recording.endpoints)} endpoints to {path}")
+
+
+def main() -> None:
+    """Parses the command line and runs the requested command."""
+    parser = argparse.ArgumentParser(prog="python -m pesuacademy.replay", description=__doc__)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record = commands.add_parser("record", help="Record a live session (PESU_USERNAME and PESU_PASSWORD).")
+    record.add_argument("path", help="The JSON file to write.")
+    record.add_argument(
+        "--redact", nargs=2, action="append", default=[], metavar=("TEXT", "REPLACEMENT"), help="Text to redact."
+    )
+    record.add_argument("--semester", type=int, help="The semester whose course materials are recorded.")
+
+    serve = commands.add_parser("serve", help="Serve a recording as a stand-in for PESU Academy.")
+    serve.add_argument("path", help="The JSON file to serve.")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8080)
+    serve.add_argument("--latency", type=float, default=0.0, help="Seconds every page response is delayed by.")
+    serve.add_argument("--jitter", type=float, default=0.0, help="Maximum random extra delay, in seconds.")
+    serve.add_argument("--error-rate", type=float, default=0.0, help="Fraction of page requests that fail.")
+    serve.add_argument("--error-status", type=int, default=503, help="Status code of injected errors.")
+    serve.add_argument("--payload-bytes", type=int, default=0, help="Minimum size of text responses.")
+
+    args = parser.parse_args()
+    if args.command == "record":
+        asyncio.run(_record(args.path, dict(args.redact), args.semester))
+        return
+
+    server = StandInServer(
+        Recording.load(args.path),
+        host=args.host,
+        port=args.port,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        payload_bytes=args.payload_bytes,
+    )
+    print(f"Serving {args.path} at {server.url}")
+    with contextlib.suppress(KeyboardInterrupt):
+        server.serve_forever()
+    server.stop()
+
+
+if __name__ == "__main__":
+    main()
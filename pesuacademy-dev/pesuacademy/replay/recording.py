@@ -0,0 +1,263 @@
+"""Recordings of PESU Academy responses, captured from a live session and replayed offline."""
+
+import asyncio
+import base64
+import json
+import random
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from urllib.parse import parse_qsl
+
+import httpx
+
+from pesuacademy.util import _endpoint_name
+
+RECORDING_VERSION = 1
+# Value that replaces every CSRF token in a recording. Replays substitute a token of their own for it.
+CSRF_PLACEHOLDER = "recorded-csrf-token"
+# Query parameters that do not change what the portal returns (the "_" cache-buster)
+_IGNORED_PARAMS = frozenset({"_"})
+# Headers that describe the original transfer and no longer apply once the body has been decoded
+_TRANSFER_HEADERS = frozenset({"content-encoding", "content-length", "transfer-encoding"})
+# Headers that belong to the recorded connection or session and must not be replayed
+_UNRECORDED_HEADERS = _TRANSFER_HEADERS | {"connection", "date", "keep-alive", "set-cookie"}
+_CSRF_TOKEN_PATTERN = re.compile(
+    rb"(<meta\b[^>]*\bname=[\"']csrf-token[\"'][^>]*\bcontent=[\"'])[^\"']*([\"'])"
+    rb"|(<meta\b[^>]*\bcontent=[\"'])[^\"']*([\"'][^>]*\bname=[\"']csrf-token[\"'])",
+    re.IGNORECASE,
+)
+
+
+def _request_key(method: str, path: str, params: list[tuple[str, str]]) -> str:
+    """Builds the key that identifies a request in a recording, ignoring the cache-buster parameter."""
+    params = sorted((k, v) for k, v in params if k not in _IGNORED_PARAMS)
+    return f"{method.upper()} {path}?{httpx.QueryParams(params)}"
+
+
+def _replace_csrf_token(body: bytes, token: str) -> bytes:
+    """Replaces the value of the csrf-token meta tag of a page."""
+    replacement = token.encode()
+    return _CSRF_TOKEN_PATTERN.sub(
+        lambda m: (m.group(1) or m.group(3)) + replacement + (m.group(2) or m.group(4)), body
+    )
+
+
+@dataclass
+class RecordedResponse:
+    """A response captured for one request.
+
+    Attributes:
+        method (str): The HTTP method of the request.
+        path (str): The URL path of the request, e.g. "/Academy/s/studentProfilePESUAdmin".
+        params (List[Tuple[str, str]]): The query parameters of the request, without the cache-buster.
+        endpoint (Optional[str]): The endpoint name (e.g. "Attendance"), or None for other URLs.
+        status_code (int): The HTTP status code.
+        headers (List[Tuple[str, str]]): The response headers, without cookies and transfer headers.
+        body (bytes): The decoded response body.
+    """
+
+    method: str
+    path: str
+    params: list[tuple[str, str]]
+    endpoint: str | None
+    status_code: int
+    headers: list[tuple[str, str]]
+    body: bytes
+
+    @property
+    def key(self) -> str:
+        """The key that identifies the request of this response."""
+        return _request_key(self.method, self.path, self.params)
+
+    def to_dict(self) -> dict[str, object]:
+        """Converts the response into a JSON-serializable dictionary."""
+        data: dict[str, object] = {
+            "method": self.method,
+            "path": self.path,
+            "params": self.params,
+            "endpoint": self.endpoint,
+            "status_code": self.status_code,
+            "headers": self.headers,
+        }
+        try:
+            data["body"] = self.body.decode()
+        except UnicodeDecodeError:
+            data["body_base64"] = base64.b64encode(self.body).decode()
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "RecordedResponse":
+        """Creates a response from a dictionary produced by `to_dict`."""
+        body = data["body"].encode() if "body" in data else base64.b64decode(data["body_base64"])
+        return cls(
+            method=data["method"],
+            path=data["path"],
+            params=[tuple(param) for param in data["params"]],
+            endpoint=data.get("endpoint"),
+            status_code=data["status_code"],
+            headers=[tuple(header) for header in data["headers"]],
+            body=body,
+        )
+
+    def to_response(self, request: httpx.Request, csrf_token: str = CSRF_PLACEHOLDER) -> httpx.Response:
+        """Rebuilds the response for a request, with the given CSRF token in place of the recorded one."""
+        body = self.body if csrf_token == CSRF_PLACEHOLDER else _replace_csrf_token(self.body, csrf_token)
+        return httpx.Response(self.status_code, headers=self.headers, content=body, request=request)
+
+
+class Recording:
+    """A set of PESU Academy responses, keyed by request, that can be saved to and loaded from a JSON file.
+
+    Responses are sanitized as they are recorded: cookies and connection headers are dropped, CSRF tokens are replaced
+    with a placeholder, redirects are made relative to the host, and the username of the login (as well as every
+    string given in `redact`) is replaced in every body. Request bodies, and so passwords, are never recorded. Pages
+    such as the profile contain further personal data; pass it in `redact` before sharing a recording.
+
+    Record a session by passing a recording to `PESUAcademy.login()`, then replay it in-process through
+    `mock_transport()` or over HTTP with `StandInServer`.
+    """
+
+    def __init__(self, redact: dict[str, str] | None = None) -> None:
+        """Initializes an empty recording.
+
+        Args:
+            redact (Optional[dict[str, str]]): Strings to replace in every recorded body, mapped to their replacements.
+        """
+        self.redact = dict(redact or {})
+        self.responses: dict[str, RecordedResponse] = {}
+
+    def __len__(self) -> int:
+        """Returns the number of recorded responses."""
+        return len(self.responses)
+
+    @property
+    def endpoints(self) -> set[str]:
+        """The names of the endpoints that have at least one recorded response."""
+        return {response.endpoint for response in self.responses.values() if response.endpoint}
+
+    def _sanitize(self, body: bytes) -> bytes:
+        """Removes CSRF tokens and redacted strings from a body."""
+        body = _replace_csrf_token(body, CSRF_PLACEHOLDER)
+        for secret, replacement in self.redact.items():
+            if secret:
+                body = body.replace(secret.encode(), replacement.encode())
+        return body
+
+    def add(self, request: httpx.Request, response: httpx.Response) -> RecordedResponse:
+        """Records a fully read response, replacing any earlier response to the same request.
+
+        Args:
+            request (httpx.Request): The request that was sent.
+            response (httpx.Response): The response to it. Its body must have been read.
+
+        Returns:
+            RecordedResponse: The sanitized response as stored.
+        """
+        if request.method == "POST" and b"j_username=" in request.content:
+            username = dict(parse_qsl(request.content.decode())).get("j_username")
+            if username and username not in self.redact:
+                self.redact[username] = "PES0000000000"
+
+        headers = []
+        for name, value in response.headers.multi_items():
+            if name.lower() in _UNRECORDED_HEADERS:
+                continue
+            if name.lower() == "location":
+                location = request.url.join(value)
+                value = location.raw_path.decode() if location.host == request.url.host else value
+            headers.append((name, value))
+
+        recorded = RecordedResponse(
+            method=request.method,
+            path=request.url.path,
+            params=[(k, v) for k, v in request.url.params.multi_items() if k not in _IGNORED_PARAMS],
+            endpoint=_endpoint_name(request),
+            status_code=response.status_code,
+            headers=headers,
+            body=self._sanitize(response.content),
+        )
+        self.responses[recorded.key] = recorded
+        return recorded
+
+    def find(self, method: str, path: str, params: list[tuple[str, str]]) -> RecordedResponse | None:
+        """Returns the recorded response to a request, or None if it was not recorded."""
+        return self.responses.get(_request_key(method, path, params))
+
+    def save(self, path: str | Path) -> None:
+        """Writes the recording to a JSON file."""
+        data = {"version": RECORDING_VERSION, "responses": [r.to_dict() for r in self.responses.values()]}
+        Path(path).write_text(json.dumps(data, indent=1))
+
+    @classmethod
+    def load(cls, path: str | Path) -> "Recording":
+        """Reads a recording from a JSON file written by `save`.
+
+        Raises:
+            ValueError: If the file was written by an incompatible version.
+        """
+        data = json.loads(Path(path).read_text())
+        if data.get("version") != RECORDING_VERSION:
+            raise ValueError(f"Unsupported recording version: {data.get('version')}")
+        recording = cls()
+        for item in data["responses"]:
+            recorded = RecordedResponse.from_dict(item)
+            recording.responses[recorded.key] = recorded
+        return recording
+
+    def mock_transport(
+        self, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0, error_status: int = 503
+    ) -> httpx.MockTransport:
+        """Returns a transport that answers requests from this recording without touching the network.
+
+        Pass it as `TransportConfig(network=...)` to replay a session in-process. Login always succeeds. Requests that
+        were not recorded are answered with 404.
+
+        Args:
+            latency (float): Seconds every response is delayed by.
+            jitter (float): Maximum extra delay in seconds, picked at random for every response.
+            error_rate (float): Fraction of requests (0 to 1) answered with `error_status` instead.
+            error_status (int): Status code of injected errors.
+        """
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            if latency or jitter:
+                await asyncio.sleep(latency + random.uniform(0, jitter))
+            if error_rate and random.random() < error_rate:
+                return httpx.Response(error_status, request=request)
+            recorded = self.find(request.method, request.url.path, list(request.url.params.multi_items()))
+            if recorded is None:
+                return httpx.Response(404, request=request)
+            return recorded.to_response(request)
+
+        return httpx.MockTransport(handler)
+
+
+class _RecordingTransport(httpx.AsyncBaseTransport):
+    """An httpx transport that adds every response it receives to a `Recording`."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, recording: Recording) -> None:
+        """Wraps a transport.
+
+        Args:
+            transport (httpx.AsyncBaseTransport): The transport that sends the requests.
+            recording (Recording): The recording to add responses to.
+        """
+        self._transport = transport
+        self._recording = recording
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        """Sends a request and records its response, which is read in full."""
+        response = await self._transport.handle_async_request(request)
+        try:
+            await response.aread()
+        finally:
+            await response.aclose()
+        self._recording.add(request, response)
+        # The body has already been decoded, so hand it on without the original transfer headers
+        headers = [(k, v) for k, v in response.headers.multi_items() if k.lower() not in _TRANSFER_HEADERS]
+        return httpx.Response(response.status_code, headers=headers, content=response.content, request=request)
+
+    async def aclose(self) -> None:
+        """Closes the wrapped transport."""
+        await self._transport.aclose()
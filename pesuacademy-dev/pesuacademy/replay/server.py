@@ -0,0 +1,265 @@
+"""A local HTTP server that stands in for PESU Academy, serving the pages of a recording."""
+
+import http.server
+import random
+import secrets
+import threading
+import time
+from http.cookies import SimpleCookie
+from urllib.parse import parse_qsl, urlsplit
+
+from pesuacademy.replay.recording import CSRF_PLACEHOLDER, Recording, _replace_csrf_token
+
+_SESSION_COOKIE = "JSESSIONID"
+_LOGIN_PATHS = frozenset({"/Academy", "/Academy/", "/Academy/login"})
+_LOGIN_CHECK_PATH = "/Academy/j_spring_security_check"
+_LOGOUT_PATH = "/Academy/logout"
+# Served when the recording has no login page, e.g. when it was assembled by hand
+_LOGIN_PAGE = (
+    b'<html><head><meta name="csrf-token" content="recorded-csrf-token"/></head>'
+    b'<body><form action="j_spring_security_check" method="post"></form></body></html>'
+)
+_INVALID_CREDENTIALS_PAGE = (
+    b'<html><head><meta name="csrf-token" content="recorded-csrf-token"/></head>'
+    b"<body><p>Invalid credentials</p></body></html>"
+)
+
+
+class _Session:
+    """A browser session of the stand-in server, before and after login."""
+
+    def __init__(self) -> None:
+        """Creates an anonymous session with its own CSRF token."""
+        self.csrf_token = secrets.token_hex(16)
+        self.username: str | None = None
+
+
+class StandInServer:
+    """Serves a recording over HTTP the way PESU Academy serves its pages, for load tests and offline benchmarks.
+
+    The server emulates the Spring Security login flow of the portal: the login page hands out a session cookie and a
+    CSRF token, `j_spring_security_check` checks both (and the credentials, if `users` is given) and then switches to a
+    new, authenticated session. Page requests to `studentProfilePESUAdmin` and the semester endpoint are answered from
+    the recording, keyed by their query parameters; without an authenticated session they are redirected to the login
+    page, like an expired session on the portal.
+
+    Latency, injected errors and padded payloads make it possible to measure how the client behaves under load.
+    The server handles every connection in its own thread and supports keep-alive.
+
+    Example:
+        >>> with StandInServer(Recording.load("session.json"), latency=0.05) as server:
+        ...     pesu = await PESUAcademy.login("user", "password", base_url=server.url)
+    """
+
+    def __init__(
+        self,
+        recording: Recording,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        payload_bytes: int = 0,
+        users: dict[str, str] | None = None,
+    ) -> None:
+        """Initializes the server without starting it.
+
+        Args:
+            recording (Recording): The responses to serve.
+            host (str): The address to listen on.
+            port (int): The port to listen on. 0 picks a free port.
+            latency (float): Seconds every page response is delayed by.
+            jitter (float): Maximum extra delay in seconds, picked at random for every page response.
+            error_rate (float): Fraction of page requests (0 to 1) answered with `error_status` instead.
+            error_status (int): Status code of injected errors.
+            payload_bytes (int): Minimum size of text responses. Smaller ones are padded with an HTML comment.
+            users (Optional[dict[str, str]]): Passwords keyed by username. If None, any credentials are accepted.
+        """
+        self.recording = recording
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.payload_bytes = payload_bytes
+        self.users = users
+        self.requests_served = 0
+        self.errors_injected = 0
+        self._sessions: dict[str, _Session] = {}
+        self._lock = threading.Lock()
+        self._server = http.server.ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        """The base URL to log in with, e.g. "http://127.0.0.1:8080/Academy"."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/Academy"
+
+    def start(self) -> "StandInServer":
+        """Starts serving in a background thread and returns the server."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._server.serve_forever, name="pesuacademy-standin", daemon=True)
+            self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        """Serves in the current thread until interrupted."""
+        self._server.serve_forever()
+
+    def stop(self) -> None:
+        """Stops the server and closes its socket."""
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self) -> "StandInServer":
+        """Starts the server for the duration of a `with` block."""
+        return self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Stops the server."""
+        self.stop()
+
+    # < Request handling >
+
+    def _pad(self, body: bytes, content_type: str) -> bytes:
+        """Pads a text body with an HTML comment up to `payload_bytes`."""
+        missing = self.payload_bytes - len(body)
+        if missing <= 0 or not content_type.startswith("text/"):
+            return body
+        return body + b"<!--" + b"x" * max(missing - 7, 0) + b"-->"
+
+    def _handle(
+        self, method: str, target: str, cookie_header: str | None, form: dict[str, str]
+    ) -> tuple[int, list[tuple[str, str]], bytes]:
+        """Answers a request and returns its status code, headers and body."""
+        url = urlsplit(target)
+        path = url.path
+        cookies = SimpleCookie(cookie_header or "")
+        session_id = cookies[_SESSION_COOKIE].value if _SESSION_COOKIE in cookies else None
+        with self._lock:
+            self.requests_served += 1
+            session = self._sessions.get(session_id) if session_id else None
+
+        if path in _LOGIN_PATHS and method == "GET":
+            return self._login_page(session_id, session)
+        if path == _LOGIN_CHECK_PATH and method == "POST":
+            return self._login_check(session_id, session, form)
+        if path == _LOGOUT_PATH:
+            with self._lock:
+                self._sessions.pop(session_id, None)
+            return 302, [("Location", "/Academy/")], b""
+        if session is None or session.username is None:
+            return 302, [("Location", "/Academy/")], b""
+        return self._page(method, path, url.query, session)
+
+    def _login_page(self, session_id: str | None, session: _Session | None) -> tuple[int, list[tuple[str, str]], bytes]:
+        """Serves the login page, starting an anonymous session if the browser has none."""
+        if session_id is None or session is None:
+            session_id, session = secrets.token_hex(16), _Session()
+            with self._lock:
+                self._sessions[session_id] = session
+        recorded = self.recording.find("GET", "/Academy/", [])
+        body = recorded.body if recorded is not None and recorded.status_code == 200 else _LOGIN_PAGE
+        return 200, self._session_headers(session_id, "text/html;charset=UTF-8"), self._with_token(body, session)
+
+    def _login_check(
+        self, session_id: str | None, session: _Session | None, form: dict[str, str]
+    ) -> tuple[int, list[tuple[str, str]], bytes]:
+        """Checks the CSRF token and credentials of a login and switches to an authenticated session."""
+        if session is None or not secrets.compare_digest(form.get("_csrf", ""), session.csrf_token):
+            return 403, [("Content-Type", "text/plain")], b"Invalid CSRF Token"
+        username, password = form.get("j_username", ""), form.get("j_password", "")
+        if not username or (self.users is not None and self.users.get(username) != password):
+            body = self._with_token(_INVALID_CREDENTIALS_PAGE, session)
+            return 200, [("Content-Type", "text/html;charset=UTF-8")], body
+        # Like Spring Security, switch to a new session on login to prevent session fixation
+        authenticated = _Session()
+        authenticated.username = username
+        new_session_id = secrets.token_hex(16)
+        with self._lock:
+            self._sessions.pop(session_id, None)
+            self._sessions[new_session_id] = authenticated
+        recorded = self.recording.find("POST", _LOGIN_CHECK_PATH, [])
+        if recorded is None:
+            headers = [("Location", "/Academy/s/studentProfilePESU")]
+            return 302, self._session_headers(new_session_id) + headers, b""
+        headers = self._session_headers(new_session_id) + [
+            header for header in recorded.headers if header[0].lower() != "content-type"
+        ]
+        content_type = dict((k.lower(), v) for k, v in recorded.headers).get("content-type", "text/html")
+        headers.append(("Content-Type", content_type))
+        return recorded.status_code, headers, self._with_token(recorded.body, authenticated)
+
+    def _page(self, method: str, path: str, query: str, session: _Session) -> tuple[int, list[tuple[str, str]], bytes]:
+        """Serves a recorded page to an authenticated session, with the configured latency and injected errors."""
+        delay = self.latency + (random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay:
+            time.sleep(delay)
+        if self.error_rate and random.random() < self.error_rate:
+            with self._lock:
+                self.errors_injected += 1
+            return self.error_status, [("Content-Type", "text/plain")], b"Injected error"
+
+        params = parse_qsl(query, keep_blank_values=True)
+        recorded = self.recording.find("GET" if method == "HEAD" else method, path, params)
+        if recorded is None:
+            return 404, [("Content-Type", "text/plain")], b"Not recorded"
+        content_type = dict((k.lower(), v) for k, v in recorded.headers).get("content-type", "")
+        body = self._pad(self._with_token(recorded.body, session), content_type)
+        return recorded.status_code, list(recorded.headers), body
+
+    @staticmethod
+    def _session_headers(session_id: str, content_type: str | None = None) -> list[tuple[str, str]]:
+        """Returns the headers that set the session cookie."""
+        headers = [("Set-Cookie", f"{_SESSION_COOKIE}={session_id}; Path=/Academy; HttpOnly")]
+        if content_type:
+            headers.append(("Content-Type", content_type))
+        return headers
+
+    @staticmethod
+    def _with_token(body: bytes, session: _Session) -> bytes:
+        """Puts the CSRF token of a session into a recorded page."""
+        if CSRF_PLACEHOLDER.encode() not in body:
+            return body
+        return _replace_csrf_token(body, session.csrf_token)
+
+    def _handler_class(self) -> type[http.server.BaseHTTPRequestHandler]:
+        """Creates the request handler class bound to this server."""
+        server = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are written separately; without this, Nagle's algorithm adds ~40 ms to every response
+            disable_nagle_algorithm = True
+
+            def _respond(self, method: str) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                form = dict(parse_qsl(body.decode(errors="replace"))) if body else {}
+                status, headers, content = server._handle(method, self.path, self.headers.get("Cookie"), form)
+                self.send_response(status)
+                for name, value in headers:
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                if method != "HEAD":
+                    self.wfile.write(content)
+
+            def do_GET(self) -> None:  # noqa: N802
+                self._respond("GET")
+
+            def do_HEAD(self) -> None:  # noqa: N802
+                self._respond("HEAD")
+
+            def do_POST(self) -> None:  # noqa: N802
+                self._respond("POST")
+
+            def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+                pass  # Keep load tests quiet
+
+        return Handler
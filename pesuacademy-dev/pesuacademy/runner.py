@@ -0,0 +1,257 @@
+"""A long-lived event loop in a background thread, for using the asynchronous API from synchronous code."""
+
+import asyncio
+import concurrent.futures
+import threading
+from collections.abc import AsyncIterator, Coroutine, Iterator
+from typing import TYPE_CHECKING, Any, TypeVar
+
+if TYPE_CHECKING:
+    from pesuacademy.pesuacademy import PESUAcademy
+
+T = TypeVar("T")
+
+
+async def _next[T](iterator: AsyncIterator[T]) -> T:
+    """Awaits the next item of an asynchronous iterator, as a coroutine that can be scheduled on another loop."""
+    return await anext(iterator)
+
+
+class BackgroundRunner:
+    """Runs coroutines on an event loop that lives in its own daemon thread.
+
+    `asyncio.run()` creates and tears down a loop on every call, and with it every connection pool, cached task and
+    session bound to that loop. A runner keeps a single loop alive instead, so sessions created on it (e.g. by a
+    `SessionPool`) can be reused by any number of calls from any number of threads, such as the script threads of a
+    Streamlit or Flask app.
+
+    The loop is started on first use. Calls are thread-safe.
+    """
+
+    def __init__(self, use_uvloop: bool = False, name: str = "pesuacademy-loop") -> None:
+        """Initializes the runner without starting its thread yet.
+
+        Args:
+            use_uvloop (bool): Whether to run the loop on uvloop. Requires the optional `uvloop` package.
+            name (str): Name of the background thread.
+        """
+        self._use_uvloop = use_uvloop
+        self._name = name
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def _new_loop(self) -> asyncio.AbstractEventLoop:
+        """Creates the event loop, on uvloop if requested."""
+        if not self._use_uvloop:
+            return asyncio.new_event_loop()
+        try:
+            import uvloop
+        except ImportError as e:
+            raise ImportError(
+                "The uvloop event loop requires the uvloop package. Install it with `pip install uvloop`."
+            ) from e
+        return uvloop.new_event_loop()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The event loop of the runner, started in its background thread if it is not running yet."""
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                loop = self._new_loop()
+                thread = threading.Thread(target=loop.run_forever, name=self._name, daemon=True)
+                thread.start()
+                self._loop, self._thread = loop, thread
+            return self._loop
+
+    @property
+    def running(self) -> bool:
+        """Whether the background loop has been started and not closed."""
+        return self._loop is not None and not self._loop.is_closed()
+
+    def submit(self, coro: Coroutine[Any, Any, T]) -> concurrent.futures.Future[T]:
+        """Schedules a coroutine on the background loop without waiting for it.
+
+        Args:
+            coro (Coroutine): The coroutine to run.
+
+        Returns:
+            concurrent.futures.Future: A future that resolves to the coroutine's result. Cancelling the future
+                cancels the coroutine.
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Coroutine[Any, Any, T], timeout: float | None = None) -> T:
+        """Runs a coroutine on the background loop and waits for its result.
+
+        Args:
+            coro (Coroutine): The coroutine to run.
+            timeout (Optional[float]): Seconds to wait for the result. The coroutine is cancelled if it takes longer.
+
+        Returns:
+            The result of the coroutine.
+
+        Raises:
+            RuntimeError: If called from the runner's own thread, where waiting would block the loop forever.
+            TimeoutError: If the coroutine did not finish within `timeout` seconds.
+        """
+        if self._thread is not None and threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("BackgroundRunner.run() cannot be called from inside the runner's event loop.")
+        future = self.submit(coro)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+
+    def iterate(self, iterator: AsyncIterator[T]) -> Iterator[T]:
+        """Consumes an asynchronous iterator on the background loop, one item at a time.
+
+        Args:
+            iterator (AsyncIterator): The asynchronous iterator, e.g. from `PESUAcademy.aiter_announcements()`.
+
+        Yields:
+            The items of the iterator, as soon as each one is available.
+        """
+        try:
+            while True:
+                try:
+                    yield self.run(_next(iterator))
+                except StopAsyncIteration:
+                    return
+        finally:
+            aclose = getattr(iterator, "aclose", None)
+            if aclose is not None and self.running:
+                self.run(aclose())
+
+    def close(self, timeout: float | None = 5.0) -> None:
+        """Cancels the tasks still running on the loop, stops it and waits for its thread to exit.
+
+        Args:
+            timeout (Optional[float]): Seconds to wait for the cancelled tasks and the thread.
+        """
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None or loop.is_closed():
+            return
+
+        async def cancel_tasks() -> None:
+            tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await loop.shutdown_asyncgens()
+
+        try:
+            asyncio.run_coroutine_threadsafe(cancel_tasks(), loop).result(timeout)
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            if thread is not None:
+                thread.join(timeout)
+            if not loop.is_running():
+                loop.close()
+
+    def __enter__(self) -> "BackgroundRunner":
+        """Returns the runner, to be closed at the end of the `with` block."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Closes the runner."""
+        self.close()
+
+
+_default_runner: BackgroundRunner | None = None
+_default_runner_lock = threading.Lock()
+
+
+def get_runner() -> BackgroundRunner:
+    """Returns the process-wide runner shared by every `SyncPESUAcademy` that is not given its own."""
+    global _default_runner
+    with _default_runner_lock:
+        if _default_runner is None:
+            _default_runner = BackgroundRunner()
+        return _default_runner
+
+
+class SyncPESUAcademy:
+    """A blocking facade over a `PESUAcademy` session whose coroutines run on a `BackgroundRunner`.
+
+    Every coroutine method of `PESUAcademy` is available under the same name and signature, but returns its result
+    directly, e.g. `pesu.get_profile()`. Methods returning asynchronous iterators (`aiter_*`) return ordinary iterators
+    instead. The facade can be used from any thread; the session itself always runs on the runner's loop.
+
+    Create one with `SyncPESUAcademy.login()`, or with `PESUAcademy.sync()` for a session that already lives on the
+    runner's loop.
+    """
+
+    def __init__(self, session: "PESUAcademy", runner: BackgroundRunner | None = None) -> None:
+        """Wraps a session.
+
+        Args:
+            session (PESUAcademy): The session to wrap. It must have been created on the runner's loop.
+            runner (Optional[BackgroundRunner]): The runner to use. Defaults to the process-wide runner.
+        """
+        self.session = session
+        self.runner = runner or get_runner()
+
+    @classmethod
+    def login(cls, *args: object, runner: BackgroundRunner | None = None, **kwargs: object) -> "SyncPESUAcademy":
+        """Logs in on the runner's loop and returns a blocking session.
+
+        Args:
+            *args: Positional arguments of `PESUAcademy.login()`.
+            runner (Optional[BackgroundRunner]): The runner to use. Defaults to the process-wide runner.
+            **kwargs: Keyword arguments of `PESUAcademy.login()`.
+
+        Returns:
+            SyncPESUAcademy: The authenticated session.
+        """
+        from pesuacademy.pesuacademy import PESUAcademy
+
+        runner = runner or get_runner()
+        return cls(runner.run(PESUAcademy.login(*args, **kwargs)), runner)
+
+    def __getattr__(self, name: str) -> Any:  # noqa: ANN401
+        """Returns a blocking version of a method of the wrapped session."""
+        attribute = getattr(self.session, name)
+        if not callable(attribute):
+            return attribute
+
+        def call(*args: Any, **kwargs: Any) -> Any:  # noqa: ANN401
+            result = attribute(*args, **kwargs)
+            if isinstance(result, Coroutine):
+                return self.runner.run(result)
+            if isinstance(result, AsyncIterator):
+                return self.runner.iterate(result)
+            return result
+
+        call.__name__ = name
+        call.__doc__ = attribute.__doc__
+        return call
+
+    def submit(self, method: str, *args: Any, **kwargs: Any) -> concurrent.futures.Future[Any]:  # noqa: ANN401
+        """Starts a coroutine method of the session without waiting for it.
+
+        Args:
+            method (str): Name of the method, e.g. "get_attendance".
+            *args: Positional arguments of the method.
+            **kwargs: Keyword arguments of the method.
+
+        Returns:
+            concurrent.futures.Future: A future that resolves to the method's result.
+        """
+        return self.runner.submit(getattr(self.session, method)(*args, **kwargs))
+
+    def close(self) -> None:
+        """Closes the wrapped session. The runner is left running since it may be shared."""
+        self.runner.run(self.session.close())
+
+    def __enter__(self) -> "SyncPESUAcademy":
+        """Returns the session, to be closed at the end of the `with` block."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Closes the session."""
+        self.close()
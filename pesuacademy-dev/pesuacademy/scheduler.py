@@ -0,0 +1,185 @@
+"""Scheduling of the requests sent to PESU Academy: a global rate limit, a per-user concurrency cap and priorities."""
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Hashable, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Literal
+
+Priority = Literal["interactive", "prefetch"]
+# Highest priority first
+_PRIORITIES: tuple[Priority, ...] = ("interactive", "prefetch")
+
+_priority: ContextVar[Priority] = ContextVar("pesuacademy_request_priority", default="interactive")
+
+
+@contextmanager
+def request_priority(priority: Priority) -> Iterator[None]:
+    """Sends the requests made inside the block with the given priority.
+
+    Requests are "interactive" unless they are sent inside such a block. The setting is inherited by tasks created
+    inside the block.
+
+    Args:
+        priority (Priority): "interactive" for requests a user is waiting on and "prefetch" for data fetched ahead
+            of time, which nobody is waiting on yet.
+
+    Raises:
+        ValueError: If the priority is not one of the above.
+    """
+    if priority not in _PRIORITIES:
+        raise ValueError(f"Unknown request priority {priority!r}. Expected one of {', '.join(_PRIORITIES)}.")
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+@dataclass
+class _Waiter:
+    """A request waiting for its turn."""
+
+    user: Hashable
+    enqueued_at: float
+    future: asyncio.Future[None] = field(default_factory=lambda: asyncio.get_running_loop().create_future())
+
+
+class RequestScheduler:
+    """Decides when each request is sent to PESU Academy, across every session that shares it.
+
+    Requests are started at no more than `rate` per second on average, with bursts of up to `burst` requests (a token
+    bucket), and no user has more than `per_user_concurrency` requests in flight at the same time, however many
+    semesters or topics they fetch at once. Requests that have to wait are queued by priority: every "interactive"
+    request is started before any "prefetch" one (see `request_priority()`). Requests of the same priority start in
+    the order they were made. Responses served from a cache never wait.
+
+    One scheduler is meant to be shared by all sessions of a process, e.g. through the `TransportConfig` of a
+    `SessionPool`, so that the portal sees a bounded request rate however many users are active. Its queue depths and
+    wait times can be read at any time for monitoring.
+
+    All methods must be called from the same event loop.
+    """
+
+    def __init__(self, rate: float = 20.0, burst: int = 40, per_user_concurrency: int = 6) -> None:
+        """Initializes a scheduler with a full token bucket.
+
+        Args:
+            rate (float): Requests started per second on average, across all users.
+            burst (int): Requests that can be started at once after a quiet period.
+            per_user_concurrency (int): Maximum number of requests of a single user in flight at the same time.
+
+        Raises:
+            ValueError: If any of the limits is not positive.
+        """
+        if rate <= 0 or burst < 1 or per_user_concurrency < 1:
+            raise ValueError("rate, burst and per_user_concurrency must all be positive.")
+        self.rate = rate
+        self.burst = burst
+        self.per_user_concurrency = per_user_concurrency
+        self._tokens = float(burst)
+        self._refilled_at = time.monotonic()
+        self._queues: dict[Priority, deque[_Waiter]] = {priority: deque() for priority in _PRIORITIES}
+        self._in_flight: dict[Hashable, int] = {}
+        self._timer: asyncio.TimerHandle | None = None
+        self.total_requests = 0
+        self._total_wait = dict.fromkeys(_PRIORITIES, 0.0)
+        self._started = dict.fromkeys(_PRIORITIES, 0)
+        self._max_wait = dict.fromkeys(_PRIORITIES, 0.0)
+
+    def status(self) -> dict[str, object]:
+        """Returns the queue depths, requests in flight and wait times, e.g. to export them to a monitoring system.
+
+        Wait times are in seconds and per priority, from the moment a request was made until it was started.
+        """
+        self._refill(time.monotonic())
+        return {
+            "queued": {priority: len(queue) for priority, queue in self._queues.items()},
+            "in_flight": sum(self._in_flight.values()),
+            "users_in_flight": len(self._in_flight),
+            "tokens": self._tokens,
+            "total_requests": self.total_requests,
+            "mean_wait": {
+                priority: self._total_wait[priority] / self._started[priority] if self._started[priority] else 0.0
+                for priority in _PRIORITIES
+            },
+            "max_wait": dict(self._max_wait),
+        }
+
+    def _refill(self, now: float) -> None:
+        """Adds the tokens earned since the last refill."""
+        self._tokens = min(float(self.burst), self._tokens + (now - self._refilled_at) * self.rate)
+        self._refilled_at = now
+
+    def _next_waiter(self) -> tuple[Priority, _Waiter] | None:
+        """Returns the first queued request, by priority, whose user is below the concurrency cap."""
+        for priority in _PRIORITIES:
+            for waiter in self._queues[priority]:
+                # A cancelled request leaves the queue once its task runs again
+                if waiter.future.cancelled():
+                    continue
+                if self._in_flight.get(waiter.user, 0) < self.per_user_concurrency:
+                    return priority, waiter
+        return None
+
+    def _dispatch(self) -> None:
+        """Starts as many queued requests as the rate limit and the per-user caps allow."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        now = time.monotonic()
+        self._refill(now)
+        while (found := self._next_waiter()) is not None:
+            if self._tokens < 1:
+                # Wake up when the next token is earned
+                delay = (1 - self._tokens) / self.rate
+                self._timer = asyncio.get_running_loop().call_later(delay, self._dispatch)
+                return
+            priority, waiter = found
+            self._queues[priority].remove(waiter)
+            self._tokens -= 1
+            self._in_flight[waiter.user] = self._in_flight.get(waiter.user, 0) + 1
+            waited = now - waiter.enqueued_at
+            self.total_requests += 1
+            self._started[priority] += 1
+            self._total_wait[priority] += waited
+            self._max_wait[priority] = max(self._max_wait[priority], waited)
+            waiter.future.set_result(None)
+
+    def _release(self, user: Hashable) -> None:
+        """Frees the slot of a finished request and starts the next ones."""
+        remaining = self._in_flight[user] - 1
+        if remaining:
+            self._in_flight[user] = remaining
+        else:
+            del self._in_flight[user]
+        self._dispatch()
+
+    @asynccontextmanager
+    async def _slot(self, user: Hashable) -> AsyncIterator[None]:
+        """Waits until a request of the user may be sent, and holds its slot while the block runs.
+
+        Args:
+            user (Hashable): Whom the request is sent for. Requests of the same user share the concurrency cap.
+        """
+        priority = _priority.get()
+        waiter = _Waiter(user, time.monotonic())
+        self._queues[priority].append(waiter)
+        self._dispatch()
+        if not waiter.future.done():
+            try:
+                await waiter.future
+            except asyncio.CancelledError:
+                if waiter.future.cancelled():
+                    self._queues[priority].remove(waiter)
+                else:
+                    # Started just as it was cancelled
+                    self._release(user)
+                raise
+        try:
+            yield
+        finally:
+            self._release(user)
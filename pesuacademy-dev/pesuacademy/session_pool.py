@@ -0,0 +1,246 @@
+"""Pool of long-lived, authenticated PESU Academy sessions keyed by user."""
+
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import TypeVar
+
+from pesuacademy.cache import ResponseCache, SharedCache
+from pesuacademy.exceptions import AuthenticationError
+from pesuacademy.history import AttendanceHistory
+from pesuacademy.metrics import Metrics
+from pesuacademy.pesuacademy import PESUAcademy
+from pesuacademy.single_flight import SingleFlight
+from pesuacademy.transport import TransportConfig
+
+T = TypeVar("T")
+
+
+@dataclass
+class _PooledSession:
+    """A single pooled session along with its bookkeeping data."""
+
+    client: PESUAcademy
+    credentials_digest: str
+    created_at: float
+    last_used: float
+    leases: int = 0
+    evicted: bool = False
+
+
+@dataclass
+class _LoginLock:
+    """Serializes the logins of a single user, counting the callers holding or waiting for it."""
+
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    users: int = 0
+
+
+class SessionPool:
+    """Keeps one authenticated `PESUAcademy` session alive per user across calls.
+
+    Logging in costs several round trips and a fresh TLS handshake. The pool logs a user in once and hands the same
+    session (and its connection pool) to every subsequent caller until the session has been idle for longer than
+    `idle_ttl`, has lived longer than `max_age`, or has to make room for another user because `max_sessions` was
+    reached. Evicted sessions are closed as soon as the last caller using them has released them.
+
+    All methods must be called from the same event loop.
+    """
+
+    def __init__(
+        self,
+        idle_ttl: float = 600.0,
+        max_age: float = 3600.0,
+        max_sessions: int = 100,
+        cache: ResponseCache | None = None,
+        transport: TransportConfig | None = None,
+        base_url: str | None = None,
+        attendance_history: AttendanceHistory | None = None,
+        shared_flights: SingleFlight | None = None,
+        metrics: Metrics | None = None,
+        shared_cache: SharedCache | None = None,
+    ) -> None:
+        """Initializes an empty session pool.
+
+        Args:
+            idle_ttl (float): Seconds a session may stay unused before it is evicted.
+            max_age (float): Seconds after which a session is evicted regardless of use.
+            max_sessions (int): Maximum number of live sessions. The least recently used session is evicted first.
+            cache (Optional[ResponseCache]): A response cache shared by every session of the pool. Cached responses
+                outlive the sessions that fetched them, so a user who logs in again is served from the cache.
+            transport (Optional[TransportConfig]): Network settings shared by every session of the pool, including
+                one circuit breaker and request scheduler for all of them. Defaults to `TransportConfig()`.
+            base_url (Optional[str]): The URL of the Academy application, e.g. of a `StandInServer`. Defaults to
+                PESU Academy itself.
+            attendance_history (Optional[AttendanceHistory]): Where every session of the pool records the attendance
+                it fetches.
+            shared_flights (Optional[SingleFlight]): Lets the sessions of the pool share concurrent requests for
+                course content that is the same for every user.
+            metrics (Optional[Metrics]): Where every session of the pool measures its requests and page fetches.
+            shared_cache (Optional[SharedCache]): A cache of the course content that is the same for every user, shared
+                by every session of the pool.
+        """
+        if max_sessions < 1:
+            raise ValueError("max_sessions must be at least 1.")
+        self._idle_ttl = idle_ttl
+        self._max_age = max_age
+        self._max_sessions = max_sessions
+        self.cache = cache
+        self.transport = transport or TransportConfig()
+        self.base_url = base_url
+        self.attendance_history = attendance_history
+        self.shared_flights = shared_flights
+        self.metrics = metrics
+        self.shared_cache = shared_cache
+        self._sessions: OrderedDict[str, _PooledSession] = OrderedDict()
+        self._locks: dict[str, _LoginLock] = {}
+
+    def __len__(self) -> int:
+        """Returns the number of live sessions in the pool."""
+        return len(self._sessions)
+
+    def __contains__(self, username: str) -> bool:
+        """Returns True if a live session exists for the given user."""
+        return username in self._sessions
+
+    @staticmethod
+    def _digest(username: str, password: str) -> str:
+        """Returns a digest of the credentials so that plain passwords are never kept in the pool."""
+        return hashlib.sha256(f"{username}\0{password}".encode()).hexdigest()
+
+    def _is_expired(self, entry: _PooledSession, now: float) -> bool:
+        """Checks whether a pooled session has outlived its idle TTL or maximum age."""
+        idle = entry.leases == 0 and now - entry.last_used > self._idle_ttl
+        return idle or now - entry.created_at > self._max_age
+
+    async def _close(self, entry: _PooledSession) -> None:
+        """Closes the client of an evicted session once no caller is using it anymore."""
+        entry.evicted = True
+        if entry.leases == 0:
+            await entry.client.close()
+
+    def _discard_lock(self, username: str) -> None:
+        """Forgets a user's login lock once they have no session and no caller is holding or waiting for it."""
+        login_lock = self._locks.get(username)
+        if login_lock is not None and login_lock.users == 0 and username not in self._sessions:
+            del self._locks[username]
+
+    async def _evict(self, username: str) -> None:
+        """Removes a user's session from the pool and closes it."""
+        entry = self._sessions.pop(username, None)
+        self._discard_lock(username)
+        if entry is not None:
+            await self._close(entry)
+
+    async def _evict_stale(self) -> None:
+        """Evicts expired sessions, then the least recently used ones while the pool is over capacity."""
+        now = time.monotonic()
+        for username in [name for name, entry in self._sessions.items() if self._is_expired(entry, now)]:
+            await self._evict(username)
+        while len(self._sessions) > self._max_sessions:
+            await self._evict(next(iter(self._sessions)))
+
+    async def _acquire(self, username: str, password: str) -> _PooledSession:
+        """Returns the live session for a user, logging in if there is none."""
+        await self._evict_stale()
+        login_lock = self._locks.setdefault(username, _LoginLock())
+        login_lock.users += 1
+        try:
+            async with login_lock.lock:
+                digest = self._digest(username, password)
+                entry = self._sessions.get(username)
+                if entry is None or entry.credentials_digest != digest:
+                    # The pooled session is only replaced once the new credentials have logged in, so that a wrong
+                    # password does not log out the session of the user who knows the right one
+                    client = await PESUAcademy.login(
+                        username,
+                        password,
+                        cache=self.cache,
+                        transport=self.transport,
+                        base_url=self.base_url,
+                        attendance_history=self.attendance_history,
+                        shared_flights=self.shared_flights,
+                        metrics=self.metrics,
+                        shared_cache=self.shared_cache,
+                    )
+                    if entry is not None:
+                        await self._evict(username)
+                    now = time.monotonic()
+                    entry = _PooledSession(client=client, credentials_digest=digest, created_at=now, last_used=now)
+                    self._sessions[username] = entry
+                    await self._evict_stale()
+                entry.last_used = time.monotonic()
+                entry.leases += 1
+                self._sessions.move_to_end(username)
+                return entry
+        finally:
+            login_lock.users -= 1
+            # Also forgets the lock of a user whose login failed
+            self._discard_lock(username)
+
+    async def _release(self, entry: _PooledSession) -> None:
+        """Releases a lease on a pooled session, closing it if it was evicted while in use."""
+        entry.leases -= 1
+        entry.last_used = time.monotonic()
+        if entry.evicted and entry.leases == 0:
+            await entry.client.close()
+
+    @asynccontextmanager
+    async def session(self, username: str, password: str) -> AsyncIterator[PESUAcademy]:
+        """Leases the live session for a user, logging in first if needed.
+
+        Args:
+            username (str): The user's SRN, PRN, or other login identifier.
+            password (str): The user's password.
+
+        Yields:
+            PESUAcademy: An authenticated session. It must not be closed by the caller.
+        """
+        entry = await self._acquire(username, password)
+        try:
+            yield entry.client
+        finally:
+            await self._release(entry)
+
+    async def run(self, username: str, password: str, fn: Callable[..., Awaitable[T]], *args: object) -> T:
+        """Calls `fn(session, *args)` with the user's pooled session.
+
+        If the portal reports that the pooled session has expired, the session is replaced with a fresh login and the
+        call is retried once. A failed login is raised as it is and leaves the pooled session alone.
+
+        Args:
+            username (str): The user's SRN, PRN, or other login identifier.
+            password (str): The user's password.
+            fn (Callable[..., Awaitable[T]]): The coroutine function to call with the session as its first argument.
+            *args: Additional positional arguments for `fn`.
+
+        Returns:
+            T: Whatever `fn` returns.
+        """
+        async with self.session(username, password) as expired:
+            try:
+                return await fn(expired, *args)
+            except AuthenticationError:
+                pass
+        entry = self._sessions.get(username)
+        if entry is not None and entry.client is expired:  # Unless another caller has replaced it already
+            await self.invalidate(username)
+        async with self.session(username, password) as pesu:
+            return await fn(pesu, *args)
+
+    async def invalidate(self, username: str) -> None:
+        """Evicts and closes the session of a single user, e.g. after they log out.
+
+        Args:
+            username (str): The user whose session should be discarded.
+        """
+        await self._evict(username)
+
+    async def close(self) -> None:
+        """Evicts and closes every session in the pool."""
+        for username in list(self._sessions):
+            await self._evict(username)
@@ -0,0 +1,68 @@
+"""Single-flight execution: concurrent callers of the same request share one call."""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Runs at most one call per key at a time, handing its outcome to every caller that asked for it meanwhile.
+
+    The first caller of a key starts the call; callers of the same key that arrive before it has finished wait for
+    that call instead of starting their own, and all of them receive the same result (the very same object) or
+    exception. Once the call has finished, the next caller of the key starts a new one, so nothing is cached.
+
+    Every session deduplicates the requests of its own user this way. A `SingleFlight` passed to
+    `PESUAcademy.login()` (or a `SessionPool`) is additionally shared across users for content that is the same for
+    everyone, such as the units, topics and materials of a course.
+
+    All methods must be called from the same event loop.
+    """
+
+    def __init__(self) -> None:
+        """Initializes a single-flight group without calls in flight."""
+        self._calls: dict[Hashable, asyncio.Future[Any]] = {}
+        self.total_calls = 0
+        self.total_shared = 0
+
+    def __len__(self) -> int:
+        """Returns the number of calls in flight."""
+        return len(self._calls)
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Returns True if a call for the key is in flight, so that `do()` would join it."""
+        return key in self._calls
+
+    def status(self) -> dict[str, int]:
+        """Returns the number of calls in flight, started and joined by a duplicate caller, e.g. for monitoring."""
+        return {"in_flight": len(self._calls), "total_calls": self.total_calls, "total_shared": self.total_shared}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Returns the outcome of `fn()`, or of the call already in flight for the same key.
+
+        Args:
+            key (Hashable): What identifies the call, e.g. the page and the ID it is requested for.
+            fn (Callable[[], Awaitable[T]]): Starts the call. Only invoked if no call for the key is in flight.
+
+        Returns:
+            T: The result of the call.
+        """
+        call = self._calls.get(key)
+        if call is None:
+            call = asyncio.ensure_future(fn())
+            self._calls[key] = call
+            self.total_calls += 1
+
+            def finished(task: asyncio.Future[Any]) -> None:
+                if self._calls.get(key) is task:
+                    del self._calls[key]
+                # A failure is reported to the callers, not logged as an unretrieved exception
+                task.cancelled() or task.exception()
+
+            call.add_done_callback(finished)
+        else:
+            self.total_shared += 1
+        # Shielded so that a cancelled caller does not cancel the call shared with other callers
+        return await asyncio.shield(call)
@@ -0,0 +1,308 @@
+"""Resilient HTTP transport for PESU Academy sessions: retries, timeouts, connection limits and a circuit breaker."""
+
+import asyncio
+import contextlib
+import random
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Literal
+
+import httpx
+
+from pesuacademy import constants
+from pesuacademy.exceptions import PortalUnavailableError
+from pesuacademy.replay import Recording, _RecordingTransport
+from pesuacademy.scheduler import RequestScheduler
+from pesuacademy.util import _endpoint_name
+
+if TYPE_CHECKING:
+    from collections.abc import Hashable
+
+# Responses that mean the portal is overloaded or down rather than that the request was wrong
+_RETRYABLE_STATUS_CODES = frozenset({502, 503, 504})
+_IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+CircuitState = Literal["closed", "open", "half_open"]
+
+
+class CircuitBreaker:
+    """Stops sending requests to PESU Academy for a while after several consecutive failures.
+
+    While the breaker is closed, requests go through and failures are counted. After `failure_threshold`
+    consecutive failures it opens, and every request fails immediately with `PortalUnavailableError` instead of
+    waiting on timeouts. Once `recovery_time` has passed it lets a single probe request through (half-open): a success
+    closes the breaker again, a failure keeps it open for another `recovery_time`.
+
+    One breaker can be shared by many sessions, e.g. all sessions of a `SessionPool`, since they all talk to the same
+    portal. Its state can be read at any time for monitoring.
+    """
+
+    def __init__(self, failure_threshold: int = 5, recovery_time: float = 30.0) -> None:
+        """Initializes a closed circuit breaker.
+
+        Args:
+            failure_threshold (int): Consecutive failures after which the breaker opens.
+            recovery_time (float): Seconds the breaker stays open before letting a probe request through.
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_time = recovery_time
+        self._state: CircuitState = "closed"
+        self._consecutive_failures = 0
+        self._opened_at: float | None = None
+        # Identifies the probe request in flight while half-open, if any
+        self._probe: object | None = None
+        self.total_failures = 0
+        self.total_rejected = 0
+        self.times_opened = 0
+
+    @property
+    def state(self) -> CircuitState:
+        """The current state: "closed", "open" or "half_open"."""
+        if self._state == "open" and self._seconds_until_probe() <= 0:
+            return "half_open"
+        return self._state
+
+    def _seconds_until_probe(self) -> float:
+        """Returns how long the open breaker still rejects requests."""
+        if self._opened_at is None:
+            return 0.0
+        return self._opened_at + self.recovery_time - time.monotonic()
+
+    def status(self) -> dict[str, object]:
+        """Returns the breaker's state and counters, e.g. to export them to a monitoring system."""
+        return {
+            "state": self.state,
+            "consecutive_failures": self._consecutive_failures,
+            "retry_after": max(self._seconds_until_probe(), 0.0) if self._state == "open" else 0.0,
+            "total_failures": self.total_failures,
+            "total_rejected": self.total_rejected,
+            "times_opened": self.times_opened,
+        }
+
+    def _before_request(self) -> object | None:
+        """Lets a request through, or raises if the breaker is open.
+
+        Returns:
+            A token if the request is the probe of a half-open breaker, None otherwise. It is passed back with the
+            outcome of the request, so that only the probe itself frees the probe slot.
+
+        Raises:
+            PortalUnavailableError: If the breaker is open, or half-open with its probe request still in flight.
+        """
+        if self._state == "closed":
+            return None
+        retry_after = self._seconds_until_probe()
+        if retry_after <= 0 and self._probe is None:
+            self._state = "half_open"
+            self._probe = object()
+            return self._probe
+        self.total_rejected += 1
+        raise PortalUnavailableError(
+            "PESU Academy is not responding right now. Please try again in a little while.",
+            retry_after=max(retry_after, 0.0),
+        )
+
+    def _finish_probe(self, probe: object | None) -> None:
+        """Frees the probe slot if the finished request was the probe in flight."""
+        if probe is not None and probe is self._probe:
+            self._probe = None
+
+    def _record_success(self, probe: object | None = None) -> None:
+        """Closes the breaker after a successful request.
+
+        Args:
+            probe (Optional[object]): The token `_before_request()` returned for the request.
+        """
+        self._state = "closed"
+        self._consecutive_failures = 0
+        self._opened_at = None
+        self._finish_probe(probe)
+
+    def _record_failure(self, probe: object | None = None) -> None:
+        """Counts a failed request and opens the breaker if there have been too many in a row.
+
+        Args:
+            probe (Optional[object]): The token `_before_request()` returned for the request.
+        """
+        self.total_failures += 1
+        self._consecutive_failures += 1
+        if self._state == "half_open" or self._consecutive_failures >= self.failure_threshold:
+            if self._state != "open":
+                self.times_opened += 1
+            self._state = "open"
+            self._opened_at = time.monotonic()
+        self._finish_probe(probe)
+
+    def _record_cancelled(self, probe: object | None = None) -> None:
+        """Frees the probe slot if the probe request was cancelled before it could succeed or fail.
+
+        Args:
+            probe (Optional[object]): The token `_before_request()` returned for the request.
+        """
+        self._finish_probe(probe)
+
+    def reset(self) -> None:
+        """Closes the breaker and clears the consecutive failure count."""
+        self._record_success()
+        self._probe = None
+
+
+@dataclass
+class TransportConfig:
+    """Network settings of PESU Academy sessions.
+
+    A single instance (and its circuit breaker and request scheduler) can be shared by any number of sessions.
+
+    Attributes:
+        connect_timeout (float): Seconds to wait for a connection to be established.
+        read_timeout (float): Seconds to wait for data from the portal, unless overridden for the endpoint.
+        read_timeouts (Dict[str, float]): Read timeouts keyed by endpoint name, overriding `read_timeout`. Defaults
+            to `constants.READ_TIMEOUTS`.
+        retries (int): How many times a failed idempotent request (GET) is retried. Connection errors, timeouts and
+            502/503/504 responses are retried; other responses are returned as they are.
+        backoff_base (float): Upper bound of the first retry delay, in seconds. It doubles with every retry, and
+            the actual delay is picked at random below it (full jitter) so that clients do not retry in lockstep.
+        backoff_max (float): Upper bound of any retry delay, in seconds.
+        max_connections (int): Maximum number of open connections per session.
+        max_keepalive_connections (int): Maximum number of idle connections kept open per session.
+        keepalive_expiry (float): Seconds an idle connection is kept open.
+        http2 (bool): Whether to use HTTP/2. Requires the optional `h2` package (`pip install httpx[http2]`).
+        breaker (Optional[CircuitBreaker]): The circuit breaker to use. None disables it.
+        scheduler (Optional[RequestScheduler]): The rate limit, per-user concurrency cap and priorities that every
+            request sent to the portal (including each retry) goes through. None sends requests right away.
+        network (Optional[httpx.AsyncBaseTransport]): The transport that sends the requests. Defaults to an httpx
+            connection pool with the limits above. Pass `Recording.mock_transport()` to replay a recorded session.
+    """
+
+    connect_timeout: float = 5.0
+    read_timeout: float = 15.0
+    read_timeouts: dict[str, float] = field(default_factory=lambda: dict(constants.READ_TIMEOUTS))
+    retries: int = 2
+    backoff_base: float = 0.5
+    backoff_max: float = 8.0
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    keepalive_expiry: float = 30.0
+    http2: bool = False
+    breaker: CircuitBreaker | None = field(default_factory=CircuitBreaker)
+    scheduler: RequestScheduler | None = field(default_factory=RequestScheduler)
+    network: httpx.AsyncBaseTransport | None = None
+
+    def timeout(self) -> httpx.Timeout:
+        """Returns the default timeout of a session."""
+        return httpx.Timeout(self.read_timeout, connect=self.connect_timeout)
+
+    def _build(self, recording: Recording | None = None) -> "_ResilientTransport":
+        """Creates the transport stack of a session: retries and circuit breaker over a tuned connection pool.
+
+        Args:
+            recording (Optional[Recording]): If given, every response received from the network is added to it.
+        """
+        network = self.network or self._connection_pool()
+        if recording is not None:
+            network = _RecordingTransport(network, recording)
+        return _ResilientTransport(network, self)
+
+    def _connection_pool(self) -> httpx.AsyncBaseTransport:
+        """Creates the httpx connection pool of a session."""
+        limits = httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+        if self.http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError as e:
+                raise ImportError(
+                    "HTTP/2 support requires the h2 package. Install it with `pip install httpx[http2]`."
+                ) from e
+        return httpx.AsyncHTTPTransport(limits=limits, http2=self.http2)
+
+
+class _ResilientTransport(httpx.AsyncBaseTransport):
+    """An httpx transport that applies per-endpoint timeouts, retries idempotent requests and trips a breaker."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, config: TransportConfig) -> None:
+        """Wraps a transport.
+
+        Args:
+            transport (httpx.AsyncBaseTransport): The transport that sends the requests.
+            config (TransportConfig): The retry, timeout and breaker settings.
+        """
+        self._transport = transport
+        self._config = config
+        # Whom the requests are sent for, as far as the scheduler is concerned; set at login
+        self.user: Hashable = self
+
+    def _backoff(self, attempt: int) -> float:
+        """Returns a random delay before the given retry (1 for the first one)."""
+        return random.uniform(0, min(self._config.backoff_max, self._config.backoff_base * 2 ** (attempt - 1)))
+
+    def _apply_timeout(self, request: httpx.Request) -> None:
+        """Replaces the read timeout of a request with the one configured for its endpoint, if any."""
+        endpoint = _endpoint_name(request)
+        read_timeout = self._config.read_timeouts.get(endpoint) if endpoint else None
+        if read_timeout is not None:
+            timeout = dict(request.extensions.get("timeout", self._config.timeout().as_dict()))
+            timeout["read"] = read_timeout
+            request.extensions["timeout"] = timeout
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        """Sends a request, retrying it on transient failures and recording the outcome in the breaker.
+
+        Raises:
+            PortalUnavailableError: If the circuit breaker is open.
+            httpx.TransportError: If the request still fails after all retries.
+        """
+        breaker = self._config.breaker
+        probe = breaker._before_request() if breaker is not None else None
+        self._apply_timeout(request)
+        if breaker is None:
+            return await self._send(request)
+        try:
+            response = await self._send(request)
+        except httpx.TransportError:
+            breaker._record_failure(probe)
+            raise
+        else:
+            if response.status_code in _RETRYABLE_STATUS_CODES:
+                breaker._record_failure(probe)
+            else:
+                breaker._record_success(probe)
+            return response
+        finally:
+            # Whatever else ended the request, e.g. a cancellation while backing off, must not keep the probe slot.
+            # Once the outcome has been recorded, the slot is free already and this does nothing.
+            breaker._record_cancelled(probe)
+
+    async def _send(self, request: httpx.Request) -> httpx.Response:
+        """Sends a request, retrying idempotent ones after transport errors and 502/503/504 responses.
+
+        Returns:
+            httpx.Response: The first response that is not retried, or the last one once the retries are used up.
+
+        Raises:
+            httpx.TransportError: If the last attempt failed.
+        """
+        retries = self._config.retries if request.method in _IDEMPOTENT_METHODS else 0
+        scheduler = self._config.scheduler
+
+        attempt = 0
+        while True:
+            try:
+                async with scheduler._slot(self.user) if scheduler is not None else contextlib.nullcontext():
+                    response = await self._transport.handle_async_request(request)
+            except httpx.TransportError:
+                if attempt >= retries:
+                    raise
+            else:
+                if response.status_code not in _RETRYABLE_STATUS_CODES or attempt >= retries:
+                    return response
+                await response.aclose()
+            attempt += 1
+            await asyncio.sleep(self._backoff(attempt))
+
+    async def aclose(self) -> None:
+        """Closes the wrapped transport."""
+        await self._transport.aclose()
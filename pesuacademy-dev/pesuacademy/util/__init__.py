@@ -1,5 +1,5 @@
 """Utility functions for PESU Academy package."""
 
-from .utils import _build_params
+from .utils import _build_params, _endpoint_name, _extract_csrf_token, _gather_or_cancel, _stream_from_producer
 
-__all__ = ["_build_params"]
+__all__ = ["_build_params", "_endpoint_name", "_extract_csrf_token", "_gather_or_cancel", "_stream_from_producer"]
@@ -1,7 +1,27 @@
 """Utility functions for PESU Academy package."""
 
+import asyncio
 import datetime
-from typing import Protocol
+import re
+from collections.abc import AsyncIterator, Awaitable, Callable, Coroutine
+from dataclasses import dataclass
+from typing import Any, Protocol
+
+import httpx
+
+from pesuacademy import constants
+from pesuacademy.exceptions import CSRFTokenError
+
+# The <meta name="csrf-token" content="..."> tag, with its attributes in any order
+_CSRF_META_PATTERN = re.compile(rb"<meta\b[^>]*\bname=[\"']csrf-token[\"'][^>]*>", re.IGNORECASE)
+_CONTENT_ATTR_PATTERN = re.compile(rb"\bcontent=[\"']([^\"']*)[\"']", re.IGNORECASE)
+
+# Maps the (menuId, controllerMode, actionType) triple of every known page to its name in _PageURLParams
+_ENDPOINT_NAMES = {
+    (page.MENU_ID, page.CONTROLLER_MODE, page.ACTION_TYPE): name
+    for name, page in vars(constants._PageURLParams).items()
+    if isinstance(page, type)
+}
 
 
 class _PageURLParams(Protocol):
@@ -33,3 +53,105 @@ def _build_params(params_obj: _PageURLParams, **kwargs: str) -> dict[str, str]:
     params["_"] = str(int(datetime.datetime.now().timestamp() * 1000))
 
     return params
+
+
+def _endpoint_name(request: httpx.Request) -> str | None:
+    """Returns the name of the page a request is for, or None if it is not one of the known endpoints.
+
+    Page names match the classes in `constants._PageURLParams`, plus "Semesters" for the semester list.
+    """
+    path = request.url.path
+    if path.endswith(constants.SEMESTER_BASE_URL):
+        return "Semesters"
+    if not path.endswith(constants.PAGES_BASE_URL):
+        return None
+    params = request.url.params
+    return _ENDPOINT_NAMES.get((params.get("menuId"), params.get("controllerMode"), params.get("actionType")))
+
+
+def _extract_csrf_token(content: bytes) -> str:
+    """Extracts the CSRF token from the raw bytes of a page without parsing the whole document.
+
+    Args:
+        content (bytes): The raw response body.
+
+    Returns:
+        str: The value of the page's csrf-token meta tag.
+
+    Raises:
+        CSRFTokenError: If the page does not contain a CSRF token.
+    """
+    meta = _CSRF_META_PATTERN.search(content)
+    token = _CONTENT_ATTR_PATTERN.search(meta.group(0)) if meta else None
+    if token is None:
+        raise CSRFTokenError("CSRF token not found on the page.")
+    return token.group(1).decode()
+
+
+@dataclass(frozen=True)
+class _ProducerFailed:
+    """Carries the exception that stopped a producer to the consuming side of a stream."""
+
+    error: Exception
+
+
+async def _gather_or_cancel[T](*coros: Coroutine[Any, Any, T]) -> list[T]:
+    """Runs coroutines concurrently like `asyncio.gather()`, but cancels the others as soon as one of them fails.
+
+    Raises:
+        Exception: The first failure, rather than the exception group wrapping it.
+    """
+    try:
+        async with asyncio.TaskGroup() as tasks:
+            running = [tasks.create_task(coro) for coro in coros]
+    except ExceptionGroup as group:
+        raise group.exceptions[0] from None
+    return [task.result() for task in running]
+
+
+_END_OF_STREAM = object()
+
+
+async def _stream_from_producer[T](
+    produce: Callable[[Callable[[T], Awaitable[None]]], Awaitable[None]], buffer_size: int = 16
+) -> AsyncIterator[T]:
+    """Runs a producer in the background and yields the items it emits, in the order they are emitted.
+
+    The producer is called with an `emit` coroutine function. At most `buffer_size` items are buffered: once the
+    buffer is full, `emit` waits until the consumer catches up, which pauses the producer. If the consumer stops
+    iterating early or is cancelled, the producer is cancelled too.
+
+    Args:
+        produce: A coroutine function that calls `await emit(item)` for every item it produces.
+        buffer_size (int): Maximum number of items produced ahead of the consumer.
+
+    Yields:
+        T: The emitted items.
+
+    Raises:
+        Exception: Whatever the producer raised, after all items emitted before the failure have been yielded.
+    """
+    queue: asyncio.Queue[object] = asyncio.Queue(buffer_size)
+
+    async def run() -> None:
+        try:
+            await produce(queue.put)
+        except Exception as e:
+            await queue.put(_ProducerFailed(e))
+        else:
+            await queue.put(_END_OF_STREAM)
+
+    task = asyncio.create_task(run())
+    try:
+        while True:
+            item = await queue.get()
+            if item is _END_OF_STREAM:
+                return
+            if isinstance(item, _ProducerFailed):
+                raise item.error
+            yield item
+    finally:
+        if not task.done():
+            task.cancel()
+        # Wait for the producer to wind down so that none of its requests outlive the stream
+        await asyncio.gather(task, return_exceptions=True)
@@ -0,0 +1,138 @@
+import asyncio
+import time
+
+import pytest
+
+from pesuacademy import RequestScheduler, request_priority
+
+
+async def _hold(scheduler: RequestScheduler, user: str, started: list[str], name: str, release: asyncio.Event) -> None:
+    async with scheduler._slot(user):
+        started.append(name)
+        await release.wait()
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_allows_burst_then_rate():
+    scheduler = RequestScheduler(rate=20.0, burst=2, per_user_concurrency=10)
+    start = time.monotonic()
+    times = []
+
+    async def request(user: str) -> None:
+        async with scheduler._slot(user):
+            times.append(time.monotonic() - start)
+
+    await asyncio.gather(*(request(f"user-{i}") for i in range(4)))
+
+    assert times[0] < 0.02 and times[1] < 0.02
+    # The third and fourth request each wait for a token, earned every 1/20 s
+    assert times[2] >= 0.04
+    assert times[3] >= 0.09
+    assert scheduler.status()["total_requests"] == 4
+
+
+@pytest.mark.asyncio
+async def test_per_user_concurrency_cap():
+    scheduler = RequestScheduler(rate=1000.0, burst=100, per_user_concurrency=1)
+    started: list[str] = []
+    release = asyncio.Event()
+    tasks = [
+        asyncio.create_task(_hold(scheduler, "alice", started, "alice-1", release)),
+        asyncio.create_task(_hold(scheduler, "alice", started, "alice-2", release)),
+        asyncio.create_task(_hold(scheduler, "bob", started, "bob-1", release)),
+    ]
+    await asyncio.sleep(0.01)
+
+    # Alice's second request waits for her first one, Bob's does not
+    assert started == ["alice-1", "bob-1"]
+    assert scheduler.status()["queued"]["interactive"] == 1
+
+    release.set()
+    await asyncio.gather(*tasks)
+    assert started == ["alice-1", "bob-1", "alice-2"]
+    assert scheduler.status()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_interactive_requests_start_before_prefetch():
+    scheduler = RequestScheduler(rate=50.0, burst=1, per_user_concurrency=10)
+    started: list[str] = []
+    release = asyncio.Event()
+    release.set()
+    # Uses up the only token, so that the next requests queue
+    await _hold(scheduler, "alice", started, "first", release)
+
+    with request_priority("prefetch"):
+        prefetch = [asyncio.create_task(_hold(scheduler, "alice", started, f"prefetch-{i}", release)) for i in range(2)]
+    interactive = [asyncio.create_task(_hold(scheduler, "bob", started, f"interactive-{i}", release)) for i in range(2)]
+    await asyncio.gather(*prefetch, *interactive)
+
+    assert started == ["first", "interactive-0", "interactive-1", "prefetch-0", "prefetch-1"]
+
+
+def test_unknown_priority_is_rejected():
+    with pytest.raises(ValueError):
+        with request_priority("urgent"):  # type: ignore[arg-type]
+            pass
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_leaves_the_queue():
+    scheduler = RequestScheduler(rate=1000.0, burst=100, per_user_concurrency=1)
+    started: list[str] = []
+    release = asyncio.Event()
+    holder = asyncio.create_task(_hold(scheduler, "alice", started, "holder", release))
+    waiter = asyncio.create_task(_hold(scheduler, "alice", started, "waiter", release))
+    await asyncio.sleep(0.01)
+    assert scheduler.status()["queued"]["interactive"] == 1
+
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    assert scheduler.status()["queued"]["interactive"] == 0
+
+    release.set()
+    await holder
+    assert started == ["holder"]
+    assert scheduler.status()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_request_releases_its_slot():
+    scheduler = RequestScheduler(rate=1000.0, burst=100, per_user_concurrency=1)
+    started: list[str] = []
+    release = asyncio.Event()
+    holder = asyncio.create_task(_hold(scheduler, "alice", started, "holder", release))
+    await asyncio.sleep(0.01)
+    assert scheduler.status()["in_flight"] == 1
+
+    holder.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await holder
+    assert scheduler.status()["in_flight"] == 0
+
+    # The user's slot is free again
+    release.set()
+    await asyncio.wait_for(_hold(scheduler, "alice", started, "next", release), timeout=1)
+    assert started == ["holder", "next"]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_take_a_freed_slot():
+    scheduler = RequestScheduler(rate=1000.0, burst=100, per_user_concurrency=1)
+    started: list[str] = []
+    release = asyncio.Event()
+    holder = asyncio.create_task(_hold(scheduler, "alice", started, "holder", release))
+    cancelled = asyncio.create_task(_hold(scheduler, "alice", started, "cancelled", release))
+    waiting = asyncio.create_task(_hold(scheduler, "alice", started, "waiting", release))
+    await asyncio.sleep(0.01)
+
+    # Cancelled while queued, then the slot frees up before the cancelled task runs again
+    cancelled.cancel()
+    release.set()
+    await asyncio.gather(holder, waiting)
+    with pytest.raises(asyncio.CancelledError):
+        await cancelled
+
+    assert started == ["holder", "waiting"]
+    assert scheduler.status()["in_flight"] == 0
@@ -0,0 +1,107 @@
+import asyncio
+from unittest import mock
+
+import pytest
+
+from pesuacademy import SessionPool
+from pesuacademy.exceptions import AuthenticationError
+
+
+class _Client:
+    async def close(self) -> None:
+        pass
+
+
+@pytest.fixture
+def logins():
+    calls: list[str] = []
+
+    async def login(username: str, password: str, **kwargs: object) -> _Client:
+        calls.append(username)
+        await asyncio.sleep(0.01)
+        if password == "wrong":
+            raise AuthenticationError("Authentication failed.")
+        return _Client()
+
+    with mock.patch("pesuacademy.session_pool.PESUAcademy.login", side_effect=login):
+        yield calls
+
+
+async def _use(pool: SessionPool, username: str, password: str = "password") -> None:
+    try:
+        async with pool.session(username, password):
+            await asyncio.sleep(0.005)
+    except AuthenticationError:
+        pass
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_login(logins):
+    pool = SessionPool()
+    await asyncio.gather(*(_use(pool, "alice") for _ in range(10)))
+    assert logins == ["alice"]
+
+
+@pytest.mark.asyncio
+async def test_login_locks_are_dropped_with_their_sessions(logins):
+    pool = SessionPool(max_sessions=3)
+    await asyncio.gather(*(_use(pool, f"user-{i % 10}") for i in range(50)))
+    assert len(pool) == 3
+    assert pool._locks.keys() == pool._sessions.keys()
+
+    await pool.invalidate(next(iter(pool._sessions)))
+    assert pool._locks.keys() == pool._sessions.keys()
+
+    await pool.close()
+    assert not pool._locks
+
+
+@pytest.mark.asyncio
+async def test_failed_logins_leave_no_lock_behind(logins):
+    pool = SessionPool()
+    await asyncio.gather(*(_use(pool, f"user-{i}", "wrong") for i in range(20)))
+    assert len(pool) == 0
+    assert not pool._locks
+
+
+@pytest.mark.asyncio
+async def test_wrong_password_keeps_the_pooled_session(logins):
+    pool = SessionPool()
+    async with pool.session("alice", "password") as pesu:
+        pass
+
+    with pytest.raises(AuthenticationError):
+        async with pool.session("alice", "wrong"):
+            pass
+    with pytest.raises(AuthenticationError):
+        await pool.run("alice", "wrong", lambda session: asyncio.sleep(0))
+
+    async with pool.session("alice", "password") as same:
+        assert same is pesu
+    assert logins == ["alice"] * 3
+
+
+@pytest.mark.asyncio
+async def test_new_password_replaces_the_pooled_session(logins):
+    pool = SessionPool()
+    async with pool.session("alice", "password") as old:
+        pass
+    async with pool.session("alice", "new-password") as new:
+        assert new is not old
+    assert len(pool) == 1
+
+
+@pytest.mark.asyncio
+async def test_expired_session_is_replaced_once(logins):
+    pool = SessionPool()
+    sessions = []
+
+    async def fetch(session: _Client) -> str:
+        sessions.append(session)
+        if len(sessions) == 1:
+            raise AuthenticationError("Session expired.")
+        return "ok"
+
+    assert await pool.run("alice", "password", fetch) == "ok"
+    assert sessions[0] is not sessions[1]
+    assert logins == ["alice", "alice"]
@@ -0,0 +1,123 @@
+import asyncio
+from unittest import mock
+
+import httpx
+import pytest
+
+from pesuacademy import CircuitBreaker, TransportConfig
+from pesuacademy.exceptions import PortalUnavailableError
+
+
+def _open_breaker() -> CircuitBreaker:
+    """Returns a breaker that has just opened and is ready to let its probe through."""
+    breaker = CircuitBreaker(failure_threshold=1, recovery_time=0.0)
+    breaker._record_failure()
+    assert breaker.state == "half_open"
+    return breaker
+
+
+def test_only_one_probe_is_let_through():
+    breaker = _open_breaker()
+    assert breaker._before_request() is not None
+    with pytest.raises(PortalUnavailableError):
+        breaker._before_request()
+
+
+@pytest.mark.parametrize("outcome", ["_record_success", "_record_failure", "_record_cancelled"])
+def test_other_requests_do_not_free_the_probe_slot(outcome):
+    breaker = CircuitBreaker(failure_threshold=1, recovery_time=0.0)
+    # Let through while the breaker was closed, and finishes while the probe is in flight
+    straggler = breaker._before_request()
+    breaker._record_failure()
+    probe = breaker._before_request()
+
+    getattr(breaker, outcome)(straggler)
+    if breaker.state != "closed":
+        with pytest.raises(PortalUnavailableError):
+            breaker._before_request()
+
+    breaker._record_failure(probe)
+    assert breaker._before_request() is not None
+
+
+def test_probe_outcome_closes_or_reopens_the_breaker():
+    breaker = _open_breaker()
+    breaker._record_success(breaker._before_request())
+    assert breaker.state == "closed"
+
+    breaker = _open_breaker()
+    probe = breaker._before_request()
+    breaker.recovery_time = 60.0
+    breaker._record_failure(probe)
+    assert breaker.state == "open"
+    assert breaker.times_opened == 2
+
+
+def test_probe_from_before_a_reset_does_not_free_the_next_probe():
+    breaker = _open_breaker()
+    old_probe = breaker._before_request()
+    breaker.reset()
+    breaker._record_failure()
+    breaker._before_request()
+
+    breaker._record_cancelled(old_probe)
+    with pytest.raises(PortalUnavailableError):
+        breaker._before_request()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_probe_frees_the_slot():
+    started = asyncio.Event()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        started.set()
+        await asyncio.sleep(10)
+        return httpx.Response(200)
+
+    breaker = _open_breaker()
+    config = TransportConfig(breaker=breaker, scheduler=None, network=httpx.MockTransport(handler))
+    async with httpx.AsyncClient(transport=config._build()) as client:
+        request = asyncio.create_task(client.get("https://example.com/"))
+        await started.wait()
+        with pytest.raises(PortalUnavailableError):
+            await client.get("https://example.com/")
+
+        request.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await request
+    assert breaker._before_request() is not None
+
+
+@pytest.mark.asyncio
+async def test_probe_cancelled_while_backing_off_frees_the_slot():
+    sent = asyncio.Event()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        sent.set()
+        return httpx.Response(503)
+
+    breaker = _open_breaker()
+    config = TransportConfig(breaker=breaker, scheduler=None, network=httpx.MockTransport(handler))
+    # The request is cancelled while it waits to retry the 503
+    with mock.patch("pesuacademy.transport.random.uniform", return_value=10.0):
+        async with httpx.AsyncClient(transport=config._build()) as client:
+            request = asyncio.create_task(client.get("https://example.com/"))
+            await sent.wait()
+            await asyncio.sleep(0)
+            request.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await request
+    assert breaker._before_request() is not None
+
+
+@pytest.mark.asyncio
+async def test_probe_failing_unexpectedly_frees_the_slot():
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise RuntimeError("unexpected")
+
+    breaker = _open_breaker()
+    config = TransportConfig(breaker=breaker, scheduler=None, network=httpx.MockTransport(handler))
+    async with httpx.AsyncClient(transport=config._build()) as client:
+        with pytest.raises(RuntimeError):
+            await client.get("https://example.com/")
+    assert breaker._before_request() is not None
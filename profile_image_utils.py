@@ -0,0 +1,160 @@
+import base64
+import hashlib
+import hmac
+import os
+import tempfile
+from io import BytesIO
+import streamlit as st
+from cryptography.fernet import Fernet, InvalidToken
+
+PROFILE_IMAGE_DIR = ".profile_images"
+# Longest side of the thumbnail shown on the profile page, in pixels
+THUMBNAIL_SIZE = 256
+
+
+def _encryption_key() -> bytes:
+    # Imported here since session_utils imports this module
+    from session_utils import get_encryption_key
+
+    return get_encryption_key()
+
+
+def profile_image_ref(username: str) -> str:
+    """Get the reference under which a user's profile photo is stored.
+
+    Derived from the username so it can be kept in session files and state
+    instead of the photo itself. It is keyed with the session key, so SRNs
+    can't be recovered from file names by hashing every possible one.
+    """
+    username = username.strip().upper().encode()
+    return hmac.new(_encryption_key(), username, hashlib.sha256).hexdigest()[:32]
+
+
+def _image_path(ref: str, thumbnail: bool = False) -> str:
+    return os.path.join(PROFILE_IMAGE_DIR, f"{ref}{'_thumb' if thumbnail else ''}.enc")
+
+
+def _legacy_image_paths(username: str) -> list:
+    # Photos used to be stored unencrypted under an unkeyed hash of the username
+    ref = hashlib.sha256(username.strip().upper().encode()).hexdigest()[:32]
+    return [os.path.join(PROFILE_IMAGE_DIR, f"{ref}{suffix}.jpg") for suffix in ("", "_thumb")]
+
+
+def _remove_files(paths):
+    for path in paths:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def _make_thumbnail(image_bytes: bytes) -> bytes:
+    """Downscale a photo for display, or return it unchanged if Pillow can't."""
+    try:
+        from PIL import Image
+
+        with Image.open(BytesIO(image_bytes)) as image:
+            if max(image.size) <= THUMBNAIL_SIZE:
+                return image_bytes
+            image.thumbnail((THUMBNAIL_SIZE, THUMBNAIL_SIZE))
+            output = BytesIO()
+            image.convert("RGB").save(output, format="JPEG", quality=85, optimize=True)
+            return output.getvalue()
+    except Exception:
+        return image_bytes
+
+
+def _write_file(path: str, data: bytes):
+    # Encrypt with the session key, then write to a temporary file of our own
+    # first, so that readers never see half a photo and tabs don't collide
+    encrypted = Fernet(_encryption_key()).encrypt(data)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(encrypted)
+        os.replace(tmp_path, path)
+    except BaseException:
+        _remove_files([tmp_path])
+        raise
+
+
+def save_profile_image(username: str, image_bytes: bytes) -> str:
+    """Store a user's profile photo and its thumbnail once, returning the reference."""
+    ref = profile_image_ref(username)
+    os.makedirs(PROFILE_IMAGE_DIR, exist_ok=True)
+    _write_file(_image_path(ref), image_bytes)
+    _write_file(_image_path(ref, thumbnail=True), _make_thumbnail(image_bytes))
+    _remove_files(_legacy_image_paths(username))
+    return ref
+
+
+def store_profile_image_from_profile(username: str, profile):
+    """Move the base64 photo out of a profile into the image store.
+
+    Handles profiles fetched with the photo inlined and sessions saved before
+    photos were stored separately. Returns the profile without the photo.
+    """
+    personal = profile.get('personal') if isinstance(profile, dict) else getattr(profile, 'personal', None)
+    image_data = personal.get('image') if isinstance(personal, dict) else getattr(personal, 'image', None)
+    if not image_data:
+        return profile
+    try:
+        save_profile_image(username, base64.b64decode(image_data))
+    except Exception:
+        pass
+    if isinstance(personal, dict):
+        personal['image'] = None
+    else:
+        personal.image = None
+    return profile
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def _read_thumbnail(path: str, mtime: float):
+    # mtime is part of the cache key, so a re-stored photo is read again
+    with open(path, 'rb') as f:
+        return Fernet(_encryption_key()).decrypt(f.read())
+
+
+async def _fetch_profile_image(pesu):
+    return await pesu.get_profile_image(), None
+
+
+def get_profile_thumbnail(username: str, fetch=None):
+    """Get the thumbnail of a user's profile photo, or None if there is none.
+
+    The photo is read from the image store; if it isn't stored yet and a
+    `fetch` callable (like pesu_utils.run_with_pesu) is given, it is fetched
+    from PESU Academy once and stored.
+    """
+    if not username:
+        return None
+    path = _image_path(profile_image_ref(username), thumbnail=True)
+    legacy_path = _legacy_image_paths(username)[0]
+    if not os.path.exists(path) and os.path.exists(legacy_path):
+        # Encrypt a photo stored by an older version, removing the original
+        with open(legacy_path, 'rb') as f:
+            save_profile_image(username, f.read())
+    if not os.path.exists(path):
+        if fetch is None:
+            return None
+        image_bytes, error = fetch(_fetch_profile_image)
+        if error or not image_bytes:
+            return None
+        save_profile_image(username, image_bytes)
+    try:
+        return _read_thumbnail(path, os.path.getmtime(path))
+    except InvalidToken:
+        # Encrypted with a session key that has since changed, so fetch it again next time
+        delete_profile_image(username)
+        return None
+    except OSError:
+        return None
+
+
+def delete_profile_image(username: str):
+    """Remove a user's stored profile photo and thumbnail."""
+    if not username:
+        return
+    ref = profile_image_ref(username)
+    _remove_files([_image_path(ref), _image_path(ref, thumbnail=True), *_legacy_image_paths(username)])
@@ -8,6 +8,7 @@ import base64
 import time
 import uuid
 from extra_streamlit_components import CookieManager
+from profile_image_utils import profile_image_ref, store_profile_image_from_profile
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
@@ -159,10 +160,23 @@ def restore_session_from_cookie():
             os.remove(session_file)
             return
 
+        username = session_data.get("username")
+        profile = session_data.get("profile")
+        # Sessions saved before photos were stored separately carry the whole
+        # base64 photo: move it to the image store and rewrite the file without it
+        if username and "profile_image_ref" not in session_data:
+            store_profile_image_from_profile(username, profile)
+            session_data["profile_image_ref"] = profile_image_ref(username)
+            encrypted_data = encrypt_data(json.dumps(session_data))
+            if encrypted_data:
+                with open(session_file, 'w') as f:
+                    f.write(encrypted_data)
+
         # Restore session to Streamlit state
         st.session_state.logged_in = True
-        st.session_state.profile = session_data.get("profile")
-        st.session_state.pesu_username = session_data.get("username")
+        st.session_state.profile = profile
+        st.session_state.profile_image_ref = session_data.get("profile_image_ref")
+        st.session_state.pesu_username = username
         st.session_state.pesu_password = session_data.get("password")
         
     except Exception as e:
@@ -191,10 +205,15 @@ def save_session_cookie(username: str, password: str, profile):
         else:
             profile_dict = profile.__dict__ if hasattr(profile, "__dict__") else {}
 
+        # Only a reference to the profile photo goes into the session; the
+        # photo itself is stored once per user (see profile_image_utils)
+        profile_dict = store_profile_image_from_profile(username, profile_dict)
+
         session_data = {
             "username": username,
             "password": password,
             "profile": profile_dict,
+            "profile_image_ref": profile_image_ref(username),
             "timestamp": time.time(),
         }
 
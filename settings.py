@@ -1,7 +1,8 @@
 import streamlit as st
-import base64
 from io import BytesIO
 from session_utils import restore_session_from_cookie, clear_session_cookie
+from pesu_utils import drop_pesu_session, run_with_pesu
+from profile_image_utils import delete_profile_image, get_profile_thumbnail
 
 # Safely import role utilities
 try:
@@ -42,12 +43,10 @@ else:
 col_img, col_details = st.columns([1, 3])
 
 with col_img:
-    # Display profile image if available
-    image_data = personal.get('image') if isinstance(personal, dict) else personal.image
-    if image_data:
+    # Display profile image if available (fetched once, then served from the image store)
+    image_bytes = get_profile_thumbnail(st.session_state.get('pesu_username'), run_with_pesu)
+    if image_bytes:
         try:
-            # Decode base64 image
-            image_bytes = base64.b64decode(image_data)
             st.image(image_bytes, use_container_width=True)
         except:
             # If decoding fails, show placeholder
@@ -152,10 +151,13 @@ st.header("Account")
 if st.button("Logout", use_container_width=True, type="secondary",icon=":material/logout:"):
     # Clear session
     clear_session_cookie()
+    drop_pesu_session(st.session_state.get('pesu_username'))
+    delete_profile_image(st.session_state.get('pesu_username'))
     
     # Clear session state
     st.session_state.logged_in = False
     st.session_state.profile = None
+    st.session_state.profile_image_ref = None
     st.session_state.pesu_username = None
     st.session_state.pesu_password = None
     st.success("Peace out bestie! See u later 👋✨")
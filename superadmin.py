@@ -6,6 +6,8 @@ from calendar_utils import (
     get_semester_settings, save_semester_settings
 )
 from role_utils import is_superadmin
+from pesu_utils import get_metrics, get_session_pool, run_async
+from pesuacademy import get_parse_memo, parse_executor_status
 
 restore_session_from_cookie()
 
@@ -151,3 +153,69 @@ try:
                                 st.error(f"Failed to update: {e}")
 except Exception as exc:
     st.error(f"Couldn't load events ngl 😪 {exc}")
+
+st.divider()
+st.subheader("📈 PESU Academy Health")
+
+
+async def _read_health():
+    # Read on the PESU event loop, which is the only one updating these
+    pool = get_session_pool()
+    scheduler = pool.transport.scheduler
+    return (
+        get_metrics().snapshot(),
+        scheduler.status() if scheduler else None,
+        parse_executor_status(),
+        get_parse_memo().status() if get_parse_memo() else None,
+        get_metrics().to_prometheus(),
+    )
+
+
+try:
+    snapshot, scheduler_status, parse_status, memo_status, prometheus_text = run_async(_read_health())
+    histograms = snapshot["histograms"]
+    counters = snapshot["counters"]
+
+    if not histograms.get("page_seconds") and not histograms.get("request_seconds"):
+        st.info("No requests measured yet, come back after some traffic 🦗")
+    else:
+        rows = []
+        for endpoint, stats in sorted(histograms.get("request_seconds", {}).items()):
+            page = histograms.get("page_seconds", {}).get(endpoint, {})
+            parse = histograms.get("parse_seconds", {}).get(endpoint, {})
+            cache = counters.get("cache_total", {}).get(endpoint, {})
+            lookups = sum(cache.values())
+            rows.append({
+                "Endpoint": endpoint,
+                "Requests": stats["count"],
+                "p50 (ms)": round(stats["p50"] * 1000),
+                "p95 (ms)": round(stats["p95"] * 1000),
+                "Page p95 (ms)": round(page["p95"] * 1000) if page.get("p95") is not None else None,
+                "Parse p95 (ms)": round(parse["p95"] * 1000) if parse.get("p95") is not None else None,
+                "KB received": round(counters.get("response_bytes_total", {}).get(endpoint, {}).get("", 0) / 1024),
+                "Cache hit %": round(100 * cache.get("hit", 0) / lookups) if lookups else None,
+                "Errors": int(sum(counters.get("errors_total", {}).get(endpoint, {}).values())),
+            })
+        st.dataframe(rows, use_container_width=True, hide_index=True)
+
+    if scheduler_status:
+        col1, col2, col3 = st.columns(3)
+        col1.metric("In flight", scheduler_status["in_flight"])
+        col2.metric("Queued", sum(scheduler_status["queued"].values()))
+        col3.metric("Max interactive wait (ms)", round(scheduler_status["max_wait"]["interactive"] * 1000))
+
+    if parse_status.get("executor"):
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Parse workers", parse_status["max_workers"])
+        col2.metric("Pages waiting to parse", parse_status["pending"])
+        col3.metric("Mean parse wait (ms)", round(parse_status["mean_wait"] * 1000, 1))
+
+    if memo_status:
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Unchanged pages reused", f"{memo_status['hit_rate']:.0%}")
+        col2.metric("Parsed pages kept", memo_status["entries"])
+        col3.metric("Parses skipped", memo_status["hits"])
+
+    st.download_button("Download Prometheus metrics", prometheus_text, file_name="pesuacademy.prom")
+except Exception as exc:
+    st.error(f"Couldn't load metrics ngl 😪 {exc}")
@@ -1,8 +1,8 @@
 import streamlit as st
-import asyncio
 from datetime import datetime
-from pesuacademy import PESUAcademy
 from session_utils import restore_session_from_cookie
+from pesu_utils import run_with_pesu
+from timetable_utils import render_now_next
 
 restore_session_from_cookie()
 
@@ -14,23 +14,15 @@ if not st.session_state.get('logged_in', False):
 st.title("📅 Your Schedule (No Skipping!)")
 st.caption("Your daily & weekly timetable fr fr 💯")
 
-async def fetch_timetable():
+async def fetch_timetable(pesu, refresh=False):
     """Fetch timetable from PESU Academy"""
-    try:
-        pesu = await PESUAcademy.login(
-            st.session_state.pesu_username,
-            st.session_state.pesu_password
-        )
-        timetable = await pesu.get_timetable()
-        await pesu.close()
-        return timetable, None
-    except Exception as e:
-        return None, str(e)
+    timetable = await pesu.get_timetable(refresh=refresh)
+    return timetable, None
 
 # Initialize timetable on first load
 if 'timetable_initialized' not in st.session_state:
     with st.spinner("Loading ur schedule... 👀"):
-        timetable, error = asyncio.run(fetch_timetable())
+        timetable, error = run_with_pesu(fetch_timetable)
         
         if error:
             st.error(f"Bruh that didn't work 💔 {error}")
@@ -43,7 +35,7 @@ if 'timetable_initialized' not in st.session_state:
 
 if st.button("🔄 Reload Schedule", type="primary", use_container_width=True):
     with st.spinner("Loading ur schedule... 👀"):
-        timetable, error = asyncio.run(fetch_timetable())
+        timetable, error = run_with_pesu(fetch_timetable, True)
         
         if error:
             st.error(f"Bruh that didn't work 💔 {error}")
@@ -65,6 +57,8 @@ if 'timetable' in st.session_state and st.session_state.timetable:
     days_display = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"]
     
     st.divider()
+    render_now_next(timetable, today)
+
     st.subheader("📅 Today's Classes")
     
     # Show today's schedule first (always expanded)
@@ -0,0 +1,35 @@
+from datetime import datetime
+import streamlit as st
+
+
+def _fmt(t):
+    return t.strftime('%I:%M %p')
+
+
+def render_now_next(timetable, now=None):
+    """Show what's on right now and the next class.
+
+    Both are looked up with the timetable's own index (a binary search over
+    each day's start times), so this is cheap enough to run on every rerun.
+    """
+    now = now or datetime.now()
+    current = timetable.current_slot(now)
+    upcoming = timetable.next_class(now)
+
+    col_now, col_next = st.columns(2)
+    with col_now:
+        if current is None:
+            st.info("🟢 **Now:** Nothing rn, ur free 😎")
+        elif current.is_break:
+            st.info(f"☕ **Now:** Break till {_fmt(current.time.end)}")
+        elif current.session:
+            st.success(f"📖 **Now:** {current.session.code} • {current.session.name} (till {_fmt(current.time.end)})")
+        else:
+            st.info(f"🟢 **Now:** Free period till {_fmt(current.time.end)}")
+    with col_next:
+        if upcoming is None:
+            st.info("⏭️ **Next:** No classes coming up 🎉")
+        else:
+            day, slot = upcoming
+            when = _fmt(slot.time.start) if day.value == now.strftime('%A').lower() else f"{day.value.title()} {_fmt(slot.time.start)}"
+            st.info(f"⏭️ **Next:** {slot.session.code} • {slot.session.name} at {when}")